@@ -0,0 +1,456 @@
+"""
+End-to-end ChatTurn load test: open-loop arrivals against a locally started
+orchestrator, reporting TTFT, inter-token latency, token throughput, CPU per
+turn and RSS as JSON.
+
+The orchestrator runs in this process with in-memory profile repositories
+(no Postgres needed) and talks to the stub upstream, which runs in its own
+process; ``--graph dummy_v1`` skips the upstream entirely. Load is generated
+by a child process so its CPU is not charged to the orchestrator. Arrivals
+are Poisson at each ``--rate``, independent of completions; arrivals beyond
+``--max-in-flight`` are counted as dropped rather than queued.
+
+Orchestrator settings can be tuned through the usual AI_ORCHESTRATOR__*
+environment variables.
+
+Usage:
+    uv run python benchmarks/bench_chat_turn_load.py --rate 10 --rate 50 \\
+        --duration 20 [--graph default_v1|dummy_v1] [--output results.json]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import resource
+import socket
+import subprocess
+import sys
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from uuid import uuid4
+
+PHASE_MARK = "RESULT "
+
+
+@dataclass
+class TurnSample:
+    """Timings of one ChatTurn stream, relative to when it was sent."""
+
+    ttft_s: float | None = None
+    # Gaps between token messages, and the same gaps spread over their tokens
+    inter_chunk_s: list[float] = field(default_factory=list)
+    inter_token_s: list[float] = field(default_factory=list)
+    chunks: int = 0
+    tokens: int = 0
+    duration_s: float = 0.0
+    error: str | None = None
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def percentiles(values: list[float]) -> dict[str, float | None]:
+    """Nearest-rank p50/p95/p99 in milliseconds."""
+    if not values:
+        return {"p50_ms": None, "p95_ms": None, "p99_ms": None}
+    ordered = sorted(values)
+
+    def rank(q: float) -> float:
+        index = min(len(ordered) - 1, max(0, round(q * len(ordered)) - 1))
+        return round(ordered[index] * 1e3, 3)
+
+    return {"p50_ms": rank(0.50), "p95_ms": rank(0.95), "p99_ms": rank(0.99)}
+
+
+def peak_rss_mb() -> float:
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KiB on Linux but bytes on macOS
+    scale = 1 if sys.platform == "darwin" else 1024
+    return round(rss * scale / 2**20, 1)
+
+
+# ----- Load generator (child process) -----
+
+
+async def run_turn(stub, request, metadata, samples: list[TurnSample]) -> None:
+    sample = TurnSample()
+    samples.append(sample)
+    start = last = time.perf_counter()
+    try:
+        async for event in stub.ChatTurn(request, metadata=metadata):
+            kind = event.WhichOneof("payload")
+            now = time.perf_counter()
+            if kind == "token":
+                # Tokens are counted as words, which is exact for the stub
+                # upstream and dummy_v1 even when messages are coalesced
+                tokens = len(event.token.content.split()) or 1
+                if sample.ttft_s is None:
+                    sample.ttft_s = now - start
+                else:
+                    gap = now - last
+                    sample.inter_chunk_s.append(gap)
+                    sample.inter_token_s.extend([gap / tokens] * tokens)
+                sample.chunks += 1
+                sample.tokens += tokens
+                last = now
+            elif kind == "error":
+                sample.error = event.error.code
+    except Exception as e:
+        sample.error = type(e).__name__
+    sample.duration_s = time.perf_counter() - start
+
+
+async def generate_load(args: argparse.Namespace) -> dict:
+    import grpc.aio
+
+    from ai_orchestrator.grpc.generated.aisp.v1 import (
+        chat_orchestrator_pb2,
+        chat_orchestrator_pb2_grpc,
+    )
+
+    def make_request() -> chat_orchestrator_pb2.ChatTurnRequest:
+        return chat_orchestrator_pb2.ChatTurnRequest(
+            request_id=str(uuid4()),
+            session_id=str(uuid4()),
+            user_id=str(uuid4()),
+            assistant=chat_orchestrator_pb2.AssistantConfig(
+                graph_profile_id=args.graph_profile_id,
+                model_bindings=[
+                    chat_orchestrator_pb2.ModelBinding(
+                        slot_name="main", model_profile_id=args.model_profile_id
+                    )
+                ],
+            ),
+            input=chat_orchestrator_pb2.UserInput(message=args.prompt),
+        )
+
+    metadata = (
+        (("x-aisp-coalesce", args.coalesce),) if args.coalesce != "default" else None
+    )
+    samples: list[TurnSample] = []
+    dropped = 0
+    rng = random.Random(args.seed)
+    async with grpc.aio.insecure_channel(args.target) as channel:
+        stub = chat_orchestrator_pb2_grpc.ChatOrchestratorStub(channel)
+        in_flight: set[asyncio.Task] = set()
+        start = time.perf_counter()
+        due = start
+        while True:
+            due += rng.expovariate(args.rate)
+            if due - start >= args.duration:
+                break
+            delay = due - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            if len(in_flight) >= args.max_in_flight:
+                dropped += 1
+                continue
+            task = asyncio.create_task(
+                run_turn(stub, make_request(), metadata, samples)
+            )
+            in_flight.add(task)
+            task.add_done_callback(in_flight.discard)
+        if in_flight:
+            await asyncio.wait(in_flight)
+        elapsed = time.perf_counter() - start
+
+    completed = [s for s in samples if s.error is None]
+    errors: dict[str, int] = {}
+    for s in samples:
+        if s.error is not None:
+            errors[s.error] = errors.get(s.error, 0) + 1
+    tokens = sum(s.tokens for s in completed)
+    chunks = sum(s.chunks for s in completed)
+    decode_rates = [
+        (s.tokens - 1) / sum(s.inter_chunk_s) for s in completed if sum(s.inter_chunk_s)
+    ]
+    return {
+        "offered_rate": args.rate,
+        "duration_s": round(elapsed, 3),
+        "sent": len(samples),
+        "completed": len(completed),
+        "dropped": dropped,
+        "errors": errors,
+        "turns_per_s": round(len(completed) / elapsed, 3),
+        "tokens_per_s": round(tokens / elapsed, 1),
+        "tokens_per_turn": round(tokens / len(completed), 1) if completed else 0,
+        "chunks_per_s": round(chunks / elapsed, 1),
+        "tokens_per_chunk": round(tokens / chunks, 2) if chunks else 0,
+        "decode_tokens_per_s_per_turn": (
+            round(sorted(decode_rates)[len(decode_rates) // 2], 1)
+            if decode_rates
+            else None
+        ),
+        "ttft": percentiles([s.ttft_s for s in completed if s.ttft_s is not None]),
+        "inter_token": percentiles([gap for s in completed for gap in s.inter_token_s]),
+        "inter_chunk": percentiles([gap for s in completed for gap in s.inter_chunk_s]),
+        "turn": percentiles([s.duration_s for s in completed]),
+    }
+
+
+# ----- Orchestrator (this process) -----
+
+
+def start_stub_upstream(args: argparse.Namespace) -> tuple[subprocess.Popen, str]:
+    port = free_port()
+    process = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "ai_infra.llms.stub_upstream",
+            "--port",
+            str(port),
+            "--ttft-s",
+            str(args.ttft_s),
+            "--tokens-per-s",
+            str(args.tokens_per_s),
+            "--completion-tokens",
+            str(args.tokens),
+            "--jitter",
+            args.jitter,
+            "--jitter-ratio",
+            str(args.jitter_ratio),
+        ],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 10
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.5).close()
+            return process, f"http://127.0.0.1:{port}/v1"
+        except OSError:
+            time.sleep(0.05)
+    process.kill()
+    raise RuntimeError("stub upstream did not start")
+
+
+async def run_phase(
+    args: argparse.Namespace, rate: float, target: str, ids: dict[str, str]
+) -> dict:
+    """Drive one arrival rate from a child process and measure this process."""
+    cmd = [
+        sys.executable,
+        __file__,
+        "--generate",
+        "--target",
+        target,
+        "--rate",
+        str(rate),
+        "--duration",
+        str(args.duration),
+        "--max-in-flight",
+        str(args.max_in_flight),
+        "--prompt",
+        args.prompt,
+        "--coalesce",
+        args.coalesce,
+        "--graph-profile-id",
+        ids["graph"],
+        "--model-profile-id",
+        ids["model"],
+    ]
+    if args.seed is not None:
+        cmd += ["--seed", str(args.seed)]
+
+    cpu_start = time.process_time()
+    child = await asyncio.create_subprocess_exec(*cmd, stdout=subprocess.PIPE)
+    stdout, _ = await child.communicate()
+    cpu_s = time.process_time() - cpu_start
+    if child.returncode != 0:
+        raise RuntimeError(f"load generator exited with {child.returncode}")
+
+    line = next(
+        line for line in stdout.decode().splitlines() if line.startswith(PHASE_MARK)
+    )
+    result = json.loads(line[len(PHASE_MARK) :])
+    turns = result["completed"] or 1
+    result["server"] = {
+        "cpu_s": round(cpu_s, 3),
+        "cpu_ms_per_turn": round(cpu_s / turns * 1e3, 3),
+        "cpu_utilization": round(cpu_s / result["duration_s"], 3),
+        "rss_peak_mb": peak_rss_mb(),
+    }
+    return result
+
+
+async def serve_and_measure(args: argparse.Namespace) -> dict:
+    stub_process = None
+    if args.graph != "dummy_v1":
+        stub_process, stub_url = start_stub_upstream(args)
+        os.environ.setdefault("AI_ORCHESTRATOR__AI_BASE_URL", stub_url)
+    grpc_port = free_port()
+    os.environ["AI_ORCHESTRATOR__GRPC_PORT"] = str(grpc_port)
+    os.environ.setdefault("AI_ORCHESTRATOR__HTTP_PORT", "0")
+    os.environ.setdefault("AI_ORCHESTRATOR__AI_BASE_URL", "http://127.0.0.1:9/v1")
+    os.environ.setdefault("AI_ORCHESTRATOR__AI_API_KEY", "bench")
+    # The engine is created but never connected: profiles are held in memory
+    os.environ.setdefault(
+        "AI_ORCHESTRATOR__PG_DSN", "postgresql+psycopg://bench@127.0.0.1:9/bench"
+    )
+    os.environ.setdefault("AI_ORCHESTRATOR__PROFILE_CACHE_ENABLED", "false")
+
+    from ai_core.models import GraphProfile, ModelProfile
+    from ai_infra.memory import (
+        InMemoryGraphProfileRepository,
+        InMemoryModelProfileRepository,
+    )
+    from ai_orchestrator.context import AppContext
+    from ai_orchestrator.grpc.server import serve
+
+    now = datetime.now(timezone.utc)
+    graph_profile = GraphProfile(
+        id=uuid4(),
+        name="bench",
+        version_major=1,
+        version_minor=0,
+        graph_name=args.graph,
+        created_at=now,
+        updated_at=now,
+        is_active=True,
+    )
+    model_profile = ModelProfile(
+        id=uuid4(),
+        name="bench",
+        description="Load benchmark profile",
+        model="stub-model",
+        created_at=now,
+        updated_at=now,
+        is_active=True,
+        max_tokens=args.tokens,
+    )
+    ids = {"graph": str(graph_profile.id), "model": str(model_profile.id)}
+
+    app_context = AppContext()
+    app_context.graph_profile_repository = InMemoryGraphProfileRepository(
+        [graph_profile]
+    )
+    app_context.model_profile_repository = InMemoryModelProfileRepository(
+        [model_profile]
+    )
+    await app_context.get_llm_client().warm_up()
+    server = await serve(app_context)
+    await server.start()
+    target = f"127.0.0.1:{grpc_port}"
+
+    try:
+        # Warm up imports, graph compilation and pooled connections
+        await run_phase(
+            argparse.Namespace(**{**vars(args), "duration": 1.0}), 5.0, target, ids
+        )
+        phases = []
+        for rate in args.rate:
+            phase = await run_phase(args, rate, target, ids)
+            phases.append(phase)
+            print(
+                f"rate {rate:>7.1f}/s: {phase['turns_per_s']:>7.1f} turns/s, "
+                f"ttft p50 {phase['ttft']['p50_ms']} ms "
+                f"p99 {phase['ttft']['p99_ms']} ms, "
+                f"{phase['tokens_per_s']:>8.1f} tok/s, "
+                f"{phase['server']['cpu_ms_per_turn']:.2f} ms cpu/turn, "
+                f"errors {phase['errors']}, dropped {phase['dropped']}",
+                file=sys.stderr,
+            )
+    finally:
+        await server.stop(grace=None)
+        await app_context.aclose()
+        if stub_process is not None:
+            stub_process.terminate()
+            stub_process.wait()
+
+    return {
+        "benchmark": "chat_turn_load",
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "git_revision": git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": {
+            "graph": args.graph,
+            "duration_s": args.duration,
+            "max_in_flight": args.max_in_flight,
+            "coalesce": args.coalesce,
+            "upstream": {
+                "ttft_s": args.ttft_s,
+                "tokens_per_s": args.tokens_per_s,
+                "tokens": args.tokens,
+                "jitter": args.jitter,
+                "jitter_ratio": args.jitter_ratio,
+            },
+        },
+        "phases": phases,
+    }
+
+
+def git_revision() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument(
+        "--rate",
+        type=float,
+        action="append",
+        help="Turn arrivals per second; repeat to sweep (default 10)",
+    )
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--max-in-flight", type=int, default=1000)
+    parser.add_argument(
+        "--graph", default="default_v1", choices=["default_v1", "dummy_v1"]
+    )
+    parser.add_argument("--prompt", default="Tell me about load testing.")
+    parser.add_argument(
+        "--coalesce",
+        default="default",
+        choices=["default", "on", "off"],
+        help="Token coalescing requested per call; default leaves it to the server",
+    )
+    parser.add_argument("--ttft-s", type=float, default=0.2)
+    parser.add_argument("--tokens-per-s", type=float, default=50.0)
+    parser.add_argument("--tokens", type=int, default=64)
+    parser.add_argument("--jitter", default="lognormal")
+    parser.add_argument("--jitter-ratio", type=float, default=0.2)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--output", help="Write JSON results here instead of stdout")
+    # Internal: run as the load generator child process
+    parser.add_argument("--generate", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--target", help=argparse.SUPPRESS)
+    parser.add_argument("--graph-profile-id", help=argparse.SUPPRESS)
+    parser.add_argument("--model-profile-id", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.generate:
+        args.rate = args.rate[0]
+        result = asyncio.run(generate_load(args))
+        print(PHASE_MARK + json.dumps(result))
+        return
+
+    args.rate = args.rate or [10.0]
+    results = asyncio.run(serve_and_measure(args))
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""
+Per-turn graph setup cost: rebuilding and compiling the LangGraph on every
+turn (the previous behaviour) versus reusing the cached compiled graph.
+
+Usage:
+    uv run python benchmarks/bench_graph_setup.py [--iterations N]
+"""
+
+import argparse
+import timeit
+
+from ai_core.orchestration.graphs import get_graph, graph_registry
+from ai_core.orchestration.orchestrator import ChatOrchestrator
+from ai_core.orchestration.services import Services
+
+
+def setup_rebuild(graph_name: str) -> ChatOrchestrator:
+    """Per-turn setup that builds and compiles the graph from scratch."""
+    services = Services(llm_main=None)  # type: ignore[arg-type]
+    return ChatOrchestrator(graph_registry[graph_name](), services)
+
+
+def setup_cached(graph_name: str) -> ChatOrchestrator:
+    """Per-turn setup that reuses the compiled graph."""
+    services = Services(llm_main=None)  # type: ignore[arg-type]
+    return ChatOrchestrator(get_graph(graph_name), services)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"{'graph':<12} {'rebuild (us)':>14} {'cached (us)':>14} {'speedup':>10}")
+    for graph_name in graph_registry:
+        rebuild = timeit.timeit(
+            lambda: setup_rebuild(graph_name), number=args.iterations
+        )
+        cached = timeit.timeit(lambda: setup_cached(graph_name), number=args.iterations)
+        rebuild_us = rebuild / args.iterations * 1e6
+        cached_us = cached / args.iterations * 1e6
+        print(
+            f"{graph_name:<12} {rebuild_us:>14.1f} {cached_us:>14.2f} "
+            f"{rebuild_us / cached_us:>9.0f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,419 @@
+"""
+Microbenchmarks for the per-token and per-turn hot paths, with a regression
+gate against stored baselines.
+
+Each benchmark reports time per operation, taking the best of several
+repeats. Times are also normalized by a fixed pure-Python reference workload
+measured in the same run, and the gate compares normalized times so a
+baseline recorded on one machine stays usable on another. The script exits
+non-zero when any benchmark is more than ``--threshold`` slower than its
+baseline on every one of ``--confirm`` extra measurements.
+
+Usage:
+    uv run python benchmarks/bench_hot_paths.py [--threshold 0.25] [--only NAME]
+    uv run python benchmarks/bench_hot_paths.py --update-baseline
+"""
+
+import argparse
+import asyncio
+import gc
+import json
+import platform
+import sys
+import time
+from collections.abc import AsyncIterator, Callable, Coroutine
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+from uuid import uuid4
+
+from ai_core.models import GraphProfile, ModelProfile
+from ai_core.orchestration.nodes import generate
+from ai_core.orchestration.orchestrator import ChatOrchestrator
+from ai_core.orchestration.services import Services, TokenCounter
+from ai_core.orchestration.services.llm_service import ChatMessage
+from ai_core.orchestration.streaming import (
+    ChatStreamEvent,
+    StreamDone,
+    StreamUsage,
+    TokenDelta,
+    Usage,
+)
+from ai_infra.llms.sse import aiter_stream_events
+from ai_infra.memory import (
+    InMemoryGraphProfileRepository,
+    InMemoryModelProfileRepository,
+)
+from ai_orchestrator.grpc.generated.aisp.v1 import chat_orchestrator_pb2
+from ai_orchestrator.grpc.generated.aisp.v1.chat_orchestrator_pb2 import (
+    ChatTurnRequest,
+)
+from ai_orchestrator.grpc.plan import ChatTurnPlan
+
+BASELINE_PATH = Path(__file__).parent / "baselines" / "hot_paths.json"
+TOKENS = 500
+
+
+@dataclass
+class Benchmark:
+    """A benchmark whose run() performs ``ops`` operations."""
+
+    name: str
+    description: str
+    ops: int
+    run: Callable[[], Coroutine[Any, Any, None]]
+
+
+# ----- SSE parsing -----
+
+
+def sse_body() -> list[bytes]:
+    events = [
+        b'data: {"id":"chatcmpl-1","object":"chat.completion.chunk","created":1760000000,'
+        b'"model":"m","choices":[{"index":0,"delta":{"content":" tok%d"},'
+        b'"finish_reason":null}]}\n\n' % i
+        for i in range(TOKENS)
+    ]
+    events.append(b"data: [DONE]\n\n")
+    body = b"".join(events)
+    # Network-sized reads that split events at arbitrary points
+    return [body[i : i + 1400] for i in range(0, len(body), 1400)]
+
+
+async def bench_sse_parse(reads: list[bytes]) -> None:
+    async def byte_stream() -> AsyncIterator[bytes]:
+        for read in reads:
+            yield read
+
+    async for _ in aiter_stream_events(byte_stream()):
+        pass
+
+
+# ----- ChatOrchestrator.execute dict-to-event conversion -----
+
+
+class ReplayGraph:
+    """Stands in for OrchestratorGraph, replaying precomputed stream items."""
+
+    def __init__(self, items: list[dict]) -> None:
+        self._items = items
+
+    async def astream(self, initial_state, stream_mode="custom", services=None):
+        for item in self._items:
+            yield item
+
+
+def graph_stream_items() -> list[dict]:
+    items: list[dict] = [
+        {"type": "token_delta", "content": f" tok{i}"} for i in range(TOKENS)
+    ]
+    items.append(
+        {
+            "type": "stream_usage",
+            "usage": {
+                "prompt_tokens": 10,
+                "completion_tokens": TOKENS,
+                "total_tokens": TOKENS + 10,
+            },
+        }
+    )
+    items.append({"type": "stream_done", "finish_reason": "stop"})
+    items.append({"llm_generate": {"messages": ["..."]}})
+    return items
+
+
+async def bench_orchestrator_execute(orchestrator: ChatOrchestrator) -> None:
+    async for _ in orchestrator.execute({}):
+        pass
+
+
+# ----- ChatTurnPlan.build -----
+
+
+class InMemoryAppContext:
+    """The slice of AppContext that ChatTurnPlan.build uses."""
+
+    def __init__(self) -> None:
+        now = datetime.now(timezone.utc)
+        self.graph_profile = GraphProfile(
+            id=uuid4(),
+            name="bench",
+            version_major=1,
+            version_minor=0,
+            graph_name="default_v1",
+            created_at=now,
+            updated_at=now,
+            is_active=True,
+        )
+        self.model_profile = ModelProfile(
+            id=uuid4(),
+            name="bench",
+            description="",
+            model="bench-model",
+            created_at=now,
+            updated_at=now,
+            is_active=True,
+        )
+        self._graph_profiles = InMemoryGraphProfileRepository([self.graph_profile])
+        self._model_profiles = InMemoryModelProfileRepository([self.model_profile])
+
+    def get_graph_profile_repository(self) -> InMemoryGraphProfileRepository:
+        return self._graph_profiles
+
+    def get_model_profile_repository(self) -> InMemoryModelProfileRepository:
+        return self._model_profiles
+
+
+def chat_turn_request(context: InMemoryAppContext) -> ChatTurnRequest:
+    return ChatTurnRequest(
+        request_id=str(uuid4()),
+        session_id=str(uuid4()),
+        user_id=str(uuid4()),
+        assistant=chat_orchestrator_pb2.AssistantConfig(
+            graph_profile_id=str(context.graph_profile.id),
+            model_bindings=[
+                chat_orchestrator_pb2.ModelBinding(
+                    slot_name="main", model_profile_id=str(context.model_profile.id)
+                )
+            ],
+        ),
+        input=chat_orchestrator_pb2.UserInput(message="Hello"),
+    )
+
+
+async def bench_plan_build(
+    context: InMemoryAppContext, request: ChatTurnRequest
+) -> None:
+    for _ in range(100):
+        await ChatTurnPlan.build(request, context)  # type: ignore[arg-type]
+
+
+# ----- Protobuf ChatEvent construction -----
+
+
+async def bench_chat_event_proto(texts: list[str]) -> None:
+    for text in texts:
+        chat_orchestrator_pb2.ChatEvent(
+            token=chat_orchestrator_pb2.TokenChunkEvent(content=text)
+        ).SerializeToString()
+
+
+# ----- llm_generate accumulation -----
+
+
+class ReplayLLMService:
+    """Stands in for LLMService, replaying a fixed completion."""
+
+    def __init__(self, events: list, model: str = "replay") -> None:
+        self.model = model
+        self._events = events
+
+    async def stream(self, messages: list[ChatMessage]):
+        for event in self._events:
+            yield event
+
+
+async def bench_llm_generate(services: Services) -> None:
+    await generate.llm_generate({"messages": ["Hello"]}, services)  # type: ignore[typeddict-item]
+
+
+def build_benchmarks() -> list[Benchmark]:
+    reads = sse_body()
+    orchestrator = ChatOrchestrator(
+        ReplayGraph(graph_stream_items()),  # type: ignore[arg-type]
+        Services(llm_main=None),  # type: ignore[arg-type]
+    )
+    context = InMemoryAppContext()
+    request = chat_turn_request(context)
+    texts = [f" tok{i}" for i in range(TOKENS)]
+    llm_events: list[ChatStreamEvent] = [TokenDelta(text=text) for text in texts]
+    llm_events += [
+        StreamUsage(
+            usage=Usage(
+                prompt_tokens=10, completion_tokens=TOKENS, total_tokens=TOKENS + 10
+            )
+        ),
+        StreamDone(finish_reason="stop"),
+    ]
+    services = Services(
+        llm_main=ReplayLLMService(llm_events),  # type: ignore[arg-type]
+        token_counter=TokenCounter(),
+    )
+
+    return [
+        Benchmark(
+            "sse_parse",
+            "OpenAiLLMClient.stream_chat SSE decoding, per token",
+            TOKENS,
+            lambda: bench_sse_parse(reads),
+        ),
+        Benchmark(
+            "orchestrator_execute",
+            "ChatOrchestrator.execute dict-to-event conversion, per event",
+            TOKENS + 3,
+            lambda: bench_orchestrator_execute(orchestrator),
+        ),
+        Benchmark(
+            "plan_build",
+            "ChatTurnPlan.build with in-memory repositories, per turn",
+            100,
+            lambda: bench_plan_build(context, request),
+        ),
+        Benchmark(
+            "chat_event_proto",
+            "ChatEvent token construction and serialization, per token",
+            TOKENS,
+            lambda: bench_chat_event_proto(texts),
+        ),
+        Benchmark(
+            "llm_generate",
+            "llm_generate token forwarding and accumulation, per token",
+            TOKENS,
+            lambda: bench_llm_generate(services),
+        ),
+    ]
+
+
+def reference_workload() -> None:
+    """Fixed interpreter-bound work used to normalize timings across machines."""
+    items: dict[str, int] = {}
+    for i in range(2000):
+        key = f"tok{i}"
+        items[key] = len(key)
+    json.loads(json.dumps(items))
+
+
+def best_of(func: Callable[[], None], repeats: int) -> float:
+    """Best wall time of func over repeats, with the GC paused like timeit."""
+    gc.collect()
+    gc.disable()
+    try:
+        best = float("inf")
+        for _ in range(repeats):
+            start = time.perf_counter()
+            func()
+            best = min(best, time.perf_counter() - start)
+        return best
+    finally:
+        gc.enable()
+
+
+def measure(
+    loop: asyncio.AbstractEventLoop, benchmark: Benchmark, repeats: int, inner: int
+) -> tuple[float, float]:
+    """
+    Best time per operation over ``repeats`` rounds of ``inner`` runs.
+
+    The reference workload is timed alternately with the benchmark so both
+    see the same machine conditions. Returns seconds per operation and that
+    time divided by the reference time.
+    """
+
+    def round_() -> None:
+        for _ in range(inner):
+            loop.run_until_complete(benchmark.run())
+
+    round_()  # warm up
+    best = reference = float("inf")
+    for _ in range(repeats):
+        best = min(best, best_of(round_, 1))
+        reference = min(reference, best_of(reference_workload, 3))
+    per_op = best / (inner * benchmark.ops)
+    return per_op, per_op / reference
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument(
+        "--threshold", type=float, default=0.25, help="Allowed slowdown (0.25 = 25%%)"
+    )
+    parser.add_argument("--repeats", type=int, default=10)
+    parser.add_argument("--inner", type=int, default=10)
+    parser.add_argument(
+        "--only", action="append", help="Run only this benchmark; repeatable"
+    )
+    parser.add_argument(
+        "--confirm",
+        type=int,
+        default=2,
+        help="Extra measurements before a regression is reported",
+    )
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--output", type=Path, help="Also write results as JSON here")
+    args = parser.parse_args()
+
+    # llm_generate runs outside a graph here, so give it a no-op stream writer
+    generate.get_stream_writer = lambda: lambda chunk: None
+
+    benchmarks = [b for b in build_benchmarks() if not args.only or b.name in args.only]
+    baseline: dict[str, Any] = {}
+    if args.baseline.exists() and not args.update_baseline:
+        baseline = json.loads(args.baseline.read_text())["results"]
+
+    def change(name: str, normalized: float) -> float | None:
+        base = baseline.get(name)
+        return normalized / base["normalized"] - 1 if base else None
+
+    loop = asyncio.new_event_loop()
+    results: dict[str, dict[str, Any]] = {}
+    try:
+        for b in benchmarks:
+            per_op, normalized = measure(loop, b, args.repeats, args.inner)
+            # Re-measure apparent regressions; noise rarely repeats, real slowdowns do
+            for _ in range(args.confirm):
+                if (change(b.name, normalized) or 0) <= args.threshold:
+                    break
+                retry_per_op, retry_normalized = measure(
+                    loop, b, args.repeats, args.inner
+                )
+                if retry_normalized < normalized:
+                    per_op, normalized = retry_per_op, retry_normalized
+            results[b.name] = {
+                "description": b.description,
+                "ns_per_op": round(per_op * 1e9, 2),
+                "normalized": round(normalized, 8),
+            }
+    finally:
+        loop.close()
+
+    report: dict[str, Any] = {
+        "benchmark": "hot_paths",
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+
+    regressions = []
+    print(f"{'benchmark':<22} {'ns/op':>10} {'baseline':>10} {'change':>8}")
+    for name, result in results.items():
+        line = f"{name:<22} {result['ns_per_op']:>10.1f}"
+        delta = change(name, result["normalized"])
+        if delta is not None:
+            result["change"] = round(delta, 4)
+            line += f" {baseline[name]['ns_per_op']:>10.1f} {delta:>+7.1%}"
+            if delta > args.threshold:
+                regressions.append(name)
+                line += "  REGRESSION"
+        print(line)
+
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2) + "\n")
+    if args.update_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps(report, indent=2) + "\n")
+        print(f"Baseline written to {args.baseline}")
+    elif regressions:
+        print(
+            f"Regressed past {args.threshold:.0%}: {', '.join(regressions)}",
+            file=sys.stderr,
+        )
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+"""
+Streaming response parsing cost: the previous line-based parser (httpx
+aiter_lines, str.strip, json.loads, choices[0] walked twice per chunk) versus
+the incremental byte-level SSE decoder with each available JSON backend.
+
+The body is a realistic chat completion stream, delivered in network-sized
+reads that split events at arbitrary points.
+
+Usage:
+    uv run python benchmarks/bench_sse.py [--tokens N] [--read-size BYTES]
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from collections.abc import AsyncIterator
+from typing import Any
+
+import httpx
+
+from ai_core.orchestration.streaming import (
+    ChatStreamEvent,
+    StreamDone,
+    StreamUsage,
+    TokenDelta,
+    Usage,
+)
+from ai_infra.llms.sse import CHUNK_DECODERS, ChunkDecoder, aiter_stream_events
+
+
+def build_body(tokens: int) -> bytes:
+    """Build an OpenAI-style streaming body with one event per token."""
+    events = []
+    for i in range(tokens):
+        chunk = {
+            "id": "chatcmpl-9f0c1b2a",
+            "object": "chat.completion.chunk",
+            "created": 1760000000,
+            "model": "llama-3.1-8b-instruct",
+            "system_fingerprint": "fp_44709d6fcb",
+            "choices": [
+                {
+                    "index": 0,
+                    "delta": {"content": f" token{i}"},
+                    "logprobs": None,
+                    "finish_reason": None,
+                }
+            ],
+        }
+        events.append(b"data: " + json.dumps(chunk).encode() + b"\n\n")
+    final = {
+        "id": "chatcmpl-9f0c1b2a",
+        "object": "chat.completion.chunk",
+        "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}],
+        "usage": {
+            "prompt_tokens": 42,
+            "completion_tokens": tokens,
+            "total_tokens": 42 + tokens,
+        },
+    }
+    events.append(b"data: " + json.dumps(final).encode() + b"\n\n")
+    events.append(b"data: [DONE]\n\n")
+    return b"".join(events)
+
+
+def make_response(body: bytes, read_size: int) -> httpx.Response:
+    async def reads() -> AsyncIterator[bytes]:
+        for i in range(0, len(body), read_size):
+            yield body[i : i + read_size]
+
+    return httpx.Response(200, content=reads())
+
+
+def parse_usage(data: dict[str, Any]) -> Usage | None:
+    usage_data = data.get("usage", data)
+    if not isinstance(usage_data, dict):
+        return None
+    return Usage(
+        prompt_tokens=usage_data.get("prompt_tokens"),
+        completion_tokens=usage_data.get("completion_tokens"),
+        total_tokens=usage_data.get("total_tokens"),
+    )
+
+
+async def legacy_events(response: httpx.Response) -> AsyncIterator[ChatStreamEvent]:
+    """The parser previously inlined in OpenAiLLMClient.stream_chat."""
+    async for line in response.aiter_lines():
+        line = line.strip()
+        if not line:
+            continue
+
+        if line.startswith("data: "):
+            data_str = line[6:]
+            if data_str == "[DONE]":
+                yield StreamDone()
+                break
+
+            try:
+                chunk_data = json.loads(data_str)
+            except json.JSONDecodeError:
+                continue
+
+            if "choices" in chunk_data and len(chunk_data["choices"]) > 0:
+                choice = chunk_data["choices"][0]
+                delta = choice.get("delta", {})
+                if "content" in delta and delta["content"]:
+                    yield TokenDelta(text=delta["content"])
+
+            if "usage" in chunk_data:
+                usage = parse_usage(chunk_data)
+                if usage:
+                    yield StreamUsage(usage=usage)
+
+            if "choices" in chunk_data and len(chunk_data["choices"]) > 0:
+                choice = chunk_data["choices"][0]
+                finish_reason = choice.get("finish_reason")
+                if finish_reason:
+                    yield StreamDone(finish_reason=finish_reason)
+                    break
+
+
+async def run_legacy(body: bytes, read_size: int) -> int:
+    count = 0
+    async for _ in legacy_events(make_response(body, read_size)):
+        count += 1
+    return count
+
+
+async def run_decoder(body: bytes, read_size: int, decode: ChunkDecoder) -> int:
+    count = 0
+    response = make_response(body, read_size)
+    async for _ in aiter_stream_events(response.aiter_bytes(), decode=decode):
+        count += 1
+    return count
+
+
+async def measure(run, iterations: int) -> tuple[float, int]:
+    count = await run()  # warm up
+    start = time.perf_counter()
+    for _ in range(iterations):
+        await run()
+    return (time.perf_counter() - start) / iterations, count
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tokens", type=int, default=1000)
+    parser.add_argument("--read-size", type=int, default=1400)
+    parser.add_argument("--iterations", type=int, default=50)
+    args = parser.parse_args()
+
+    body = build_body(args.tokens)
+    print(
+        f"{args.tokens} tokens, {len(body)} bytes, "
+        f"{args.read_size} byte reads, {args.iterations} iterations"
+    )
+
+    legacy, expected = await measure(
+        lambda: run_legacy(body, args.read_size), args.iterations
+    )
+    results = [("legacy (aiter_lines + json)", legacy)]
+    for name, decode in CHUNK_DECODERS.items():
+        elapsed, count = await measure(
+            lambda decode=decode: run_decoder(body, args.read_size, decode),
+            args.iterations,
+        )
+        assert count == expected, f"{name} produced {count} events, want {expected}"
+        results.append((f"sse decoder + {name}", elapsed))
+
+    print(
+        f"{'parser':<30} {'per stream (ms)':>16} {'per token (us)':>16} {'speedup':>8}"
+    )
+    for name, elapsed in results:
+        print(
+            f"{name:<30} {elapsed * 1e3:>16.2f} "
+            f"{elapsed / args.tokens * 1e6:>16.2f} {legacy / elapsed:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -20,3 +20,60 @@ class ModelProfileNotFoundError(ModelProfileError):
     """Raised when a model profile is not found."""
 
     pass
+
+
+class LLMClientError(Exception):
+    """Base exception for LLM client errors that map to a structured error code."""
+
+    code = "LLM_CLIENT_ERROR"
+
+    def __init__(self, message: str):
+        """
+        Initialize LLMClientError.
+
+        Args:
+            message: Error message describing what went wrong.
+        """
+        self.message = message
+        super().__init__(f"{self.code}: {message}")
+
+
+class UpstreamOverloadedError(LLMClientError):
+    """Raised when the concurrency limit for an upstream model is reached."""
+
+    code = "UPSTREAM_OVERLOADED"
+
+
+class UpstreamUnavailableError(LLMClientError):
+    """Raised when the circuit breaker for an upstream model is open."""
+
+    code = "UPSTREAM_UNAVAILABLE"
+
+    def __init__(self, message: str, retry_after_s: float | None = None):
+        """
+        Initialize UpstreamUnavailableError.
+
+        Args:
+            message: Error message describing what went wrong.
+            retry_after_s: Seconds until the upstream will be tried again, if known.
+        """
+        self.retry_after_s = retry_after_s
+        super().__init__(message)
+
+
+class StreamOverflowError(LLMClientError):
+    """Raised when a consumer falls too far behind a shared upstream stream."""
+
+    code = "STREAM_OVERFLOW"
+
+
+class DeadlineExceededError(LLMClientError):
+    """Raised when a request's deadline passes before the upstream has answered."""
+
+    code = "DEADLINE_EXCEEDED"
+
+
+class TokenBudgetExhaustedError(LLMClientError):
+    """Raised when a turn has no completion tokens left to spend."""
+
+    code = "TOKEN_BUDGET_EXHAUSTED"
@@ -1,5 +1,7 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, fields
 from datetime import datetime
+from functools import cached_property
+from typing import Any
 from uuid import UUID
 
 
@@ -15,6 +17,64 @@ class GraphProfile:
     is_active: bool
 
 
+@dataclass(frozen=True)
+class GenerationParams:
+    """
+    Sampling parameters for one LLM call, any of which may be left unset.
+
+    Parameters come in layers (model profile, graph node, request) that are
+    combined with ``merged``, where a later layer's set values win.
+    """
+
+    temperature: float | None = None
+    top_p: float | None = None
+    max_tokens: int | None = None
+    stop: tuple[str, ...] | None = None
+
+    @classmethod
+    def from_overrides(cls, overrides: dict[str, Any]) -> "GenerationParams":
+        """
+        Build a layer from keyword overrides.
+
+        Args:
+            overrides: Parameter values by name; None values are left unset.
+
+        Returns:
+            GenerationParams with the given values.
+
+        Raises:
+            TypeError: If an override is not a generation parameter.
+        """
+        unknown = overrides.keys() - _GENERATION_PARAM_NAMES
+        if unknown:
+            raise TypeError(f"Unknown generation parameters: {sorted(unknown)}")
+        stop = overrides.get("stop")
+        if stop is not None:
+            overrides = {**overrides, "stop": tuple(stop)}
+        return cls(**overrides)
+
+    def merged(self, *layers: "GenerationParams") -> "GenerationParams":
+        """
+        Combine this layer with more specific ones.
+
+        Args:
+            *layers: Layers in increasing order of precedence.
+
+        Returns:
+            GenerationParams where each value comes from the last layer setting it.
+        """
+        values = {name: getattr(self, name) for name in _GENERATION_PARAM_NAMES}
+        for layer in layers:
+            for name in _GENERATION_PARAM_NAMES:
+                value = getattr(layer, name)
+                if value is not None:
+                    values[name] = value
+        return GenerationParams(**values)
+
+
+_GENERATION_PARAM_NAMES = frozenset(f.name for f in fields(GenerationParams))
+
+
 @dataclass
 class ModelProfile:
     id: UUID
@@ -27,3 +87,13 @@ class ModelProfile:
     temperature: float | None = None
     top_p: float | None = None
     max_tokens: int | None = None
+    response_cache_enabled: bool = False
+
+    @cached_property
+    def generation_params(self) -> GenerationParams:
+        """The profile's sampling defaults, resolved once per profile instance."""
+        return GenerationParams(
+            temperature=self.temperature,
+            top_p=self.top_p,
+            max_tokens=self.max_tokens,
+        )
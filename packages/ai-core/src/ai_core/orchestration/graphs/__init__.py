@@ -1,10 +1,30 @@
+from functools import cache
 from typing import Callable
 
 from ai_core.orchestration.graphs import default_v1, dummy_v1
 from ai_core.orchestration.graphs.graph import OrchestratorGraph
-from ai_core.orchestration.services import Services
 
-graph_registry: dict[str, Callable[[Services], OrchestratorGraph]] = {
+graph_registry: dict[str, Callable[[], OrchestratorGraph]] = {
     "default_v1": default_v1.build_graph,
     "dummy_v1": dummy_v1.build_graph,
 }
+
+
+@cache
+def get_graph(graph_name: str) -> OrchestratorGraph:
+    """
+    Get the compiled graph for a registry entry, building it on first use.
+
+    Compiled graphs hold no per-request state, so each one is built once and
+    shared by every request.
+
+    Args:
+        graph_name: Name of the graph in the registry.
+
+    Returns:
+        OrchestratorGraph: The compiled graph.
+
+    Raises:
+        KeyError: If no graph is registered under the given name.
+    """
+    return graph_registry[graph_name]()
@@ -2,24 +2,20 @@ from langgraph.graph import END, StateGraph
 
 from ai_core.orchestration.graphs.graph import OrchestratorGraph
 from ai_core.orchestration.nodes.generate import llm_generate
-from ai_core.orchestration.services import Services
 from ai_core.orchestration.state import OrchestratorState
 from ai_core.orchestration.graphs.helpers import node_func
 
 
-def build_graph(services: Services) -> OrchestratorGraph:
+def build_graph() -> OrchestratorGraph:
     """
     Builds the default v1 graph.
 
-    Args:
-        services: Services container with LLM and other services.
-
     Returns:
         OrchestratorGraph: The compiled state graph wrapped in an OrchestratorGraph instance.
     """
     workflow = StateGraph(OrchestratorState)
 
-    llm_generate_node = node_func(services, llm_generate)
+    llm_generate_node = node_func(llm_generate)
 
     workflow.add_node("llm_generate", llm_generate_node)
 
@@ -2,7 +2,6 @@ from langgraph.config import get_stream_writer
 from langgraph.graph import END, StateGraph, START
 
 from ai_core.orchestration.graphs.graph import OrchestratorGraph
-from ai_core.orchestration.services import Services
 from ai_core.orchestration.state import OrchestratorState
 
 
@@ -33,7 +32,7 @@ async def dummy_llm_generate(state: OrchestratorState) -> dict:
     return {"messages": [accumulated_text.rstrip()]}
 
 
-def build_graph(services: Services) -> OrchestratorGraph:
+def build_graph() -> OrchestratorGraph:
     """
     Builds the dummy v1 graph for testing.
 
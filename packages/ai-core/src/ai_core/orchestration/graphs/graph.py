@@ -1,8 +1,15 @@
 from collections.abc import AsyncIterator
 from typing import Any
 
+from langchain_core.runnables import RunnableConfig
 from langgraph.graph.state import CompiledStateGraph
 
+from ai_core.orchestration.services import Services
+from ai_core.orchestration.streaming import closing_stream
+
+# Key under the runnable config's "configurable" dict holding the per-request Services
+SERVICES_CONFIG_KEY = "services"
+
 
 class OrchestratorGraph:
     """
@@ -25,6 +32,7 @@ class OrchestratorGraph:
         self,
         initial_state: dict,
         stream_mode: Any = "custom",
+        services: Services | None = None,
     ) -> AsyncIterator[dict]:
         """
         Stream state updates from the graph execution.
@@ -32,11 +40,15 @@ class OrchestratorGraph:
         Args:
             initial_state: Dictionary containing the initial state for graph execution.
             stream_mode: The stream mode to use (default: "custom").
+            services: Per-request services made available to the graph's nodes.
 
         Yields:
             dict: State updates from the graph execution.
         """
-        async for state_update in self._graph.astream(
-            initial_state, stream_mode=stream_mode
-        ):
-            yield state_update
+        config: RunnableConfig = {"configurable": {SERVICES_CONFIG_KEY: services}}
+        stream = self._graph.astream(
+            initial_state, config=config, stream_mode=stream_mode
+        )
+        async with closing_stream(stream):
+            async for state_update in stream:
+                yield state_update
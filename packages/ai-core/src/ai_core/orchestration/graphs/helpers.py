@@ -1,17 +1,22 @@
 from collections.abc import Callable, Awaitable
+
+from langgraph.config import get_config
+
+from ai_core.orchestration.graphs.graph import SERVICES_CONFIG_KEY
 from ai_core.orchestration.services import Services
 from ai_core.orchestration.state import OrchestratorState
 
 
 def node_func(
-    services: Services,
     func: Callable[[OrchestratorState, Services], Awaitable[dict]],
 ):
     """
     Converts a node function that takes a state and services into a function that takes only a state.
 
+    The services are looked up from the runnable config of the current run, so a
+    graph can be compiled once and shared across requests.
+
     Args:
-        services: Services container with LLM and other services.
         func: The node function to wrap.
 
     Returns:
@@ -19,6 +24,7 @@ def node_func(
     """
 
     async def inner_func(state: OrchestratorState) -> dict:
+        services: Services = get_config()["configurable"][SERVICES_CONFIG_KEY]
         return await func(state, services)
 
     return inner_func
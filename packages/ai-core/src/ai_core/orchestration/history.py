@@ -0,0 +1,61 @@
+"""Windowing of conversation history into a bounded, cache-friendly prompt."""
+
+import math
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+
+from ai_core.orchestration.services.llm_service import ChatMessage
+from ai_core.orchestration.services.token_counter import estimate_message_tokens
+
+
+@dataclass(frozen=True)
+class HistoryWindow:
+    """
+    Token budget for the conversation history sent with each turn.
+
+    Oldest turns are trimmed first, and only whole turns: the kept history
+    always starts at a user message. Trimming happens in steps of
+    ``step_tokens`` counted from the start of the conversation rather than
+    just enough to fit, so the cut point stays put while new turns are
+    appended and only jumps forward when another step is needed. Between
+    jumps, the prompt prefix (system prompt plus kept history) is
+    byte-identical from one turn to the next, so provider prompt caches keep
+    hitting, and the history stays between ``max_tokens - step_tokens`` and
+    ``max_tokens`` tokens.
+    """
+
+    max_tokens: int
+    step_tokens: int | None = None
+
+    def apply(
+        self,
+        history: Sequence[ChatMessage],
+        count_tokens: Callable[[ChatMessage], int] = estimate_message_tokens,
+        counts: Sequence[int] | None = None,
+    ) -> list[ChatMessage]:
+        """
+        Trim the oldest turns until the history fits the budget.
+
+        Args:
+            history: Prior messages in chronological order.
+            count_tokens: Prompt token count of one message.
+            counts: Token counts of the history's messages, if already known;
+                count_tokens is not called when given.
+
+        Returns:
+            The most recent turns that fit, in chronological order.
+        """
+        if counts is None:
+            counts = [count_tokens(message) for message in history]
+        total = sum(counts)
+        if total <= self.max_tokens:
+            return list(history)
+
+        step = self.step_tokens or max(self.max_tokens // 2, 1)
+        trim_tokens = math.ceil((total - self.max_tokens) / step) * step
+        dropped = 0
+        for index, message in enumerate(history):
+            if dropped >= trim_tokens and message.role == "user":
+                return list(history[index:])
+            dropped += counts[index]
+        return []
@@ -1,9 +1,58 @@
+from collections.abc import Callable, Sequence
+
 from langgraph.config import get_stream_writer
 
+from ai_core.orchestration.history import HistoryWindow
 from ai_core.orchestration.services import Services
 from ai_core.orchestration.services.llm_service import ChatMessage
+from ai_core.orchestration.services.token_counter import estimate_message_tokens
 from ai_core.orchestration.state import OrchestratorState
-from ai_core.orchestration.streaming import StreamDone, StreamUsage, TokenDelta
+from ai_core.orchestration.streaming import (
+    StreamDone,
+    StreamUsage,
+    TokenDelta,
+    closing_stream,
+)
+
+
+def build_prompt(
+    state: OrchestratorState,
+    history_window: HistoryWindow | None = None,
+    count_tokens: Callable[[ChatMessage], int] = estimate_message_tokens,
+    history_counts: Sequence[int] | None = None,
+) -> list[ChatMessage]:
+    """
+    Assemble the messages for an LLM call from the graph state.
+
+    The system prompt and history come first so the prompt prefix stays
+    stable across turns. The turn's first message is the user input; any
+    later ones were generated by earlier nodes and are sent as assistant
+    messages.
+
+    Args:
+        state: The current state of the graph.
+        history_window: Token budget to trim the history to, if any.
+        count_tokens: Prompt token count of one message, used for trimming.
+        history_counts: Token counts of the history's messages, if already known.
+
+    Returns:
+        The chat messages in prompt order.
+    """
+    messages: list[ChatMessage] = []
+    system_prompt = state.get("system_prompt")
+    if system_prompt:
+        messages.append(ChatMessage(role="system", content=system_prompt))
+
+    history = state.get("history") or []
+    if history_window is not None:
+        history = history_window.apply(history, count_tokens, history_counts)
+    messages.extend(history)
+
+    for index, content in enumerate(state["messages"]):
+        messages.append(
+            ChatMessage(role="user" if index == 0 else "assistant", content=content)
+        )
+    return messages
 
 
 async def llm_generate(state: OrchestratorState, services: Services) -> dict:
@@ -17,9 +66,16 @@ async def llm_generate(state: OrchestratorState, services: Services) -> dict:
     Returns:
         dict: The updated state with the generated message.
     """
-    # Convert state messages to ChatMessage format
-    # Assuming all messages are user messages for now
-    chat_messages = [ChatMessage(role="user", content=msg) for msg in state["messages"]]
+    # Count the whole history in one batch, off the event loop if it's long
+    history = state.get("history") or []
+    history_counts = None
+    if services.history_window is not None and history:
+        history_counts = await services.token_counter.count_messages_async(
+            history, services.llm_main.model
+        )
+    chat_messages = build_prompt(
+        state, services.history_window, history_counts=history_counts
+    )
 
     # Get stream writer (requires stream_mode="custom")
     writer = get_stream_writer()
@@ -28,20 +84,21 @@ async def llm_generate(state: OrchestratorState, services: Services) -> dict:
     accumulated_text = ""
     stream = services.llm_main.stream(chat_messages)
 
-    async for event in stream:
-        if isinstance(event, TokenDelta):
-            writer({"type": "token_delta", "content": event.text})
-            accumulated_text += event.text
-        elif isinstance(event, StreamUsage):
-            # Convert Usage dataclass to dict for serialization
-            usage_dict = {
-                "prompt_tokens": event.usage.prompt_tokens,
-                "completion_tokens": event.usage.completion_tokens,
-                "total_tokens": event.usage.total_tokens,
-            }
-            writer({"type": "stream_usage", "usage": usage_dict})
-        elif isinstance(event, StreamDone):
-            writer({"type": "stream_done", "finish_reason": event.finish_reason})
+    async with closing_stream(stream):
+        async for event in stream:
+            if isinstance(event, TokenDelta):
+                writer({"type": "token_delta", "content": event.text})
+                accumulated_text += event.text
+            elif isinstance(event, StreamUsage):
+                # Convert Usage dataclass to dict for serialization
+                usage_dict = {
+                    "prompt_tokens": event.usage.prompt_tokens,
+                    "completion_tokens": event.usage.completion_tokens,
+                    "total_tokens": event.usage.total_tokens,
+                }
+                writer({"type": "stream_usage", "usage": usage_dict})
+            elif isinstance(event, StreamDone):
+                writer({"type": "stream_done", "finish_reason": event.finish_reason})
 
     # Return accumulated text in state
     return {"messages": [accumulated_text]}
@@ -1,6 +1,8 @@
+import time
 from collections.abc import AsyncIterator
 
 from ai_core.orchestration.graphs.graph import OrchestratorGraph
+from ai_core.orchestration.services import Services
 from ai_core.orchestration.streaming import (
     ChatStreamEvent,
     SourcedEvent,
@@ -8,7 +10,9 @@ from ai_core.orchestration.streaming import (
     StreamUsage,
     TokenDelta,
     Usage,
+    closing_stream,
 )
+from ai_core.orchestration.turn_metrics import TurnMetrics
 
 
 class ChatOrchestrator:
@@ -16,18 +20,21 @@ class ChatOrchestrator:
     The main orchestration component for executing chat graphs.
     """
 
-    def __init__(self, graph: OrchestratorGraph):
+    def __init__(self, graph: OrchestratorGraph, services: Services):
         """
         Initialize the ChatOrchestrator.
 
         Args:
-            graph (OrchestratorGraph): The graph instance to execute.
+            graph (OrchestratorGraph): The compiled graph to execute.
+            services (Services): Per-request services injected into the graph's nodes.
         """
         self._graph = graph
+        self._services = services
 
     async def execute(
         self,
         initial_state: dict,
+        metrics: TurnMetrics | None = None,
     ) -> AsyncIterator[SourcedEvent]:
         """
         Executes the graph with the given initial state and streams structured events.
@@ -35,46 +42,60 @@ class ChatOrchestrator:
         Args:
             initial_state: Dictionary containing the initial state for graph execution.
                 Expected keys: request_id, session_id, user_id, model_bindings, messages.
+            metrics: Turn measurements to fill in; each event is accounted for
+                before it is yielded.
 
         Yields:
             SourcedEvent: Structured events from the graph execution.
         """
         current_source: str | None = None
+        if metrics is not None:
+            metrics.begin(time.perf_counter())
 
-        async for stream_item in self._graph.astream(
-            initial_state, stream_mode="custom"
-        ):
-            if not isinstance(stream_item, dict):
-                continue
+        stream = self._graph.astream(
+            initial_state, stream_mode="custom", services=self._services
+        )
+        async with closing_stream(stream):
+            async for stream_item in stream:
+                if not isinstance(stream_item, dict):
+                    continue
 
-            # Check if this is a state update (has node name keys, not custom event)
-            node_keys = [key for key in stream_item.keys() if not key.startswith("__")]
-            if node_keys and "type" not in stream_item:
-                # This is a state update - track the current source node
-                current_source = node_keys[0]
-                # State updates themselves are not yielded as events
-                continue
+                # Check if this is a state update (has node name keys, not custom event)
+                node_keys = [
+                    key for key in stream_item.keys() if not key.startswith("__")
+                ]
+                if node_keys and "type" not in stream_item:
+                    # This is a state update - track the current source node
+                    current_source = node_keys[0]
+                    # State updates themselves are not yielded as events
+                    continue
 
-            # Check if this is a custom event from stream writer
-            if "type" in stream_item:
-                event_type = stream_item.get("type")
-                event: ChatStreamEvent | None = None
+                # Check if this is a custom event from stream writer
+                if "type" in stream_item:
+                    event_type = stream_item.get("type")
+                    event: ChatStreamEvent | None = None
 
-                if event_type == "token_delta":
-                    content = stream_item.get("content", "")
-                    event = TokenDelta(text=content)
-                elif event_type == "stream_usage":
-                    usage_dict = stream_item.get("usage")
-                    if usage_dict:
-                        usage = Usage(
-                            prompt_tokens=usage_dict.get("prompt_tokens"),
-                            completion_tokens=usage_dict.get("completion_tokens"),
-                            total_tokens=usage_dict.get("total_tokens"),
-                        )
-                        event = StreamUsage(usage=usage)
-                elif event_type == "stream_done":
-                    finish_reason = stream_item.get("finish_reason")
-                    event = StreamDone(finish_reason=finish_reason)
+                    if event_type == "token_delta":
+                        content = stream_item.get("content", "")
+                        event = TokenDelta(text=content)
+                    elif event_type == "stream_usage":
+                        usage_dict = stream_item.get("usage")
+                        if usage_dict:
+                            usage = Usage(
+                                prompt_tokens=usage_dict.get("prompt_tokens"),
+                                completion_tokens=usage_dict.get("completion_tokens"),
+                                total_tokens=usage_dict.get("total_tokens"),
+                            )
+                            event = StreamUsage(usage=usage)
+                    elif event_type == "stream_done":
+                        finish_reason = stream_item.get("finish_reason")
+                        event = StreamDone(finish_reason=finish_reason)
 
-                if event is not None:
-                    yield SourcedEvent(source=current_source, event=event)
+                    if event is not None:
+                        if metrics is not None:
+                            metrics.observe(event, time.perf_counter())
+                        yield SourcedEvent(source=current_source, event=event)
+
+        # Graphs that end without a stream_done event still end the turn
+        if metrics is not None:
+            metrics.finish(time.perf_counter())
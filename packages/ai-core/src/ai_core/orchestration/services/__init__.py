@@ -1,6 +1,14 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
 
 from ai_core.orchestration.services.llm_service import LLMService
+from ai_core.orchestration.services.token_budget import TokenBudget
+from ai_core.orchestration.services.token_counter import TokenCounter
+
+if TYPE_CHECKING:
+    from ai_core.orchestration.history import HistoryWindow
+
+__all__ = ["LLMService", "Services", "TokenBudget", "TokenCounter"]
 
 
 @dataclass
@@ -8,3 +16,7 @@ class Services:
     """Container for orchestration services."""
 
     llm_main: LLMService
+    # Token budget for conversation history; None sends the history untrimmed
+    history_window: "HistoryWindow | None" = None
+    # Prompt token counts; the default only estimates from message length
+    token_counter: TokenCounter = field(default_factory=TokenCounter)
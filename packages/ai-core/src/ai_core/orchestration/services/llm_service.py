@@ -4,13 +4,15 @@ from dataclasses import dataclass
 from collections.abc import AsyncIterator
 from typing import Any, Literal, Protocol
 
-from ai_core.models import ModelProfile
+from ai_core.models import GenerationParams, ModelProfile
+from ai_core.orchestration.services.token_budget import TokenBudget
 from ai_core.orchestration.streaming import (
     ChatStreamEvent,
     StreamDone,
     StreamUsage,
     TokenDelta,
     Usage,
+    closing_stream,
 )
 
 # Re-export for backward compatibility
@@ -52,6 +54,12 @@ class ChatRequest:
     top_p: float | None = None
     max_tokens: int | None = None
     stop: list[str] | None = None
+    # Routing hint for multi-endpoint clients; never sent upstream
+    affinity_key: str | None = None
+    # Opt-in to the exact-match response cache; never sent upstream
+    cache: bool = False
+    # time.monotonic() time by which the call must finish; never sent upstream
+    deadline: float | None = None
 
 
 @dataclass
@@ -91,24 +99,87 @@ class LLMClient(Protocol):
         """
         ...
 
+    async def warm_up(self) -> None:
+        """Open upstream connections ahead of the first request."""
+        ...
+
     async def aclose(self) -> None:
         """Close the client."""
         ...
 
 
 class LLMService:
-    """Service for LLM operations with model-specific defaults."""
-
-    def __init__(self, client: LLMClient, profile: ModelProfile) -> None:
+    """
+    Service for LLM operations with model-specific defaults.
+
+    Generation parameters are resolved from three layers, each overriding
+    the one before: the model profile's defaults, the keyword overrides a
+    graph node passes to ``stream`` or ``chat``, and the request-level
+    parameters given at construction. When a token budget is attached, every
+    call's ``max_tokens`` is capped at what the turn has left.
+    """
+
+    def __init__(
+        self,
+        client: LLMClient,
+        profile: ModelProfile,
+        affinity_key: str | None = None,
+        deadline: float | None = None,
+        params: GenerationParams | None = None,
+        budget: TokenBudget | None = None,
+    ) -> None:
         """
         Initialize the LLM service.
 
         Args:
             client: LLM client instance.
             profile: Model profile with defaults.
+            affinity_key: Key (typically the session ID) that multi-endpoint
+                clients use to keep requests on the same upstream replica.
+            deadline: ``time.monotonic()`` time by which every request made
+                through this service must finish, or None for no deadline.
+            params: Request-level generation parameters, which take precedence
+                over both the profile and node overrides.
+            budget: Completion token budget shared by the turn's LLM calls.
         """
         self._client: LLMClient = client
         self._profile: ModelProfile = profile
+        self._affinity_key = affinity_key
+        self._deadline = deadline
+        self._params = params
+        self._budget = budget
+        # Most calls pass no overrides, so resolve their parameters up front
+        self._base_params = (
+            profile.generation_params
+            if params is None
+            else profile.generation_params.merged(params)
+        )
+
+    @property
+    def model(self) -> str:
+        """Upstream model name requests are sent to."""
+        return self._profile.model
+
+    def resolve_params(self, **overrides: Any) -> GenerationParams:
+        """
+        Resolve the generation parameters for a call.
+
+        Args:
+            **overrides: Node-level parameter overrides (temperature, top_p,
+                max_tokens, stop).
+
+        Returns:
+            The merged parameters, before any token budget cap.
+
+        Raises:
+            TypeError: If an override is not a generation parameter.
+        """
+        if not overrides:
+            return self._base_params
+        layers = [GenerationParams.from_overrides(overrides)]
+        if self._params is not None:
+            layers.append(self._params)
+        return self._profile.generation_params.merged(*layers)
 
     def stream(
         self, messages: list[ChatMessage], **overrides: Any
@@ -122,9 +193,15 @@ class LLMService:
 
         Returns:
             AsyncIterator of ChatStreamEvent objects.
+
+        Raises:
+            TokenBudgetExhaustedError: If the turn's token budget is spent.
         """
-        request = ChatRequest(model=self._profile.model, messages=messages, stream=True)
-        return self._client.stream_chat(request)
+        request = self._build_request(messages, stream=True, overrides=overrides)
+        stream = self._client.stream_chat(request)
+        if self._budget is None:
+            return stream
+        return self._charge_stream(stream, self._budget)
 
     async def chat(self, messages: list[ChatMessage], **overrides: Any) -> ChatResponse:
         """
@@ -136,8 +213,58 @@ class LLMService:
 
         Returns:
             Chat response.
+
+        Raises:
+            TokenBudgetExhaustedError: If the turn's token budget is spent.
         """
-        request = ChatRequest(
-            model=self._profile.model, messages=messages, stream=False
+        request = self._build_request(messages, stream=False, overrides=overrides)
+        response = await self._client.chat(request)
+        if self._budget is not None:
+            usage = response.usage
+            if usage is not None and usage.completion_tokens is not None:
+                self._budget.charge(usage.completion_tokens)
+            else:
+                # Without usage, assume the call used everything it was allowed
+                self._budget.charge(request.max_tokens or 0)
+        return response
+
+    def _build_request(
+        self, messages: list[ChatMessage], stream: bool, overrides: dict[str, Any]
+    ) -> ChatRequest:
+        params = self.resolve_params(**overrides)
+        max_tokens = params.max_tokens
+        if self._budget is not None:
+            max_tokens = self._budget.cap(max_tokens)
+        return ChatRequest(
+            model=self._profile.model,
+            messages=messages,
+            stream=stream,
+            temperature=params.temperature,
+            top_p=params.top_p,
+            max_tokens=max_tokens,
+            stop=list(params.stop) if params.stop is not None else None,
+            affinity_key=self._affinity_key,
+            cache=self._profile.response_cache_enabled,
+            deadline=self._deadline,
         )
-        return await self._client.chat(request)
+
+    @staticmethod
+    async def _charge_stream(
+        stream: AsyncIterator[ChatStreamEvent], budget: TokenBudget
+    ) -> AsyncIterator[ChatStreamEvent]:
+        """Pass a stream through, charging what it generated to the budget."""
+        completion_tokens: int | None = None
+        deltas = 0
+        try:
+            async with closing_stream(stream):
+                async for event in stream:
+                    if isinstance(event, TokenDelta):
+                        deltas += 1
+                    elif isinstance(event, StreamUsage):
+                        completion_tokens = event.usage.completion_tokens
+                    yield event
+        finally:
+            # Providers that report no usage stream roughly one token per delta
+            budget.charge(
+                completion_tokens if completion_tokens is not None else deltas
+            )
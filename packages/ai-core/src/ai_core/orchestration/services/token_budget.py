@@ -0,0 +1,57 @@
+"""Per-turn budget of completion tokens shared by a turn's LLM calls."""
+
+from ai_core.exceptions import TokenBudgetExhaustedError
+
+
+class TokenBudget:
+    """
+    Completion tokens a turn may still spend across all of its LLM calls.
+
+    Each call's ``max_tokens`` is capped at what is left, and what the call
+    actually generated is charged back once it finishes, so a graph making
+    several calls cannot run past the turn's total.
+    """
+
+    def __init__(self, total: int) -> None:
+        """
+        Initialize the budget.
+
+        Args:
+            total: Completion tokens available to the whole turn.
+        """
+        self.total = total
+        self.spent = 0
+
+    @property
+    def remaining(self) -> int:
+        """Completion tokens still available."""
+        return max(self.total - self.spent, 0)
+
+    def cap(self, max_tokens: int | None) -> int:
+        """
+        Limit a call's max_tokens to the remaining budget.
+
+        Args:
+            max_tokens: The call's resolved max_tokens, or None if unbounded.
+
+        Returns:
+            The smaller of max_tokens and the remaining budget.
+
+        Raises:
+            TokenBudgetExhaustedError: If nothing is left to spend.
+        """
+        remaining = self.remaining
+        if remaining == 0:
+            raise TokenBudgetExhaustedError(
+                f"Turn token budget of {self.total} tokens is spent"
+            )
+        return remaining if max_tokens is None else min(max_tokens, remaining)
+
+    def charge(self, tokens: int) -> None:
+        """
+        Record tokens generated by a finished call.
+
+        Args:
+            tokens: Completion tokens the call produced.
+        """
+        self.spent += tokens
@@ -0,0 +1,323 @@
+"""Prompt token counting with cached per-model-family tokenizers."""
+
+import asyncio
+import hashlib
+import logging
+import math
+from collections import OrderedDict
+from collections.abc import Callable, Mapping, Sequence
+from pathlib import Path
+from typing import Protocol
+
+from ai_core.orchestration.services.llm_service import ChatMessage
+
+try:
+    import tokenizers  # type: ignore[import-not-found,unused-ignore]
+except ImportError:  # pragma: no cover - optional dependency
+    tokenizers = None  # type: ignore[assignment]
+
+log = logging.getLogger("services.token_counter")
+
+# Rough per-message cost of role markers and separators in chat templates
+MESSAGE_OVERHEAD_TOKENS = 4
+DEFAULT_CHARS_PER_TOKEN = 4.0
+
+
+def estimate_message_tokens(message: ChatMessage) -> int:
+    """
+    Estimate a message's prompt tokens from its length.
+
+    Args:
+        message: The message to measure.
+
+    Returns:
+        About one token per four characters, plus the per-message overhead.
+    """
+    return (
+        math.ceil(len(message.content) / DEFAULT_CHARS_PER_TOKEN)
+        + MESSAGE_OVERHEAD_TOKENS
+    )
+
+
+class Tokenizer(Protocol):
+    """Protocol for tokenizers that can count tokens in a batch of texts."""
+
+    def count(self, texts: Sequence[str]) -> list[int]:
+        """
+        Count the tokens in each text.
+
+        Args:
+            texts: Texts to tokenize.
+
+        Returns:
+            Token counts, one per text.
+        """
+        ...
+
+
+class HfTokenizer:
+    """Tokenizer loaded from a Hugging Face ``tokenizer.json`` file."""
+
+    def __init__(self, path: Path) -> None:
+        """
+        Load the tokenizer.
+
+        Args:
+            path: Path to the ``tokenizer.json`` file.
+
+        Raises:
+            RuntimeError: If the optional ``tokenizers`` package is missing.
+        """
+        if tokenizers is None:
+            raise RuntimeError("Loading tokenizers requires the tokenizers package")
+        self._tokenizer = tokenizers.Tokenizer.from_file(str(path))
+
+    def count(self, texts: Sequence[str]) -> list[int]:
+        """Count the tokens in each text, encoding the batch in parallel."""
+        encodings = self._tokenizer.encode_batch(list(texts), add_special_tokens=False)
+        return [len(encoding.ids) for encoding in encodings]
+
+
+class TokenCounter:
+    """
+    Counts prompt tokens for chat messages before they are sent upstream.
+
+    Models are mapped to tokenizer families by name prefix, and each family's
+    tokenizer is loaded once from ``<tokenizer_dir>/<family>/tokenizer.json``,
+    by preload() at startup or on first use. Per-message counts are kept in
+    an LRU keyed by a hash of the content, so re-counting a long history only
+    tokenizes the messages added since the last turn. Models without a
+    tokenizer are estimated from their character count instead.
+
+    Loading a tokenizer and encoding long texts take long enough to stall
+    the event loop, so count_messages_async() does both in a worker thread.
+    The cache itself is only touched from the calling thread.
+    """
+
+    def __init__(
+        self,
+        tokenizer_dir: str | Path | None = None,
+        families: Mapping[str, str] | None = None,
+        chars_per_token: float = DEFAULT_CHARS_PER_TOKEN,
+        cache_size: int = 8192,
+        loader: Callable[[Path], Tokenizer] = HfTokenizer,
+        thread_min_chars: int = 4096,
+    ) -> None:
+        """
+        Initialize the token counter.
+
+        Args:
+            tokenizer_dir: Directory holding one subdirectory per tokenizer family.
+            families: Model name prefixes mapped to tokenizer family names; the
+                longest matching prefix wins.
+            chars_per_token: Ratio used to estimate counts for unknown models.
+            cache_size: Maximum number of per-message counts to keep.
+            loader: Loads a tokenizer from a ``tokenizer.json`` path.
+            thread_min_chars: Uncached text of at least this many characters is
+                tokenized in a worker thread by count_messages_async().
+        """
+        self._tokenizer_dir = Path(tokenizer_dir) if tokenizer_dir else None
+        # Longest prefixes first, so the most specific mapping wins
+        self._families = sorted(
+            (families or {}).items(), key=lambda item: len(item[0]), reverse=True
+        )
+        self._chars_per_token = chars_per_token
+        self._cache_size = cache_size
+        self._loader = loader
+        self._thread_min_chars = thread_min_chars
+        self._model_families: dict[str, str | None] = {}
+        self._tokenizers: dict[str, Tokenizer | None] = {}
+        self._counts: OrderedDict[tuple[str, bytes], int] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def family(self, model: str) -> str | None:
+        """
+        Find the tokenizer family for a model.
+
+        Args:
+            model: Upstream model name.
+
+        Returns:
+            The family name, or None if no prefix matches.
+        """
+        try:
+            return self._model_families[model]
+        except KeyError:
+            pass
+        family = next(
+            (name for prefix, name in self._families if model.startswith(prefix)),
+            None,
+        )
+        self._model_families[model] = family
+        return family
+
+    def count_text(self, text: str, model: str) -> int:
+        """
+        Count the tokens in a piece of text, without caching it.
+
+        Args:
+            text: Text to count.
+            model: Upstream model name.
+
+        Returns:
+            The token count, estimated when the model has no tokenizer.
+        """
+        tokenizer = self._tokenizer_for(model)
+        if tokenizer is None:
+            return self._estimate(text)
+        return tokenizer.count([text])[0]
+
+    def count_message(self, message: ChatMessage, model: str) -> int:
+        """
+        Count a message's prompt tokens, including the per-message overhead.
+
+        Args:
+            message: Message to count.
+            model: Upstream model name.
+
+        Returns:
+            The message's token count.
+        """
+        return self.count_messages([message], model)[0]
+
+    def count_messages(self, messages: Sequence[ChatMessage], model: str) -> list[int]:
+        """
+        Count each message's prompt tokens, tokenizing cache misses in one batch.
+
+        Args:
+            messages: Messages to count.
+            model: Upstream model name.
+
+        Returns:
+            Token counts, one per message, including the per-message overhead.
+        """
+        family = self.family(model)
+        tokenizer = self._tokenizer(family) if family is not None else None
+        if family is None or tokenizer is None:
+            return self._estimate_messages(messages)
+
+        counts, missing = self._cached_counts(messages, family)
+        if missing:
+            texts = [messages[indices[0]].content for indices in missing.values()]
+            self._fill(counts, missing, tokenizer.count(texts))
+        return [count + MESSAGE_OVERHEAD_TOKENS for count in counts]
+
+    async def count_messages_async(
+        self, messages: Sequence[ChatMessage], model: str
+    ) -> list[int]:
+        """
+        Count each message's prompt tokens without blocking the event loop.
+
+        Same as count_messages(), except that a tokenizer not loaded yet is
+        loaded in a worker thread, and so are cache misses adding up to
+        ``thread_min_chars`` or more.
+
+        Args:
+            messages: Messages to count.
+            model: Upstream model name.
+
+        Returns:
+            Token counts, one per message, including the per-message overhead.
+        """
+        family = self.family(model)
+        if family is None:
+            return self._estimate_messages(messages)
+        if family not in self._tokenizers:
+            await self._load_async(family)
+        tokenizer = self._tokenizers[family]
+        if tokenizer is None:
+            return self._estimate_messages(messages)
+
+        counts, missing = self._cached_counts(messages, family)
+        if missing:
+            texts = [messages[indices[0]].content for indices in missing.values()]
+            if sum(len(text) for text in texts) >= self._thread_min_chars:
+                results = await asyncio.to_thread(tokenizer.count, texts)
+            else:
+                results = tokenizer.count(texts)
+            self._fill(counts, missing, results)
+        return [count + MESSAGE_OVERHEAD_TOKENS for count in counts]
+
+    async def preload(self) -> None:
+        """Load every configured family's tokenizer in a worker thread."""
+        for family in sorted({name for _, name in self._families}):
+            if family not in self._tokenizers:
+                await self._load_async(family)
+
+    def _tokenizer_for(self, model: str) -> Tokenizer | None:
+        family = self.family(model)
+        return self._tokenizer(family) if family is not None else None
+
+    def _tokenizer(self, family: str) -> Tokenizer | None:
+        """Get a family's tokenizer, loading it on first use."""
+        try:
+            return self._tokenizers[family]
+        except KeyError:
+            pass
+        tokenizer = self._tokenizers[family] = self._load(family)
+        return tokenizer
+
+    async def _load_async(self, family: str) -> None:
+        tokenizer = await asyncio.to_thread(self._load, family)
+        # Another caller may have loaded it while this one was in the thread
+        self._tokenizers.setdefault(family, tokenizer)
+
+    def _load(self, family: str) -> Tokenizer | None:
+        """Load a family's tokenizer, or None if it can't be (thread-safe)."""
+        if self._tokenizer_dir is None:
+            return None
+        path = self._tokenizer_dir / family / "tokenizer.json"
+        try:
+            return self._loader(path)
+        except Exception as e:
+            # The None is cached, so every call doesn't retry the load
+            log.warning(
+                "token_counter.load_failed",
+                extra={"family": family, "path": str(path), "error": str(e)},
+            )
+            return None
+
+    def _cached_counts(
+        self, messages: Sequence[ChatMessage], family: str
+    ) -> tuple[list[int], dict[tuple[str, bytes], list[int]]]:
+        """Look up cached counts, returning the misses' indices by cache key."""
+        counts = [0] * len(messages)
+        missing: dict[tuple[str, bytes], list[int]] = {}
+        for index, message in enumerate(messages):
+            key = (family, _content_digest(message.content))
+            count = self._counts.get(key)
+            if count is not None:
+                self._counts.move_to_end(key)
+                self.hits += 1
+                counts[index] = count
+            else:
+                missing.setdefault(key, []).append(index)
+        self.misses += len(missing)
+        return counts, missing
+
+    def _fill(
+        self,
+        counts: list[int],
+        missing: dict[tuple[str, bytes], list[int]],
+        results: Sequence[int],
+    ) -> None:
+        for (key, indices), count in zip(missing.items(), results):
+            self._store(key, count)
+            for index in indices:
+                counts[index] = count
+
+    def _estimate_messages(self, messages: Sequence[ChatMessage]) -> list[int]:
+        return [self._estimate(m.content) + MESSAGE_OVERHEAD_TOKENS for m in messages]
+
+    def _estimate(self, text: str) -> int:
+        return math.ceil(len(text) / self._chars_per_token)
+
+    def _store(self, key: tuple[str, bytes], count: int) -> None:
+        self._counts[key] = count
+        if len(self._counts) > self._cache_size:
+            self._counts.popitem(last=False)
+
+
+def _content_digest(content: str) -> bytes:
+    return hashlib.blake2b(content.encode(), digest_size=16).digest()
@@ -1,8 +1,9 @@
 import operator
-from typing import Annotated, Dict, TypedDict
+from typing import Annotated, Dict, NotRequired, TypedDict
 from uuid import UUID
 
 from ai_core.models import ModelProfile
+from ai_core.orchestration.services.llm_service import ChatMessage
 
 
 class OrchestratorState(TypedDict):
@@ -14,7 +15,10 @@ class OrchestratorState(TypedDict):
         session_id: Unique identifier for the session.
         user_id: Unique identifier for the user.
         model_bindings: Dictionary mapping slot names to model profiles.
-        messages: A list of messages.
+        messages: The turn's messages: the user input followed by any
+            responses generated by the graph's nodes.
+        system_prompt: System / persona prompt for the assistant, if any.
+        history: Prior conversation messages in chronological order.
     """
 
     request_id: UUID
@@ -22,3 +26,5 @@ class OrchestratorState(TypedDict):
     user_id: UUID
     model_bindings: Dict[str, ModelProfile]
     messages: Annotated[list[str], operator.add]
+    system_prompt: NotRequired[str | None]
+    history: NotRequired[list[ChatMessage]]
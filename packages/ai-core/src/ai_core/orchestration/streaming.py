@@ -1,6 +1,11 @@
 """Streaming event types for orchestration."""
 
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 from dataclasses import dataclass
+from typing import TypeVar
+
+T = TypeVar("T")
 
 
 @dataclass
@@ -42,3 +47,28 @@ class SourcedEvent:
 
     source: str | None
     event: ChatStreamEvent
+
+
+@asynccontextmanager
+async def closing_stream(stream: AsyncIterator[T]) -> AsyncIterator[AsyncIterator[T]]:
+    """
+    Close a stream as soon as the block using it exits.
+
+    Like ``contextlib.aclosing``, but accepts any async iterator: streams that
+    are async generators are closed with ``aclose()``, others are left alone.
+    Closing explicitly matters when a consumer stops early or is cancelled.
+    An abandoned generator is otherwise only finalized by the garbage
+    collector, so an upstream HTTP stream underneath it stays open until then.
+
+    Args:
+        stream: The stream to iterate.
+
+    Yields:
+        The same stream.
+    """
+    try:
+        yield stream
+    finally:
+        aclose = getattr(stream, "aclose", None)
+        if aclose is not None:
+            await aclose()
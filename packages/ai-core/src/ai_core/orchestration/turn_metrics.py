@@ -0,0 +1,127 @@
+"""Per-turn timing and usage measurements."""
+
+import math
+import time
+from dataclasses import dataclass, field
+
+from ai_core.orchestration.streaming import (
+    ChatStreamEvent,
+    StreamDone,
+    StreamUsage,
+    TokenDelta,
+    Usage,
+)
+
+
+def _add(a: int | None, b: int | None) -> int | None:
+    if a is None:
+        return b
+    if b is None:
+        return a
+    return a + b
+
+
+@dataclass
+class TurnMetrics:
+    """
+    Timing and usage of one chat turn, filled in as its events stream out.
+
+    All times are ``time.perf_counter()`` based and measured from
+    ``started_at``, the moment the turn was received, so they match what the
+    client sees rather than just the graph's share.
+
+    Attributes:
+        started_at: When the turn was received.
+        plan_s: Time spent building the turn's plan (profile lookups etc.).
+        queue_s: Time from receipt to the graph starting, excluding plan_s.
+        ttft_s: Time to the first token.
+        duration_s: Time to the end of the turn.
+        tokens: Token deltas streamed.
+        inter_token_s: Gaps between consecutive token deltas.
+        usage: Upstream usage, summed over the turn's LLM calls.
+    """
+
+    started_at: float = field(default_factory=time.perf_counter)
+    plan_s: float = 0.0
+    queue_s: float | None = None
+    ttft_s: float | None = None
+    duration_s: float | None = None
+    tokens: int = 0
+    inter_token_s: list[float] = field(default_factory=list)
+    usage: Usage | None = None
+    _last_token_at: float | None = field(default=None, repr=False)
+
+    def begin(self, now: float) -> None:
+        """Mark the graph starting."""
+        self.queue_s = max(now - self.started_at - self.plan_s, 0.0)
+
+    def observe(self, event: ChatStreamEvent, now: float) -> None:
+        """
+        Account for an event about to be streamed.
+
+        Args:
+            event: The stream event.
+            now: ``time.perf_counter()`` at the time of the event.
+        """
+        if isinstance(event, TokenDelta):
+            if self._last_token_at is None:
+                self.ttft_s = now - self.started_at
+            else:
+                self.inter_token_s.append(now - self._last_token_at)
+            self._last_token_at = now
+            self.tokens += 1
+        elif isinstance(event, StreamUsage):
+            usage = event.usage
+            if self.usage is None:
+                self.usage = Usage(
+                    usage.prompt_tokens, usage.completion_tokens, usage.total_tokens
+                )
+            else:
+                self.usage.prompt_tokens = _add(
+                    self.usage.prompt_tokens, usage.prompt_tokens
+                )
+                self.usage.completion_tokens = _add(
+                    self.usage.completion_tokens, usage.completion_tokens
+                )
+                self.usage.total_tokens = _add(
+                    self.usage.total_tokens, usage.total_tokens
+                )
+        elif isinstance(event, StreamDone):
+            self.finish(now)
+
+    def finish(self, now: float) -> None:
+        """Mark the end of the turn, unless it was already marked."""
+        if self.duration_s is None:
+            self.duration_s = now - self.started_at
+
+    @property
+    def tokens_per_s(self) -> float | None:
+        """
+        Decode rate from the first token to the end of the turn.
+
+        Upstream-reported completion tokens are used when available, since a
+        delta may carry more than one token.
+        """
+        if self.ttft_s is None or self.duration_s is None:
+            return None
+        elapsed = self.duration_s - self.ttft_s
+        if elapsed <= 0:
+            return None
+        completion_tokens = self.usage.completion_tokens if self.usage else None
+        tokens = completion_tokens if completion_tokens is not None else self.tokens
+        return tokens / elapsed
+
+    def inter_token_percentile(self, q: float) -> float | None:
+        """
+        Nearest-rank percentile of the gaps between token deltas.
+
+        Args:
+            q: Percentile as a fraction, e.g. 0.99.
+
+        Returns:
+            The gap in seconds, or None if fewer than two tokens were streamed.
+        """
+        if not self.inter_token_s:
+            return None
+        ordered = sorted(self.inter_token_s)
+        return ordered[max(math.ceil(q * len(ordered)) - 1, 0)]
@@ -1,3 +1,4 @@
+from collections.abc import Iterable
 from typing import Protocol, Optional
 from uuid import UUID
 from .models import GraphProfile, ModelProfile
@@ -18,6 +19,34 @@ class ModelProfileRepository(Protocol):
         """Retrieve a model profile by its ID."""
         ...
 
+    def get_by_ids(self, ids: Iterable[UUID]) -> dict[UUID, ModelProfile]:
+        """Retrieve model profiles by their IDs, omitting unknown IDs."""
+        ...
+
     def get_all(self) -> list[ModelProfile]:
         """Retrieve all model profiles."""
         ...
+
+
+class AsyncGraphProfileRepository(Protocol):
+    async def get_by_id(self, id: UUID) -> Optional[GraphProfile]:
+        """Retrieve a graph profile by its ID."""
+        ...
+
+    async def get_all(self) -> list[GraphProfile]:
+        """Retrieve all graph profiles."""
+        ...
+
+
+class AsyncModelProfileRepository(Protocol):
+    async def get_by_id(self, id: UUID) -> Optional[ModelProfile]:
+        """Retrieve a model profile by its ID."""
+        ...
+
+    async def get_by_ids(self, ids: Iterable[UUID]) -> dict[UUID, ModelProfile]:
+        """Retrieve model profiles by their IDs, omitting unknown IDs."""
+        ...
+
+    async def get_all(self) -> list[ModelProfile]:
+        """Retrieve all model profiles."""
+        ...
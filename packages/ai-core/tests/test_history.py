@@ -0,0 +1,84 @@
+from uuid import uuid4
+
+from ai_core.orchestration.history import HistoryWindow
+from ai_core.orchestration.nodes.generate import build_prompt
+from ai_core.orchestration.services.llm_service import ChatMessage
+
+
+def count_words(message: ChatMessage) -> int:
+    return len(message.content.split())
+
+
+def make_turn(index: int, words: int = 10) -> list[ChatMessage]:
+    return [
+        ChatMessage(role="user", content=" ".join([f"q{index}"] * words)),
+        ChatMessage(role="assistant", content=" ".join([f"a{index}"] * words)),
+    ]
+
+
+def make_history(turns: int) -> list[ChatMessage]:
+    return [message for index in range(turns) for message in make_turn(index)]
+
+
+def test_history_within_budget_is_kept_whole():
+    history = make_history(3)
+
+    assert HistoryWindow(max_tokens=60).apply(history, count_words) == history
+
+
+def test_oldest_whole_turns_are_trimmed_to_fit():
+    history = make_history(10)
+
+    kept = HistoryWindow(max_tokens=70, step_tokens=20).apply(history, count_words)
+
+    assert sum(count_words(m) for m in kept) <= 70
+    assert kept[0].role == "user"
+    assert kept == history[len(history) - len(kept) :]
+
+
+def test_kept_prefix_is_stable_while_conversation_grows():
+    window = HistoryWindow(max_tokens=100, step_tokens=40)
+    cut_points = []
+    for turns in range(1, 30):
+        history = make_history(turns)
+        kept = window.apply(history, count_words)
+        assert sum(count_words(m) for m in kept) <= 100
+        cut_points.append(len(history) - len(kept))
+
+    # The cut moves in jumps of a whole step (two turns), not on every turn
+    assert len(set(cut_points)) < len(cut_points) / 2 + 1
+    for before, after in zip(cut_points, cut_points[1:]):
+        assert after == before or after - before == 4
+
+
+def test_prompt_orders_system_history_and_turn_with_roles():
+    state = {
+        "request_id": uuid4(),
+        "session_id": uuid4(),
+        "user_id": uuid4(),
+        "model_bindings": {},
+        "messages": ["And now?", "Draft answer"],
+        "system_prompt": "Be brief.",
+        "history": make_turn(0, words=1),
+    }
+
+    prompt = build_prompt(state)  # type: ignore[arg-type]
+
+    assert [(m.role, m.content) for m in prompt] == [
+        ("system", "Be brief."),
+        ("user", "q0"),
+        ("assistant", "a0"),
+        ("user", "And now?"),
+        ("assistant", "Draft answer"),
+    ]
+
+
+def test_precomputed_counts_are_used_instead_of_counting():
+    history = make_history(10)
+    counts = [count_words(m) for m in history]
+
+    def fail(message: ChatMessage) -> int:
+        raise AssertionError("counted a message")
+
+    window = HistoryWindow(max_tokens=70, step_tokens=20)
+    assert window.apply(history, fail, counts) == window.apply(history, count_words)
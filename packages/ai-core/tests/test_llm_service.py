@@ -0,0 +1,147 @@
+from collections.abc import AsyncIterator
+from datetime import UTC, datetime
+from uuid import uuid4
+
+import pytest
+
+from ai_core.exceptions import TokenBudgetExhaustedError
+from ai_core.models import GenerationParams, ModelProfile
+from ai_core.orchestration.services import LLMService, TokenBudget
+from ai_core.orchestration.services.llm_service import (
+    ChatMessage,
+    ChatRequest,
+    ChatResponse,
+)
+from ai_core.orchestration.streaming import (
+    ChatStreamEvent,
+    StreamDone,
+    StreamUsage,
+    TokenDelta,
+    Usage,
+)
+
+MESSAGES = [ChatMessage(role="user", content="hi")]
+
+
+class RecordingLLMClient:
+    """Fake client recording requests and streaming a fixed completion."""
+
+    def __init__(self, tokens: int = 3, usage: bool = True) -> None:
+        self.requests: list[ChatRequest] = []
+        self._tokens = tokens
+        self._usage = usage
+
+    async def chat(self, request: ChatRequest) -> ChatResponse:
+        self.requests.append(request)
+        usage = Usage(completion_tokens=self._tokens) if self._usage else None
+        return ChatResponse(text="x" * self._tokens, usage=usage)
+
+    def stream_chat(self, request: ChatRequest) -> AsyncIterator[ChatStreamEvent]:
+        self.requests.append(request)
+        return self._stream()
+
+    async def _stream(self) -> AsyncIterator[ChatStreamEvent]:
+        for _ in range(self._tokens):
+            yield TokenDelta(text="x")
+        if self._usage:
+            yield StreamUsage(usage=Usage(completion_tokens=self._tokens))
+        yield StreamDone(finish_reason="stop")
+
+
+def make_profile(**params) -> ModelProfile:
+    now = datetime.now(UTC)
+    return ModelProfile(
+        id=uuid4(),
+        name="test",
+        description="",
+        model="test-model",
+        created_at=now,
+        updated_at=now,
+        is_active=True,
+        **params,
+    )
+
+
+async def drain(stream: AsyncIterator[ChatStreamEvent]) -> None:
+    async for _ in stream:
+        pass
+
+
+@pytest.mark.asyncio
+async def test_profile_defaults_are_sent_upstream():
+    client = RecordingLLMClient()
+    profile = make_profile(temperature=0.2, top_p=0.9, max_tokens=64)
+    service = LLMService(client, profile)  # type: ignore[arg-type]
+
+    await drain(service.stream(MESSAGES))
+    await service.chat(MESSAGES)
+
+    for request in client.requests:
+        assert (request.temperature, request.top_p, request.max_tokens) == (
+            0.2,
+            0.9,
+            64,
+        )
+
+
+def test_layers_resolve_profile_then_node_then_request():
+    profile = make_profile(temperature=0.2, top_p=0.9, max_tokens=64)
+    service = LLMService(
+        RecordingLLMClient(),  # type: ignore[arg-type]
+        profile,
+        params=GenerationParams(max_tokens=16),
+    )
+
+    params = service.resolve_params(temperature=0.7, max_tokens=128, stop=["\n"])
+
+    assert params == GenerationParams(
+        temperature=0.7, top_p=0.9, max_tokens=16, stop=("\n",)
+    )
+    assert service.resolve_params() == GenerationParams(
+        temperature=0.2, top_p=0.9, max_tokens=16
+    )
+
+
+def test_unknown_override_is_rejected():
+    service = LLMService(RecordingLLMClient(), make_profile())  # type: ignore[arg-type]
+
+    with pytest.raises(TypeError):
+        service.resolve_params(temprature=0.5)
+
+
+def test_profile_params_are_resolved_once():
+    profile = make_profile(temperature=0.2)
+
+    assert profile.generation_params is profile.generation_params
+
+
+@pytest.mark.asyncio
+async def test_budget_caps_max_tokens_and_is_charged_per_call():
+    client = RecordingLLMClient(tokens=6)
+    budget = TokenBudget(10)
+    service = LLMService(client, make_profile(max_tokens=8), budget=budget)  # type: ignore[arg-type]
+
+    await drain(service.stream(MESSAGES))
+    assert client.requests[0].max_tokens == 8
+    assert budget.remaining == 4
+
+    await service.chat(MESSAGES)
+    assert client.requests[1].max_tokens == 4
+    assert budget.remaining == 0
+
+    with pytest.raises(TokenBudgetExhaustedError):
+        service.stream(MESSAGES)
+
+
+@pytest.mark.asyncio
+async def test_budget_counts_deltas_without_usage():
+    budget = TokenBudget(100)
+    service = LLMService(
+        RecordingLLMClient(tokens=5, usage=False),  # type: ignore[arg-type]
+        make_profile(),
+        budget=budget,
+    )
+
+    await drain(service.stream(MESSAGES))
+
+    assert budget.spent == 5
@@ -1,10 +1,18 @@
+import asyncio
+import time
+from collections.abc import AsyncIterator
+from datetime import UTC, datetime
+
 import pytest
 from uuid import uuid4
 
-from ai_core.orchestration.graphs import graph_registry
+from ai_core.models import ModelProfile
+from ai_core.orchestration.graphs import get_graph, graph_registry
 from ai_core.orchestration.orchestrator import ChatOrchestrator
-from ai_core.orchestration.services import Services
-from ai_core.orchestration.streaming import TokenDelta
+from ai_core.orchestration.services import LLMService, Services
+from ai_core.orchestration.services.llm_service import ChatRequest
+from ai_core.orchestration.streaming import ChatStreamEvent, TokenDelta
+from ai_core.orchestration.turn_metrics import TurnMetrics
 
 
 @pytest.mark.asyncio
@@ -14,13 +22,12 @@ async def test_chat_orchestrator_execution():
     and return the expected dummy response.
     """
     # Arrange
-    build_graph = graph_registry.get("dummy_v1")
-    assert build_graph is not None, "dummy_v1 should be registered"
+    assert "dummy_v1" in graph_registry, "dummy_v1 should be registered"
 
     services = Services(llm_main=None)
 
-    graph = build_graph(services)
-    orchestrator = ChatOrchestrator(graph)
+    graph = get_graph("dummy_v1")
+    orchestrator = ChatOrchestrator(graph, services)
     input_message = "Test message"
     expected_response = "This is a dummy response from the LLM generation node."
 
@@ -47,3 +54,128 @@ async def test_chat_orchestrator_execution():
     response = response.rstrip()
 
     assert response == expected_response
+
+
+def test_get_graph_compiles_once():
+    """
+    Verifies that compiled graphs are cached per registry entry.
+    """
+    assert get_graph("dummy_v1") is get_graph("dummy_v1")
+    assert get_graph("default_v1") is not get_graph("dummy_v1")
+
+
+class EndlessLLMClient:
+    """Fake client streaming tokens until it is closed."""
+
+    def __init__(self) -> None:
+        self.requests: list[ChatRequest] = []
+        self.closed = False
+
+    def stream_chat(self, request: ChatRequest) -> AsyncIterator[ChatStreamEvent]:
+        self.requests.append(request)
+        return self._stream()
+
+    async def _stream(self) -> AsyncIterator[ChatStreamEvent]:
+        try:
+            while True:
+                yield TokenDelta(text="tok ")
+                await asyncio.sleep(0.01)
+        finally:
+            self.closed = True
+
+
+def make_orchestrator(
+    client: EndlessLLMClient, deadline: float | None = None
+) -> ChatOrchestrator:
+    now = datetime.now(UTC)
+    profile = ModelProfile(
+        id=uuid4(),
+        name="test",
+        description="",
+        model="test-model",
+        created_at=now,
+        updated_at=now,
+        is_active=True,
+    )
+    service = LLMService(client, profile, deadline=deadline)  # type: ignore[arg-type]
+    return ChatOrchestrator(get_graph("default_v1"), Services(llm_main=service))
+
+
+def make_initial_state() -> dict:
+    return {
+        "request_id": uuid4(),
+        "session_id": uuid4(),
+        "user_id": uuid4(),
+        "model_bindings": {},
+        "messages": ["Hello"],
+    }
+
+
+@pytest.mark.asyncio
+async def test_closing_execute_closes_llm_stream_immediately():
+    """
+    Verifies that abandoning a turn closes the LLM stream underneath the graph
+    right away rather than leaving it to the garbage collector.
+    """
+    client = EndlessLLMClient()
+    stream = make_orchestrator(client).execute(make_initial_state())
+
+    first = await anext(stream)
+    assert first.event == TokenDelta(text="tok ")
+    assert not client.closed
+
+    await stream.aclose()
+
+    assert client.closed
+
+
+@pytest.mark.asyncio
+async def test_cancelling_execute_closes_llm_stream():
+    client = EndlessLLMClient()
+
+    async def consume() -> None:
+        async for _ in make_orchestrator(client).execute(make_initial_state()):
+            pass
+
+    task = asyncio.create_task(consume())
+    await asyncio.sleep(0.05)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    assert client.closed
+
+
+@pytest.mark.asyncio
+async def test_llm_service_passes_deadline_to_requests():
+    client = EndlessLLMClient()
+    deadline = time.monotonic() + 5
+    stream = make_orchestrator(client, deadline=deadline).execute(make_initial_state())
+
+    await anext(stream)
+    await stream.aclose()
+
+    assert client.requests[0].deadline == deadline
+
+
+@pytest.mark.asyncio
+async def test_execute_fills_in_turn_metrics():
+    """
+    Verifies that execute accounts for every event it streams in the turn's
+    metrics.
+    """
+    services = Services(llm_main=None)
+    orchestrator = ChatOrchestrator(get_graph("dummy_v1"), services)
+    metrics = TurnMetrics()
+
+    tokens = 0
+    async for sourced_event in orchestrator.execute(make_initial_state(), metrics):
+        if isinstance(sourced_event.event, TokenDelta):
+            tokens += 1
+
+    assert metrics.queue_s is not None
+    assert metrics.ttft_s is not None
+    assert metrics.duration_s is not None
+    assert metrics.ttft_s <= metrics.duration_s
+    assert metrics.tokens == tokens
+    assert len(metrics.inter_token_s) == tokens - 1
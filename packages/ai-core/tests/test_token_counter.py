@@ -0,0 +1,134 @@
+import threading
+from collections.abc import Sequence
+from pathlib import Path
+
+import pytest
+
+from ai_core.orchestration.services import TokenCounter
+from ai_core.orchestration.services.llm_service import ChatMessage
+from ai_core.orchestration.services.token_counter import MESSAGE_OVERHEAD_TOKENS
+
+
+class WordTokenizer:
+    """Fake tokenizer with one token per word, recording what it was asked."""
+
+    def __init__(self) -> None:
+        self.batches: list[list[str]] = []
+
+    def count(self, texts: Sequence[str]) -> list[int]:
+        self.batches.append(list(texts))
+        return [len(text.split()) for text in texts]
+
+
+class RecordingLoader:
+    def __init__(self) -> None:
+        self.paths: list[Path] = []
+        self.threads: set[int] = set()
+        self.tokenizer = WordTokenizer()
+
+    def __call__(self, path: Path) -> WordTokenizer:
+        self.paths.append(path)
+        self.threads.add(threading.get_ident())
+        if not path.parent.name.startswith("llama"):
+            raise FileNotFoundError(path)
+        return self.tokenizer
+
+
+def make_counter(loader: RecordingLoader, **kwargs) -> TokenCounter:
+    return TokenCounter(
+        tokenizer_dir="/tokenizers",
+        families={"llama-3": "llama3", "llama-3.1": "llama3.1", "qwen": "qwen2"},
+        loader=loader,
+        **kwargs,
+    )
+
+
+def user(content: str) -> ChatMessage:
+    return ChatMessage(role="user", content=content)
+
+
+def test_tokenizer_loads_once_per_family_by_longest_prefix():
+    loader = RecordingLoader()
+    counter = make_counter(loader)
+
+    assert counter.family("llama-3.1-8b-instruct") == "llama3.1"
+    assert counter.family("llama-3-70b") == "llama3"
+    assert counter.count_text("one two three", "llama-3.1-8b-instruct") == 3
+    assert counter.count_text("one two", "llama-3.1-70b") == 2
+
+    assert loader.paths == [Path("/tokenizers/llama3.1/tokenizer.json")]
+
+
+def test_history_is_counted_incrementally():
+    loader = RecordingLoader()
+    counter = make_counter(loader)
+    history = [user("a b"), user("c d e")]
+
+    counts = counter.count_messages(history, "llama-3-8b")
+    history.append(user("f"))
+    counts = counter.count_messages(history, "llama-3-8b")
+
+    assert counts == [n + MESSAGE_OVERHEAD_TOKENS for n in (2, 3, 1)]
+    assert loader.tokenizer.batches == [["a b", "c d e"], ["f"]]
+    assert (counter.hits, counter.misses) == (2, 3)
+
+
+def test_unknown_models_and_failed_loads_fall_back_to_estimate():
+    loader = RecordingLoader()
+    counter = make_counter(loader, chars_per_token=2.0)
+    message = user("x" * 10)
+
+    assert counter.count_message(message, "gpt-4o") == 5 + MESSAGE_OVERHEAD_TOKENS
+    assert counter.count_message(message, "qwen-7b") == 5 + MESSAGE_OVERHEAD_TOKENS
+    assert counter.count_message(message, "qwen-14b") == 5 + MESSAGE_OVERHEAD_TOKENS
+
+    # The failed qwen load is not retried
+    assert loader.paths == [Path("/tokenizers/qwen2/tokenizer.json")]
+
+
+def test_count_cache_is_bounded():
+    loader = RecordingLoader()
+    counter = make_counter(loader, cache_size=2)
+
+    counter.count_messages([user("a"), user("b"), user("c")], "llama-3")
+    counter.count_messages([user("a")], "llama-3")
+
+    assert loader.tokenizer.batches[-1] == ["a"]
+
+
+@pytest.mark.asyncio
+async def test_preload_loads_configured_families_off_the_loop():
+    loader = RecordingLoader()
+    counter = make_counter(loader)
+
+    await counter.preload()
+    counter.count_messages([user("a")], "llama-3.1-8b")
+
+    # Each family is loaded once, and not again when first used
+    assert sorted(loader.paths) == [
+        Path("/tokenizers/llama3/tokenizer.json"),
+        Path("/tokenizers/llama3.1/tokenizer.json"),
+        Path("/tokenizers/qwen2/tokenizer.json"),
+    ]
+    assert threading.get_ident() not in loader.threads
+
+
+@pytest.mark.asyncio
+async def test_async_count_batches_history_and_shares_the_cache():
+    loader = RecordingLoader()
+    counter = make_counter(loader, thread_min_chars=5)
+    history = [user("a b"), user("c d e")]
+
+    counts = await counter.count_messages_async(history, "llama-3-8b")
+    history.append(user("f"))
+    assert counter.count_messages(history, "llama-3-8b") == counts + [
+        1 + MESSAGE_OVERHEAD_TOKENS
+    ]
+
+    assert counts == [n + MESSAGE_OVERHEAD_TOKENS for n in (2, 3)]
+    assert loader.tokenizer.batches == [["a b", "c d e"], ["f"]]
+    assert threading.get_ident() not in loader.threads
+    # Unknown models are still estimated
+    assert await counter.count_messages_async([user("x" * 8)], "gpt-4o") == [
+        2 + MESSAGE_OVERHEAD_TOKENS
+    ]
@@ -0,0 +1,43 @@
+from ai_core.orchestration.streaming import StreamDone, StreamUsage, TokenDelta, Usage
+from ai_core.orchestration.turn_metrics import TurnMetrics
+
+
+def test_timings_are_measured_from_receipt():
+    metrics = TurnMetrics(started_at=10.0, plan_s=0.5)
+
+    metrics.begin(10.75)
+    metrics.observe(TokenDelta(text="a"), 11.0)
+    metrics.observe(TokenDelta(text="b"), 11.25)
+    metrics.observe(TokenDelta(text="c"), 12.0)
+    metrics.observe(StreamDone(), 13.0)
+    metrics.finish(14.0)
+
+    assert metrics.queue_s == 0.25
+    assert metrics.ttft_s == 1.0
+    assert metrics.inter_token_s == [0.25, 0.75]
+    assert metrics.duration_s == 3.0
+    assert metrics.tokens == 3
+    # No usage reported, so the rate falls back to deltas
+    assert metrics.tokens_per_s == 1.5
+
+
+def test_usage_is_summed_and_preferred_for_rate():
+    metrics = TurnMetrics(started_at=0.0)
+
+    metrics.observe(TokenDelta(text="a"), 1.0)
+    metrics.observe(StreamUsage(usage=Usage(10, 4, 14)), 1.5)
+    metrics.observe(StreamUsage(usage=Usage(20, None, None)), 1.5)
+    metrics.observe(StreamUsage(usage=Usage(5, 4, 9)), 1.5)
+    metrics.finish(3.0)
+
+    assert metrics.usage == Usage(35, 8, 23)
+    assert metrics.tokens_per_s == 4.0
+
+
+def test_inter_token_percentiles_use_nearest_rank():
+    metrics = TurnMetrics(inter_token_s=[0.4, 0.1, 0.3, 0.2])
+
+    assert metrics.inter_token_percentile(0.5) == 0.2
+    assert metrics.inter_token_percentile(0.99) == 0.4
+    assert TurnMetrics().inter_token_percentile(0.5) is None
+    assert TurnMetrics().tokens_per_s is None
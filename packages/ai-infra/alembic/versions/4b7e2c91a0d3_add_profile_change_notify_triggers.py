@@ -0,0 +1,59 @@
+"""add profile change notify triggers
+
+Revision ID: 4b7e2c91a0d3
+Revises: d00f8a9cff48
+Create Date: 2026-10-18 10:32:14.512093
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "4b7e2c91a0d3"
+down_revision: Union[str, Sequence[str], None] = "d00f8a9cff48"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PROFILE_TABLES = ("graph_profile", "model_profile")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION notify_profile_change() RETURNS trigger AS $$
+        DECLARE
+            row_id uuid;
+        BEGIN
+            IF TG_OP = 'DELETE' THEN
+                row_id := OLD.id;
+            ELSE
+                row_id := NEW.id;
+            END IF;
+            PERFORM pg_notify(
+                'profile_change',
+                json_build_object('table', TG_TABLE_NAME, 'op', TG_OP, 'id', row_id)::text
+            );
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+    )
+    for table in PROFILE_TABLES:
+        op.execute(
+            f"""
+            CREATE TRIGGER {table}_notify_change
+            AFTER INSERT OR UPDATE OR DELETE ON {table}
+            FOR EACH ROW EXECUTE FUNCTION notify_profile_change();
+            """
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in PROFILE_TABLES:
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_notify_change ON {table};")
+    op.execute("DROP FUNCTION IF EXISTS notify_profile_change();")
@@ -0,0 +1,56 @@
+"""add llm response cache
+
+Revision ID: 8c3f5a1d2e47
+Revises: 4b7e2c91a0d3
+Create Date: 2026-10-18 14:05:41.283914
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "8c3f5a1d2e47"
+down_revision: Union[str, Sequence[str], None] = "4b7e2c91a0d3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "model_profile",
+        sa.Column(
+            "response_cache_enabled",
+            sa.Boolean(),
+            server_default=sa.false(),
+            nullable=False,
+        ),
+    )
+    op.create_table(
+        "llm_response_cache",
+        sa.Column("key", sa.String(length=64), nullable=False),
+        sa.Column("value", postgresql.JSONB(), nullable=False),
+        sa.Column("size_bytes", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("expires_at", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("key"),
+    )
+    op.create_index(
+        op.f("ix_llm_response_cache_expires_at"),
+        "llm_response_cache",
+        ["expires_at"],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        op.f("ix_llm_response_cache_expires_at"), table_name="llm_response_cache"
+    )
+    op.drop_table("llm_response_cache")
+    op.drop_column("model_profile", "response_cache_enabled")
@@ -0,0 +1,15 @@
+"""In-memory caches for infrastructure adapters."""
+
+from ai_infra.cache.repositories import (
+    CachingGraphProfileRepository,
+    CachingModelProfileRepository,
+)
+from ai_infra.cache.stats import register_cache
+from ai_infra.cache.ttl_cache import TtlLruCache
+
+__all__ = [
+    "CachingGraphProfileRepository",
+    "CachingModelProfileRepository",
+    "TtlLruCache",
+    "register_cache",
+]
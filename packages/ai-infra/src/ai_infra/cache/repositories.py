@@ -0,0 +1,168 @@
+"""Caching decorators for the profile repositories."""
+
+from __future__ import annotations
+
+import logging
+from collections.abc import Iterable
+from typing import Optional
+from uuid import UUID
+
+from ai_core.models import GraphProfile, ModelProfile
+from ai_core.repositories import (
+    AsyncGraphProfileRepository,
+    AsyncModelProfileRepository,
+)
+from .ttl_cache import TtlLruCache
+
+log = logging.getLogger("cache.repositories")
+
+
+class CachingGraphProfileRepository(AsyncGraphProfileRepository):
+    """
+    AsyncGraphProfileRepository that serves lookups from an in-memory cache.
+
+    Unknown IDs are cached as negative entries (with a shorter TTL) so that
+    repeated requests for a missing profile do not reach the database.
+    """
+
+    def __init__(
+        self,
+        inner: AsyncGraphProfileRepository,
+        cache: TtlLruCache[UUID, GraphProfile | None],
+        negative_ttl_s: float,
+    ) -> None:
+        """
+        Initialize the caching repository.
+
+        Args:
+            inner: Repository used on cache misses.
+            cache: Cache holding profiles (or None for unknown IDs).
+            negative_ttl_s: Time-to-live for negative entries, in seconds.
+        """
+        self._inner = inner
+        self._cache = cache
+        self._negative_ttl_s = negative_ttl_s
+
+    async def get_by_id(self, id: UUID) -> Optional[GraphProfile]:
+        found, profile = self._cache.get(id)
+        if found:
+            return profile
+
+        generation = self._cache.generation
+        profile = await self._inner.get_by_id(id)
+        # An invalidation during the fetch means the row may already be stale
+        if self._cache.generation != generation:
+            return profile
+        if profile is None:
+            self._cache.set(id, None, ttl_s=self._negative_ttl_s)
+        else:
+            self._cache.set(id, profile)
+        return profile
+
+    async def get_all(self) -> list[GraphProfile]:
+        """Retrieve all graph profiles and prime the cache with them."""
+        generation = self._cache.generation
+        profiles = await self._inner.get_all()
+        if self._cache.generation == generation:
+            for profile in profiles:
+                self._cache.set(profile.id, profile)
+        return profiles
+
+    def invalidate(self, id: UUID) -> None:
+        """Drop a cached graph profile."""
+        log.debug("graph_profile_cache.invalidate", extra={"graph_profile_id": id})
+        self._cache.invalidate(id)
+
+    def invalidate_all(self) -> None:
+        """Drop every cached graph profile."""
+        log.debug("graph_profile_cache.invalidate_all")
+        self._cache.clear()
+
+
+class CachingModelProfileRepository(AsyncModelProfileRepository):
+    """
+    AsyncModelProfileRepository that serves lookups from an in-memory cache.
+
+    Unknown IDs are cached as negative entries (with a shorter TTL) so that
+    repeated requests for a missing profile do not reach the database.
+    """
+
+    def __init__(
+        self,
+        inner: AsyncModelProfileRepository,
+        cache: TtlLruCache[UUID, ModelProfile | None],
+        negative_ttl_s: float,
+    ) -> None:
+        """
+        Initialize the caching repository.
+
+        Args:
+            inner: Repository used on cache misses.
+            cache: Cache holding profiles (or None for unknown IDs).
+            negative_ttl_s: Time-to-live for negative entries, in seconds.
+        """
+        self._inner = inner
+        self._cache = cache
+        self._negative_ttl_s = negative_ttl_s
+
+    async def get_by_id(self, id: UUID) -> Optional[ModelProfile]:
+        found, profile = self._cache.get(id)
+        if found:
+            return profile
+
+        generation = self._cache.generation
+        profile = await self._inner.get_by_id(id)
+        # An invalidation during the fetch means the row may already be stale
+        if self._cache.generation != generation:
+            return profile
+        if profile is None:
+            self._cache.set(id, None, ttl_s=self._negative_ttl_s)
+        else:
+            self._cache.set(id, profile)
+        return profile
+
+    async def get_by_ids(self, ids: Iterable[UUID]) -> dict[UUID, ModelProfile]:
+        """Serve cached profiles and fetch all misses with a single batched lookup."""
+        profiles: dict[UUID, ModelProfile] = {}
+        misses: list[UUID] = []
+        for id in ids:
+            found, profile = self._cache.get(id)
+            if not found:
+                misses.append(id)
+            elif profile is not None:
+                profiles[id] = profile
+
+        if misses:
+            generation = self._cache.generation
+            fetched = await self._inner.get_by_ids(misses)
+            cacheable = self._cache.generation == generation
+            for id in misses:
+                profile = fetched.get(id)
+                if profile is not None:
+                    profiles[id] = profile
+                if not cacheable:
+                    continue
+                if profile is None:
+                    self._cache.set(id, None, ttl_s=self._negative_ttl_s)
+                else:
+                    self._cache.set(id, profile)
+        return profiles
+
+    async def get_all(self) -> list[ModelProfile]:
+        """Retrieve all model profiles and prime the cache with them."""
+        generation = self._cache.generation
+        profiles = await self._inner.get_all()
+        if self._cache.generation == generation:
+            for profile in profiles:
+                self._cache.set(profile.id, profile)
+        return profiles
+
+    def invalidate(self, id: UUID) -> None:
+        """Drop a cached model profile."""
+        log.debug("model_profile_cache.invalidate", extra={"model_profile_id": id})
+        self._cache.invalidate(id)
+
+    def invalidate_all(self) -> None:
+        """Drop every cached model profile."""
+        log.debug("model_profile_cache.invalidate_all")
+        self._cache.clear()
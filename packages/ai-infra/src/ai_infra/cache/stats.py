@@ -0,0 +1,51 @@
+"""Hit/miss metrics for in-memory caches, observed at collection time."""
+
+from __future__ import annotations
+
+import weakref
+from collections.abc import Iterable
+from typing import Protocol
+
+from opentelemetry import metrics
+from opentelemetry.metrics import CallbackOptions, Observation
+
+meter = metrics.get_meter("cache.stats")
+
+
+class CacheStats(Protocol):
+    """Protocol for caches that keep running hit and miss counts."""
+
+    hits: int
+    misses: int
+
+
+# Registered caches by name; dropped once their owner goes away
+_caches: weakref.WeakValueDictionary[str, CacheStats] = weakref.WeakValueDictionary()
+
+
+def register_cache(name: str, cache: CacheStats) -> None:
+    """
+    Export a cache's hit and miss counts as ``cache.lookups``.
+
+    The counts are read when metrics are collected, so lookups pay nothing
+    beyond the counters the cache already keeps.
+
+    Args:
+        name: Value of the metric's ``cache`` attribute.
+        cache: The cache to observe.
+    """
+    _caches[name] = cache
+
+
+def _observe_lookups(options: CallbackOptions) -> Iterable[Observation]:
+    for name, cache in list(_caches.items()):
+        yield Observation(cache.hits, {"cache": name, "result": "hit"})
+        yield Observation(cache.misses, {"cache": name, "result": "miss"})
+
+
+meter.create_observable_counter(
+    "cache.lookups",
+    callbacks=[_observe_lookups],
+    unit="{lookup}",
+    description="In-memory cache lookups by cache and result (hit/miss)",
+)
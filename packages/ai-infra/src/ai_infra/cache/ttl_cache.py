@@ -0,0 +1,104 @@
+"""Bounded in-memory cache with LRU eviction and per-entry TTL."""
+
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from typing import Generic, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class TtlLruCache(Generic[K, V]):
+    """
+    Size-bounded LRU cache whose entries expire after a time-to-live.
+
+    The cache is not thread-safe; it is intended to be used from a single
+    event loop thread, where every operation completes without yielding.
+
+    ``generation`` is bumped by every invalidation. A caller that awaits
+    between a miss and the matching set() should compare it before and
+    after, and skip the set if it changed, since the value it fetched may
+    predate the invalidation.
+    """
+
+    def __init__(
+        self,
+        max_size: int,
+        ttl_s: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Initialize the cache.
+
+        Args:
+            max_size: Maximum number of entries kept before evicting the least recently used.
+            ttl_s: Default time-to-live for entries, in seconds.
+            clock: Monotonic clock used to compute expiry (overridable for tests).
+        """
+        if max_size <= 0:
+            raise ValueError("max_size must be positive")
+
+        self._max_size = max_size
+        self._ttl_s = ttl_s
+        self._clock = clock
+        self._entries: OrderedDict[K, tuple[V, float]] = OrderedDict()
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: K) -> tuple[bool, V | None]:
+        """
+        Look up a key.
+
+        Args:
+            key: The key to look up.
+
+        Returns:
+            A ``(found, value)`` tuple. ``found`` is False when the key is absent
+            or its entry has expired.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return False, None
+
+        value, expires_at = entry
+        if expires_at <= self._clock():
+            del self._entries[key]
+            self.misses += 1
+            return False, None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return True, value
+
+    def set(self, key: K, value: V, ttl_s: float | None = None) -> None:
+        """
+        Insert or replace an entry.
+
+        Args:
+            key: The key to store.
+            value: The value to store.
+            ttl_s: Optional time-to-live overriding the cache default.
+        """
+        ttl = self._ttl_s if ttl_s is None else ttl_s
+        self._entries[key] = (value, self._clock() + ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_size:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, key: K) -> None:
+        """Remove a single entry if present."""
+        self._entries.pop(key, None)
+        self.generation += 1
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        self._entries.clear()
+        self.generation += 1
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -1,8 +1,16 @@
 """LLM client and types for OpenAI-compatible endpoints."""
 
+from ai_infra.llms.balancer import BalancingLLMClient
 from ai_infra.llms.client import OpenAiLLMClient, OpenAiLLMClientConfig
+from ai_infra.llms.resilience import ResilientLLMClient
+from ai_infra.llms.response_cache import CachingLLMClient
+from ai_infra.llms.single_flight import SingleFlightLLMClient
 
 __all__ = [
+    "BalancingLLMClient",
+    "CachingLLMClient",
     "OpenAiLLMClient",
     "OpenAiLLMClientConfig",
+    "ResilientLLMClient",
+    "SingleFlightLLMClient",
 ]
@@ -0,0 +1,494 @@
+"""Load-balancing LLM client over multiple OpenAI-compatible replicas."""
+
+from __future__ import annotations
+
+import asyncio
+import bisect
+import hashlib
+import logging
+import random
+import time
+import weakref
+from collections import deque
+from collections.abc import (
+    AsyncGenerator,
+    AsyncIterator,
+    Callable,
+    Collection,
+    Iterable,
+    Mapping,
+)
+from dataclasses import dataclass
+from typing import Literal
+
+import httpx
+from opentelemetry import metrics
+from opentelemetry.metrics import CallbackOptions, Observation
+
+from ai_core.exceptions import UpstreamOverloadedError, UpstreamUnavailableError
+from ai_core.orchestration.services.llm_service import (
+    ChatRequest,
+    ChatResponse,
+    ChatStreamEvent,
+    LLMClient,
+    TokenDelta,
+)
+from ai_core.orchestration.streaming import closing_stream
+
+log = logging.getLogger("llms.balancer")
+meter = metrics.get_meter("llms.balancer")
+
+BalancingStrategy = Literal["least_outstanding", "ewma_ttft"]
+
+# Raised by an endpoint's own concurrency limiter or circuit breaker before
+# anything is sent upstream, so the request can go to another endpoint instead
+_REJECTIONS = (UpstreamOverloadedError, UpstreamUnavailableError)
+
+# Live balancers, observed by the outstanding requests gauge
+_balancers: weakref.WeakSet[BalancingLLMClient] = weakref.WeakSet()
+
+
+def _observe_outstanding(options: CallbackOptions) -> Iterable[Observation]:
+    for balancer in list(_balancers):
+        for endpoint in balancer.endpoints:
+            yield Observation(endpoint.outstanding, {"server.address": endpoint.name})
+
+
+_ejections = meter.create_counter(
+    "llm_balancer.ejections",
+    unit="{ejection}",
+    description="Upstream endpoints ejected after consecutive failures",
+)
+_streams = meter.create_counter(
+    "llm_balancer.streams",
+    unit="{request}",
+    description="Streaming requests handled by the balancer",
+)
+_hedges_fired = meter.create_counter(
+    "llm_balancer.hedge.fired",
+    unit="{request}",
+    description="Duplicate requests sent because the first token was late",
+)
+_hedges_won = meter.create_counter(
+    "llm_balancer.hedge.won",
+    unit="{request}",
+    description="Hedged requests whose duplicate produced the first token",
+)
+_hedge_wasted_tokens = meter.create_counter(
+    "llm_balancer.hedge.wasted_tokens",
+    unit="{token}",
+    description="Token deltas received from cancelled hedge losers",
+)
+meter.create_observable_gauge(
+    "llm_balancer.outstanding_requests",
+    callbacks=[_observe_outstanding],
+    unit="{request}",
+    description="In-flight requests per upstream endpoint",
+)
+
+
+@dataclass(eq=False)
+class Endpoint:
+    """An upstream replica with its load and health state."""
+
+    name: str
+    client: LLMClient
+    outstanding: int = 0
+    ttft_ewma_s: float | None = None
+    consecutive_failures: int = 0
+    ejected_until: float = 0.0
+
+
+def is_endpoint_failure(error: BaseException) -> bool:
+    """
+    Whether an error says something about the health of the endpoint.
+
+    Transport errors, timeouts and 5xx responses count; client errors (4xx)
+    are the caller's fault and do not.
+    """
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code >= 500
+    return isinstance(error, (httpx.TransportError, asyncio.TimeoutError))
+
+
+class HashRing:
+    """Consistent hash ring mapping keys to endpoint indices."""
+
+    def __init__(self, names: Iterable[str], virtual_nodes: int = 100) -> None:
+        """
+        Initialize the ring.
+
+        Args:
+            names: Endpoint names, in endpoint index order.
+            virtual_nodes: Points placed on the ring per endpoint.
+        """
+        points = sorted(
+            (self._hash(f"{name}#{i}"), index)
+            for index, name in enumerate(names)
+            for i in range(virtual_nodes)
+        )
+        self._hashes = [point for point, _ in points]
+        self._indices = [index for _, index in points]
+
+    @staticmethod
+    def _hash(key: str) -> int:
+        return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest())
+
+    def walk(self, key: str) -> Iterable[int]:
+        """
+        Yield endpoint indices in ring order starting at the key's position.
+
+        Each index is yielded once, so callers can skip unhealthy endpoints
+        and fall through to the next replica on the ring.
+        """
+        start = bisect.bisect(self._hashes, self._hash(key))
+        seen: set[int] = set()
+        for i in range(len(self._indices)):
+            index = self._indices[(start + i) % len(self._indices)]
+            if index not in seen:
+                seen.add(index)
+                yield index
+
+
+class BalancingLLMClient(LLMClient):
+    """
+    LLMClient that spreads requests across several upstream replicas.
+
+    Endpoints are chosen by least outstanding requests or by an EWMA of
+    time-to-first-token weighted by load. With session affinity, requests
+    carrying an affinity key are routed by consistent hashing so a session
+    sticks to one replica and can reuse its prefix cache. Endpoints that fail
+    repeatedly are ejected for a while; if every endpoint is ejected, all of
+    them are tried again rather than failing outright. A request turned away
+    by an endpoint's own limiter or circuit breaker moves on to the next best
+    endpoint without counting against its health.
+
+    With hedging enabled, a stream that has not produced a token within the
+    hedge delay is duplicated on another endpoint. The first stream to yield a
+    token wins and the other is cancelled straight away, closing its upstream
+    connection so the replica stops generating.
+    """
+
+    def __init__(
+        self,
+        endpoints: Mapping[str, LLMClient],
+        strategy: BalancingStrategy = "least_outstanding",
+        session_affinity: bool = False,
+        ewma_alpha: float = 0.3,
+        eject_after_failures: int = 3,
+        ejection_s: float = 30.0,
+        hedge_delay_s: float | None = None,
+        hedge_percentile: float | None = None,
+        hedge_min_samples: int = 20,
+        hedge_window: int = 500,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Initialize the balancing client.
+
+        Args:
+            endpoints: Upstream clients keyed by endpoint name (e.g. base URL).
+            strategy: Endpoint selection strategy.
+            session_affinity: Route requests with an affinity key by consistent hashing.
+            ewma_alpha: Weight of the newest sample in the TTFT moving average.
+            eject_after_failures: Consecutive failures before an endpoint is ejected.
+            ejection_s: How long an ejected endpoint is kept out of rotation.
+            hedge_delay_s: Fixed time to wait for a first token before hedging.
+            hedge_percentile: Hedge after this percentile (0-1) of recent TTFTs
+                instead; hedge_delay_s applies until enough samples exist.
+            hedge_min_samples: TTFT samples needed before using the percentile.
+            hedge_window: Number of recent TTFT samples kept.
+            clock: Monotonic clock, injectable for tests.
+        """
+        if not endpoints:
+            raise ValueError("BalancingLLMClient needs at least one endpoint")
+
+        self._endpoints = [
+            Endpoint(name=name, client=client) for name, client in endpoints.items()
+        ]
+        self._strategy = strategy
+        self._ring = HashRing(endpoint.name for endpoint in self._endpoints)
+        self._session_affinity = session_affinity
+        self._ewma_alpha = ewma_alpha
+        self._eject_after_failures = eject_after_failures
+        self._ejection_s = ejection_s
+        self._hedge_delay_s = hedge_delay_s
+        self._hedge_percentile = hedge_percentile
+        self._hedge_min_samples = hedge_min_samples
+        self._ttft_samples: deque[float] = deque(maxlen=hedge_window)
+        self._clock = clock
+        _balancers.add(self)
+
+    @property
+    def endpoints(self) -> list[Endpoint]:
+        """The upstream endpoints and their current state."""
+        return self._endpoints
+
+    async def chat(self, request: ChatRequest) -> ChatResponse:
+        """
+        Send a non-streaming chat request to the selected endpoint.
+
+        Args:
+            request: Chat request parameters.
+
+        Returns:
+            Chat response with text and metadata.
+        """
+        rejected: list[Endpoint] = []
+        while True:
+            endpoint = self.select(request, exclude=rejected)
+            endpoint.outstanding += 1
+            try:
+                response = await endpoint.client.chat(request)
+            except _REJECTIONS:
+                rejected.append(endpoint)
+                if len(rejected) == len(self._endpoints):
+                    raise
+                continue
+            except Exception as e:
+                self._record_failure(endpoint, e)
+                raise
+            finally:
+                endpoint.outstanding -= 1
+
+            endpoint.consecutive_failures = 0
+            return response
+
+    async def stream_chat(self, request: ChatRequest) -> AsyncIterator[ChatStreamEvent]:
+        """
+        Send a streaming chat request to the selected endpoint, hedging if enabled.
+
+        Args:
+            request: Chat request parameters (stream will be forced to True).
+
+        Yields:
+            ChatStreamEvent objects (TokenDelta, StreamUsage, StreamDone).
+        """
+        _streams.add(1)
+        delay = self.hedge_delay()
+        if delay is None or len(self._endpoints) < 2:
+            stream = self._stream_selected(request)
+            async with closing_stream(stream):
+                async for event in stream:
+                    yield event
+            return
+
+        hedged = self._stream_hedged(request, delay)
+        async with closing_stream(hedged):
+            async for event in hedged:
+                yield event
+
+    def hedge_delay(self) -> float | None:
+        """
+        Time to wait for a first token before hedging a stream.
+
+        Returns:
+            The delay in seconds, or None when hedging is disabled.
+        """
+        samples = self._ttft_samples
+        if (
+            self._hedge_percentile is not None
+            and len(samples) >= self._hedge_min_samples
+        ):
+            ordered = sorted(samples)
+            index = min(int(self._hedge_percentile * len(ordered)), len(ordered) - 1)
+            return ordered[index]
+        return self._hedge_delay_s
+
+    def select(
+        self, request: ChatRequest, exclude: Collection[Endpoint] = ()
+    ) -> Endpoint:
+        """
+        Choose the endpoint for a request.
+
+        Args:
+            request: Chat request; its affinity key is used with session affinity.
+            exclude: Endpoints to leave out, e.g. the one a hedged request is
+                already on. At least one endpoint must remain.
+
+        Returns:
+            The selected endpoint.
+        """
+        candidates = [e for e in self._endpoints if e not in exclude]
+        now = self._clock()
+        healthy = [e for e in candidates if e.ejected_until <= now]
+        if not healthy:
+            # Everything is ejected: better to try than to fail every request
+            healthy = candidates
+
+        if self._session_affinity and request.affinity_key is not None:
+            for index in self._ring.walk(request.affinity_key):
+                endpoint = self._endpoints[index]
+                if endpoint in healthy:
+                    return endpoint
+
+        if self._strategy == "ewma_ttft":
+            # Endpoints without samples score zero, so they get probed first
+            scores = [(e.ttft_ewma_s or 0.0) * (e.outstanding + 1) for e in healthy]
+        else:
+            scores = [float(e.outstanding) for e in healthy]
+
+        best = min(scores)
+        return random.choice([e for e, score in zip(healthy, scores) if score == best])
+
+    async def warm_up(self) -> None:
+        """Open connections to every upstream endpoint."""
+        await asyncio.gather(*(e.client.warm_up() for e in self._endpoints))
+
+    async def aclose(self) -> None:
+        """Close every upstream client."""
+        _balancers.discard(self)
+        await asyncio.gather(*(e.client.aclose() for e in self._endpoints))
+
+    async def _stream_selected(
+        self, request: ChatRequest
+    ) -> AsyncGenerator[ChatStreamEvent]:
+        """Stream from the selected endpoint, moving on when one turns it away."""
+        rejected: list[Endpoint] = []
+        while True:
+            endpoint = self.select(request, exclude=rejected)
+            stream = self._stream_endpoint(endpoint, request)
+            started = False
+            try:
+                async with closing_stream(stream):
+                    async for event in stream:
+                        started = True
+                        yield event
+                return
+            except _REJECTIONS:
+                rejected.append(endpoint)
+                if started or len(rejected) == len(self._endpoints):
+                    raise
+
+    async def _stream_endpoint(
+        self, endpoint: Endpoint, request: ChatRequest
+    ) -> AsyncGenerator[ChatStreamEvent]:
+        """Stream from one endpoint, tracking its load, TTFT and failures."""
+        endpoint.outstanding += 1
+        start = self._clock()
+        first_token = True
+        try:
+            stream = endpoint.client.stream_chat(request)
+            async with closing_stream(stream):
+                async for event in stream:
+                    if first_token and isinstance(event, TokenDelta):
+                        first_token = False
+                        self._record_ttft(endpoint, self._clock() - start)
+                    yield event
+        except Exception as e:
+            self._record_failure(endpoint, e)
+            raise
+        finally:
+            endpoint.outstanding -= 1
+
+        endpoint.consecutive_failures = 0
+
+    async def _stream_hedged(
+        self, request: ChatRequest, delay: float
+    ) -> AsyncIterator[ChatStreamEvent]:
+        """Stream with a duplicate request fired if the first token is late."""
+        primary = self.select(request)
+        attempts: dict[asyncio.Task[list[ChatStreamEvent]], AsyncGenerator] = {}
+
+        def start(endpoint: Endpoint) -> None:
+            stream = self._stream_endpoint(endpoint, request)
+            attempts[asyncio.create_task(_read_first_token(stream))] = stream
+
+        start(primary)
+        winner: asyncio.Task[list[ChatStreamEvent]] | None = None
+        hedged = False
+        try:
+            done, pending = await asyncio.wait(attempts, timeout=delay)
+            if not done:
+                start(self.select(request, exclude=[primary]))
+                _hedges_fired.add(1)
+                hedged = True
+                pending = set(attempts)
+            elif isinstance(next(iter(done)).exception(), _REJECTIONS):
+                # The primary turned the request away; use the other endpoint now
+                start(self.select(request, exclude=[primary]))
+                pending = set(attempts) - done
+
+            errors: list[BaseException] = []
+            while True:
+                for task in done:
+                    error = task.exception()
+                    if error is not None:
+                        errors.append(error)
+                    elif winner is None:
+                        winner = task
+                if winner is not None or not pending:
+                    break
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+
+            if winner is None:
+                raise errors[0]
+
+            if hedged and winner is not next(iter(attempts)):
+                _hedges_won.add(1)
+
+            # Cancel the losers before yielding anything
+            await _cancel_losers(attempts, winner)
+            for event in winner.result():
+                yield event
+            async for event in attempts[winner]:
+                yield event
+        finally:
+            await _cancel_losers(attempts, winner)
+            if winner is not None:
+                await attempts[winner].aclose()
+
+    def _record_ttft(self, endpoint: Endpoint, ttft_s: float) -> None:
+        self._ttft_samples.append(ttft_s)
+        if endpoint.ttft_ewma_s is None:
+            endpoint.ttft_ewma_s = ttft_s
+        else:
+            endpoint.ttft_ewma_s += self._ewma_alpha * (ttft_s - endpoint.ttft_ewma_s)
+
+    def _record_failure(self, endpoint: Endpoint, error: Exception) -> None:
+        if not is_endpoint_failure(error):
+            return
+
+        endpoint.consecutive_failures += 1
+        if endpoint.consecutive_failures >= self._eject_after_failures:
+            endpoint.consecutive_failures = 0
+            endpoint.ejected_until = self._clock() + self._ejection_s
+            _ejections.add(1, {"server.address": endpoint.name})
+            log.warning(
+                "balancer.endpoint_ejected",
+                extra={
+                    "endpoint": endpoint.name,
+                    "ejection_s": self._ejection_s,
+                    "error": str(error),
+                },
+            )
+
+
+async def _read_first_token(
+    stream: AsyncIterator[ChatStreamEvent],
+) -> list[ChatStreamEvent]:
+    """Read a stream up to and including its first token, returning the events."""
+    events: list[ChatStreamEvent] = []
+    async for event in stream:
+        events.append(event)
+        if isinstance(event, TokenDelta):
+            break
+    return events
+
+
+async def _cancel_losers(
+    attempts: dict[asyncio.Task[list[ChatStreamEvent]], AsyncGenerator],
+    winner: asyncio.Task[list[ChatStreamEvent]] | None,
+) -> None:
+    """Cancel and remove every hedge attempt but the winner, closing its stream."""
+    for task in [task for task in attempts if task is not winner]:
+        stream = attempts.pop(task)
+        task.cancel()
+        await asyncio.wait([task])
+        if not task.cancelled() and task.exception() is None:
+            wasted = sum(1 for event in task.result() if isinstance(event, TokenDelta))
+            if wasted:
+                _hedge_wasted_tokens.add(wasted)
+        await stream.aclose()
@@ -2,24 +2,123 @@
 
 from __future__ import annotations
 
-import json
+import asyncio
+import logging
+import time
+import weakref
 from dataclasses import dataclass, field
-from collections.abc import AsyncIterator
+from collections.abc import AsyncIterator, Iterable
 from typing import Any
 
 import httpx
+from opentelemetry import metrics
+from opentelemetry.metrics import CallbackOptions, Observation
 
+from ai_core.exceptions import DeadlineExceededError
 from ai_core.orchestration.services.llm_service import (
     LLMClient,
     ChatRequest,
     ChatResponse,
     ChatStreamEvent,
-    StreamDone,
-    StreamUsage,
-    TokenDelta,
     ChatMessage,
     Usage,
 )
+from ai_infra.llms.sse import aiter_stream_events
+
+log = logging.getLogger("llms.client")
+meter = metrics.get_meter("llms.client")
+
+# httpcore trace events marking the moment a request got a pooled connection
+_POOL_ACQUIRED_EVENTS = frozenset(
+    {
+        "connection.connect_tcp.started",
+        "http11.send_request_headers.started",
+        "http2.send_request_headers.started",
+    }
+)
+
+# Live clients, observed by the pool occupancy gauge
+_clients: weakref.WeakSet[OpenAiLLMClient] = weakref.WeakSet()
+
+
+def _observe_pool_requests(options: CallbackOptions) -> Iterable[Observation]:
+    for client in list(_clients):
+        yield from client._observe_pool_requests()
+
+
+_active_requests = meter.create_up_down_counter(
+    "llm_client.requests.active",
+    unit="{request}",
+    description="Upstream requests currently holding or waiting for a pooled connection",
+)
+_pool_wait = meter.create_histogram(
+    "llm_client.pool.wait_time",
+    unit="s",
+    description="Time spent waiting for a pooled upstream connection",
+)
+_responses = meter.create_counter(
+    "llm_client.responses",
+    unit="{response}",
+    description="Upstream responses by HTTP status code",
+)
+_cancelled_streams = meter.create_counter(
+    "llm_client.streams.cancelled",
+    unit="{stream}",
+    description="Upstream streams abandoned before completion, by reason (cancelled/deadline)",
+)
+_cancel_close_time = meter.create_histogram(
+    "llm_client.streams.cancel_close_time",
+    unit="s",
+    description="Time from a stream being abandoned to its upstream response being closed",
+)
+meter.create_observable_gauge(
+    "llm_client.pool.requests",
+    callbacks=[_observe_pool_requests],
+    unit="{request}",
+    description="Upstream requests in flight by pool state (waiting/connected)",
+)
+
+
+def messages_to_json(messages: list[ChatMessage]) -> list[dict[str, Any]]:
+    """Convert ChatMessage list to provider JSON format."""
+    result = []
+    for msg in messages:
+        json_msg: dict[str, Any] = {
+            "role": msg.role,
+            "content": msg.content,
+        }
+        if msg.name is not None:
+            json_msg["name"] = msg.name
+        result.append(json_msg)
+    return result
+
+
+def build_payload(request: ChatRequest) -> dict[str, Any]:
+    """Build the provider JSON payload from a ChatRequest."""
+    payload: dict[str, Any] = {
+        "model": request.model,
+        "messages": messages_to_json(request.messages),
+        "stream": request.stream,
+    }
+    if request.stream:
+        # Without this, OpenAI-compatible servers send no usage when streaming
+        payload["stream_options"] = {"include_usage": True}
+
+    if request.temperature is not None:
+        payload["temperature"] = request.temperature
+    if request.top_p is not None:
+        payload["top_p"] = request.top_p
+    if request.max_tokens is not None:
+        payload["max_tokens"] = request.max_tokens
+    if request.stop is not None:
+        payload["stop"] = request.stop
+
+    return payload
+
+
+def deadline_expired(request: ChatRequest) -> bool:
+    """Whether the request has a deadline and it has passed."""
+    return request.deadline is not None and time.monotonic() >= request.deadline
 
 
 @dataclass
@@ -29,8 +128,75 @@ class OpenAiLLMClientConfig:
     base_url: str
     api_key: str | None = None
     timeout_s: float = 60.0
+    connect_timeout_s: float | None = None
+    read_timeout_s: float | None = None
+    write_timeout_s: float | None = None
+    pool_timeout_s: float | None = None
     default_headers: dict[str, str] = field(default_factory=dict)
     verify_tls: bool = True
+    http2: bool = False
+    max_connections: int | None = 100
+    max_keepalive_connections: int | None = 20
+    keepalive_expiry_s: float | None = 5.0
+    warmup_connections: int = 1
+
+    def timeout(self) -> httpx.Timeout:
+        """Build the httpx timeout, using timeout_s for any phase left unset."""
+        phases = {
+            "connect": self.connect_timeout_s,
+            "read": self.read_timeout_s,
+            "write": self.write_timeout_s,
+            "pool": self.pool_timeout_s,
+        }
+        return httpx.Timeout(
+            self.timeout_s,
+            **{phase: value for phase, value in phases.items() if value is not None},
+        )
+
+    def limits(self) -> httpx.Limits:
+        """Build the httpx connection pool limits."""
+        return httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry_s,
+        )
+
+
+class _PoolSlot:
+    """
+    One request's wait for, and use of, a pooled upstream connection.
+
+    httpx does not expose its connection pool, so occupancy is derived from
+    httpcore trace events instead: the request counts as connected from the
+    first event showing it got a connection until release(). With HTTP/1.1
+    that is the number of connections in use; with HTTP/2, several connected
+    requests may share one connection.
+    """
+
+    __slots__ = ("_client", "_start", "connected")
+
+    def __init__(self, client: OpenAiLLMClient) -> None:
+        self._client = client
+        self._start = time.perf_counter()
+        self.connected = False
+
+    async def trace(self, event_name: str, info: dict[str, Any]) -> None:
+        """httpcore trace callback, recording how long the request waited."""
+        if not self.connected and event_name in _POOL_ACQUIRED_EVENTS:
+            self.connected = True
+            self._client._connected += 1
+            _pool_wait.record(
+                time.perf_counter() - self._start, self._client._metric_attributes
+            )
+
+    def release(self) -> None:
+        """Mark the request finished, returning its connection to the pool."""
+        client = self._client
+        _active_requests.add(-1, client._metric_attributes)
+        client._in_flight -= 1
+        if self.connected:
+            self.connected = False
+            client._connected -= 1
 
 
 class OpenAiLLMClient(LLMClient):
@@ -48,12 +214,22 @@ class OpenAiLLMClient(LLMClient):
         if config.api_key:
             headers["Authorization"] = f"Bearer {config.api_key}"
 
+        self._transport = httpx.AsyncHTTPTransport(
+            http2=config.http2,
+            limits=config.limits(),
+            verify=config.verify_tls,
+        )
         self._client = httpx.AsyncClient(
             base_url=config.base_url,
             headers=headers,
-            timeout=config.timeout_s,
-            verify=config.verify_tls,
+            timeout=config.timeout(),
+            transport=self._transport,
         )
+        self._metric_attributes = {"server.address": config.base_url}
+        # Requests in flight, and how many of them got a pooled connection
+        self._in_flight = 0
+        self._connected = 0
+        _clients.add(self)
 
     async def chat(self, request: ChatRequest) -> ChatResponse:
         """
@@ -67,10 +243,26 @@ class OpenAiLLMClient(LLMClient):
 
         Raises:
             httpx.HTTPStatusError: If the request fails with a non-2xx status.
+            DeadlineExceededError: If the request's deadline passes first.
         """
-        payload = self._build_payload(request)
-
-        response = await self._client.post("/chat/completions", json=payload)
+        payload = build_payload(request)
+        timeout = self._request_timeout(request)
+
+        slot = self._acquire_slot()
+        try:
+            response = await self._client.post(
+                "/chat/completions",
+                json=payload,
+                timeout=timeout,
+                extensions={"trace": slot.trace},
+            )
+        except httpx.TimeoutException as e:
+            if deadline_expired(request):
+                raise DeadlineExceededError("upstream did not answer in time") from e
+            raise
+        finally:
+            slot.release()
+        self._record_status(response)
         response.raise_for_status()
 
         data = response.json()
@@ -88,68 +280,127 @@ class OpenAiLLMClient(LLMClient):
 
         Raises:
             httpx.HTTPStatusError: If the request fails with a non-2xx status.
+            DeadlineExceededError: If the request's deadline passes mid-stream.
         """
         request.stream = True
-        payload = self._build_payload(request)
-
-        async with self._client.stream(
-            "POST", "/chat/completions", json=payload
-        ) as response:
-            response.raise_for_status()
-
-            async for line in response.aiter_lines():
-                line = line.strip()
-                if not line:
-                    continue
-
-                if line.startswith("data: "):
-                    data_str = line[6:]  # Remove "data: " prefix
-                    if data_str == "[DONE]":
-                        yield StreamDone()
-                        break
-
-                    try:
-                        chunk_data = json.loads(data_str)
-                    except json.JSONDecodeError:
-                        continue
-
-                    # Yield token delta if present
-                    if "choices" in chunk_data and len(chunk_data["choices"]) > 0:
-                        choice = chunk_data["choices"][0]
-                        delta = choice.get("delta", {})
-                        if "content" in delta and delta["content"]:
-                            yield TokenDelta(text=delta["content"])
-
-                    # Yield usage if present
-                    if "usage" in chunk_data:
-                        usage = self._parse_usage(chunk_data)
-                        if usage:
-                            yield StreamUsage(usage=usage)
-
-                    # Check for finish reason
-                    if "choices" in chunk_data and len(chunk_data["choices"]) > 0:
-                        choice = chunk_data["choices"][0]
-                        finish_reason = choice.get("finish_reason")
-                        if finish_reason:
-                            yield StreamDone(finish_reason=finish_reason)
-                            break
+        payload = build_payload(request)
+        timeout = self._request_timeout(request)
+
+        slot = self._acquire_slot()
+        cancelled_at: float | None = None
+        try:
+            async with self._client.stream(
+                "POST",
+                "/chat/completions",
+                json=payload,
+                timeout=timeout,
+                extensions={"trace": slot.trace},
+            ) as response:
+                self._record_status(response)
+                response.raise_for_status()
+
+                try:
+                    async for event in aiter_stream_events(response.aiter_bytes()):
+                        if deadline_expired(request):
+                            raise DeadlineExceededError("stream ran past its deadline")
+                        yield event
+                except (GeneratorExit, asyncio.CancelledError):
+                    # Leaving the block closes the response, dropping the
+                    # upstream connection rather than draining it
+                    cancelled_at = time.perf_counter()
+                    raise
+        except (GeneratorExit, asyncio.CancelledError):
+            self._record_cancelled(request, cancelled_at)
+            raise
+        except httpx.TimeoutException as e:
+            if deadline_expired(request):
+                raise DeadlineExceededError("upstream did not answer in time") from e
+            raise
+        finally:
+            slot.release()
+
+    async def warm_up(self) -> None:
+        """
+        Open upstream connections ahead of the first request.
+
+        Issues ``warmup_connections`` concurrent ``GET /models`` requests so that
+        DNS resolution and TCP/TLS handshakes are done before traffic arrives.
+        Any response (even an error status) leaves a pooled connection behind.
+        """
+
+        async def open_connection() -> None:
+            try:
+                await self._client.get("/models")
+            except httpx.HTTPError as e:
+                log.warning("llm_client.warm_up_failed", extra={"error": str(e)})
+
+        await asyncio.gather(
+            *(open_connection() for _ in range(self._config.warmup_connections))
+        )
 
     async def aclose(self) -> None:
         """Close the HTTP client."""
+        _clients.discard(self)
         await self._client.aclose()
 
-    def _messages_to_json(self, messages: list[ChatMessage]) -> list[dict[str, Any]]:
-        """Convert ChatMessage list to provider JSON format."""
-        result = []
-        for msg in messages:
-            json_msg: dict[str, Any] = {
-                "role": msg.role,
-                "content": msg.content,
-            }
-            if msg.name is not None:
-                json_msg["name"] = msg.name
-            result.append(json_msg)
-        return result
+    def _request_timeout(self, request: ChatRequest) -> httpx.Timeout:
+        """
+        Build the timeout for one request, capping every phase at its deadline.
+
+        Raises:
+            DeadlineExceededError: If the deadline has already passed.
+        """
+        timeout = self._client.timeout
+        if request.deadline is None:
+            return timeout
+
+        remaining_s = request.deadline - time.monotonic()
+        if remaining_s <= 0:
+            raise DeadlineExceededError("deadline passed before the request was sent")
+
+        def cap(phase_s: float | None) -> float:
+            return remaining_s if phase_s is None else min(phase_s, remaining_s)
+
+        return httpx.Timeout(
+            connect=cap(timeout.connect),
+            read=cap(timeout.read),
+            write=cap(timeout.write),
+            pool=cap(timeout.pool),
+        )
+
+    def _record_status(self, response: httpx.Response) -> None:
+        _responses.add(
+            1,
+            {
+                **self._metric_attributes,
+                "http.response.status_code": response.status_code,
+            },
+        )
+
+    def _record_cancelled(
+        self, request: ChatRequest, cancelled_at: float | None
+    ) -> None:
+        """Count an abandoned stream and how long closing its response took."""
+        reason = "deadline" if deadline_expired(request) else "cancelled"
+        _cancelled_streams.add(1, {**self._metric_attributes, "reason": reason})
+        if cancelled_at is not None:
+            _cancel_close_time.record(
+                time.perf_counter() - cancelled_at, self._metric_attributes
+            )
+        log.debug("llm_client.stream_cancelled", extra={"reason": reason})
+
+    def _acquire_slot(self) -> _PoolSlot:
+        """Start tracking a request's wait for, and use of, a pooled connection."""
+        _active_requests.add(1, self._metric_attributes)
+        self._in_flight += 1
+        return _PoolSlot(self)
+
+    def _observe_pool_requests(self) -> Iterable[Observation]:
+        """Report the requests in flight, split by whether they have a connection."""
+        connected = self._connected
+        waiting = self._in_flight - connected
+        yield Observation(connected, {**self._metric_attributes, "state": "connected"})
+        yield Observation(waiting, {**self._metric_attributes, "state": "waiting"})
 
     def _parse_usage(self, data: dict[str, Any]) -> Usage | None:
         """Parse usage dictionary defensively."""
@@ -166,25 +417,6 @@ class OpenAiLLMClient(LLMClient):
             total_tokens=usage_data.get("total_tokens"),
         )
 
-    def _build_payload(self, request: ChatRequest) -> dict[str, Any]:
-        """Build JSON payload from ChatRequest."""
-        payload: dict[str, Any] = {
-            "model": request.model,
-            "messages": self._messages_to_json(request.messages),
-            "stream": request.stream,
-        }
-
-        if request.temperature is not None:
-            payload["temperature"] = request.temperature
-        if request.top_p is not None:
-            payload["top_p"] = request.top_p
-        if request.max_tokens is not None:
-            payload["max_tokens"] = request.max_tokens
-        if request.stop is not None:
-            payload["stop"] = request.stop
-
-        return payload
-
     def _parse_response(self, data: dict[str, Any]) -> ChatResponse:
         """Parse OpenAI-compatible response."""
         text = ""
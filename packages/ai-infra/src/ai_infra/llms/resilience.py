@@ -0,0 +1,455 @@
+"""Adaptive concurrency limiting and circuit breaking for LLM clients."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import re
+import time
+import weakref
+from collections.abc import AsyncIterator, Callable, Iterable
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import Literal
+
+import httpx
+from opentelemetry import metrics
+from opentelemetry.metrics import CallbackOptions, Observation
+
+from ai_core.exceptions import UpstreamOverloadedError, UpstreamUnavailableError
+from ai_core.orchestration.services.llm_service import (
+    ChatRequest,
+    ChatResponse,
+    ChatStreamEvent,
+    LLMClient,
+    TokenDelta,
+)
+from ai_core.orchestration.streaming import closing_stream
+
+log = logging.getLogger("llms.resilience")
+meter = metrics.get_meter("llms.resilience")
+
+Outcome = Literal["success", "dropped", "ignored"]
+
+# OpenAI-style rate limit reset durations, e.g. "1s", "6m0s", "20ms"
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+_DURATION_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+# Live clients, observed by the concurrency limit gauge
+_clients: weakref.WeakSet[ResilientLLMClient] = weakref.WeakSet()
+
+
+def _observe_limits(options: CallbackOptions) -> Iterable[Observation]:
+    for client in list(_clients):
+        for model, guard in client.guards.items():
+            yield Observation(guard.limiter.limit, client._attributes(model))
+
+
+_rejections = meter.create_counter(
+    "llm_client.rejections",
+    unit="{request}",
+    description="Requests failed fast by the concurrency limiter or circuit breaker",
+)
+meter.create_observable_gauge(
+    "llm_client.concurrency_limit",
+    callbacks=[_observe_limits],
+    unit="{request}",
+    description="Current adaptive concurrency limit per upstream endpoint and model",
+)
+
+
+def parse_retry_after(response: httpx.Response) -> float | None:
+    """
+    Read how long to back off from a rate limited or unavailable response.
+
+    Understands ``Retry-After`` (seconds or HTTP date), ``retry-after-ms`` and
+    OpenAI-style ``x-ratelimit-reset-*`` durations for exhausted limits.
+
+    Args:
+        response: The upstream error response.
+
+    Returns:
+        Seconds to wait, or None when the response doesn't say.
+    """
+    headers = response.headers
+    if value := headers.get("retry-after-ms"):
+        try:
+            return max(float(value) / 1000, 0.0)
+        except ValueError:
+            pass
+
+    if value := headers.get("retry-after"):
+        try:
+            return max(float(value), 0.0)
+        except ValueError:
+            try:
+                retry_at = parsedate_to_datetime(value)
+            except (TypeError, ValueError):
+                retry_at = None
+            if retry_at is not None:
+                return max(retry_at.timestamp() - time.time(), 0.0)
+
+    resets = []
+    for kind in ("requests", "tokens"):
+        if headers.get(f"x-ratelimit-remaining-{kind}") != "0":
+            continue
+        reset = _parse_duration(headers.get(f"x-ratelimit-reset-{kind}", ""))
+        if reset is not None:
+            resets.append(reset)
+    return max(resets) if resets else None
+
+
+def _parse_duration(value: str) -> float | None:
+    parts = _DURATION_PART.findall(value)
+    if not parts:
+        return None
+    return sum(float(amount) * _DURATION_UNITS[unit] for amount, unit in parts)
+
+
+class AimdLimiter:
+    """
+    Additive-increase/multiplicative-decrease concurrency limiter.
+
+    Requests over the limit are rejected rather than queued. Every successful
+    request grows the limit by ``increase / limit`` (about ``increase`` per
+    round trip of ``limit`` requests); every dropped request (rate limited,
+    failed, or slower than the latency threshold) multiplies it by
+    ``backoff``.
+    """
+
+    def __init__(
+        self,
+        initial_limit: int = 32,
+        min_limit: int = 1,
+        max_limit: int = 256,
+        increase: float = 1.0,
+        backoff: float = 0.5,
+    ) -> None:
+        """
+        Initialize the limiter.
+
+        Args:
+            initial_limit: Concurrency limit to start with.
+            min_limit: Lowest the limit can drop to.
+            max_limit: Highest the limit can grow to.
+            increase: Additive increase per window of successful requests.
+            backoff: Multiplicative decrease applied on a dropped request.
+        """
+        self._limit = float(initial_limit)
+        self._min_limit = min_limit
+        self._max_limit = max_limit
+        self._increase = increase
+        self._backoff = backoff
+        self.inflight = 0
+
+    @property
+    def limit(self) -> int:
+        """The current concurrency limit."""
+        return int(self._limit)
+
+    def try_acquire(self) -> bool:
+        """
+        Take a slot if one is free.
+
+        Returns:
+            Whether the request may proceed.
+        """
+        if self.inflight >= self.limit:
+            return False
+        self.inflight += 1
+        return True
+
+    def release(self, outcome: Outcome) -> None:
+        """
+        Return a slot and adapt the limit to the request's outcome.
+
+        Args:
+            outcome: "success" grows the limit, "dropped" shrinks it, and
+                "ignored" (client errors, cancellations) leaves it alone.
+        """
+        self.inflight -= 1
+        if outcome == "success":
+            # Only grow while the limit is actually being used
+            if self.inflight + 1 >= self.limit / 2:
+                self._limit = min(
+                    self._limit + self._increase / self._limit, self._max_limit
+                )
+        elif outcome == "dropped":
+            self._limit = max(self._limit * self._backoff, self._min_limit)
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker reacting to rate limiting and upstream failures.
+
+    Consecutive failures open the circuit for ``reset_timeout_s``; a failure
+    that says when to retry (``Retry-After`` and friends) opens it for that
+    long straight away. Once the timeout passes a single probe request is let
+    through, and its outcome closes or re-opens the circuit.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout_s: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Initialize the circuit breaker.
+
+        Args:
+            failure_threshold: Consecutive failures that open the circuit.
+            reset_timeout_s: How long the circuit stays open without a retry hint.
+            clock: Monotonic clock, injectable for tests.
+        """
+        self._failure_threshold = failure_threshold
+        self._reset_timeout_s = reset_timeout_s
+        self._clock = clock
+        self._failures = 0
+        self._open_until: float | None = None
+        self._probing = False
+
+    @property
+    def state(self) -> Literal["closed", "open", "half_open"]:
+        """The current circuit state."""
+        if self._open_until is None:
+            return "closed"
+        if self._clock() < self._open_until:
+            return "open"
+        return "half_open"
+
+    def allow(self) -> float | None:
+        """
+        Check whether a request may be sent.
+
+        Returns:
+            None if the request may proceed, otherwise the seconds until the
+            circuit will let a probe through.
+        """
+        if self._open_until is None:
+            return None
+
+        remaining = self._open_until - self._clock()
+        if remaining > 0:
+            return remaining
+        if self._probing:
+            # A probe is already in flight; hold everyone else back
+            return 0.0
+        self._probing = True
+        return None
+
+    def record_success(self) -> None:
+        """Close the circuit after a successful request."""
+        if self._open_until is not None:
+            log.info("circuit_breaker.closed")
+        self._failures = 0
+        self._open_until = None
+        self._probing = False
+
+    def record_failure(self, retry_after_s: float | None = None) -> None:
+        """
+        Count a failed request, opening the circuit if needed.
+
+        Args:
+            retry_after_s: Back-off requested by the upstream, if any.
+        """
+        self._failures += 1
+        probe_failed = self._probing
+        self._probing = False
+        if retry_after_s is not None:
+            self._open(retry_after_s)
+        elif probe_failed or self._failures >= self._failure_threshold:
+            self._open(self._reset_timeout_s)
+
+    def release_probe(self) -> None:
+        """Let another probe through when one ends without a verdict."""
+        self._probing = False
+
+    def _open(self, duration_s: float) -> None:
+        self._open_until = self._clock() + duration_s
+        self._failures = 0
+        log.warning("circuit_breaker.open", extra={"duration_s": duration_s})
+
+
+@dataclass
+class UpstreamGuard:
+    """Concurrency limiter and circuit breaker for one upstream model."""
+
+    limiter: AimdLimiter
+    breaker: CircuitBreaker
+
+
+def classify_error(error: BaseException) -> tuple[Outcome, float | None]:
+    """
+    Classify an upstream error for the limiter and circuit breaker.
+
+    Returns:
+        The outcome, and the back-off requested by the upstream if any.
+    """
+    if isinstance(error, httpx.HTTPStatusError):
+        status = error.response.status_code
+        if status == 429 or status >= 500:
+            return "dropped", parse_retry_after(error.response)
+        return "ignored", None
+    if isinstance(error, (httpx.TransportError, asyncio.TimeoutError)):
+        return "dropped", None
+    return "ignored", None
+
+
+class ResilientLLMClient(LLMClient):
+    """
+    LLMClient wrapper that protects upstream models from overload.
+
+    Each model gets an AIMD concurrency limiter and a circuit breaker.
+    Requests beyond the current limit fail fast with UpstreamOverloadedError,
+    and requests to a model whose circuit is open fail fast with
+    UpstreamUnavailableError, instead of queueing in the HTTP connection pool.
+
+    Wrap each upstream endpoint separately (below any BalancingLLMClient) so
+    every replica's limit tracks its own capacity and hedged requests take a
+    slot like any other.
+    """
+
+    def __init__(
+        self,
+        inner: LLMClient,
+        guard_factory: Callable[[], UpstreamGuard] | None = None,
+        ttft_threshold_s: float | None = None,
+        name: str | None = None,
+    ) -> None:
+        """
+        Initialize the resilient client.
+
+        Args:
+            inner: The client to protect.
+            guard_factory: Builds the limiter and breaker for a newly seen model.
+            ttft_threshold_s: First-token latency above which a stream counts
+                as dropped, so the limit also backs off on slowdowns.
+            name: Name of the upstream endpoint (e.g. base URL) for metrics.
+        """
+        self._inner = inner
+        self._name = name
+        self._guard_factory = guard_factory or (
+            lambda: UpstreamGuard(AimdLimiter(), CircuitBreaker())
+        )
+        self._ttft_threshold_s = ttft_threshold_s
+        self.guards: dict[str, UpstreamGuard] = {}
+        _clients.add(self)
+
+    async def chat(self, request: ChatRequest) -> ChatResponse:
+        """
+        Send a non-streaming chat request if the model can take it.
+
+        Args:
+            request: Chat request parameters.
+
+        Returns:
+            Chat response with text and metadata.
+
+        Raises:
+            UpstreamOverloadedError: If the model's concurrency limit is reached.
+            UpstreamUnavailableError: If the model's circuit is open.
+        """
+        guard = self._acquire(request.model)
+        outcome: Outcome = "ignored"
+        try:
+            response = await self._inner.chat(request)
+            outcome = "success"
+            return response
+        except Exception as e:
+            outcome = self._record_error(guard, e)
+            raise
+        finally:
+            self._release(guard, outcome)
+
+    async def stream_chat(self, request: ChatRequest) -> AsyncIterator[ChatStreamEvent]:
+        """
+        Send a streaming chat request if the model can take it.
+
+        Args:
+            request: Chat request parameters (stream will be forced to True).
+
+        Yields:
+            ChatStreamEvent objects (TokenDelta, StreamUsage, StreamDone).
+
+        Raises:
+            UpstreamOverloadedError: If the model's concurrency limit is reached.
+            UpstreamUnavailableError: If the model's circuit is open.
+        """
+        guard = self._acquire(request.model)
+        outcome: Outcome = "ignored"
+        start = time.perf_counter()
+        slow = False
+        first_token = True
+        try:
+            stream = self._inner.stream_chat(request)
+            async with closing_stream(stream):
+                async for event in stream:
+                    if first_token and isinstance(event, TokenDelta):
+                        first_token = False
+                        ttft_s = time.perf_counter() - start
+                        slow = (
+                            self._ttft_threshold_s is not None
+                            and ttft_s > self._ttft_threshold_s
+                        )
+                    yield event
+            outcome = "success"
+        except Exception as e:
+            outcome = self._record_error(guard, e)
+            raise
+        finally:
+            self._release(guard, outcome, slow=slow)
+
+    async def warm_up(self) -> None:
+        """Open upstream connections ahead of the first request."""
+        await self._inner.warm_up()
+
+    async def aclose(self) -> None:
+        """Close the wrapped client."""
+        _clients.discard(self)
+        await self._inner.aclose()
+
+    def _acquire(self, model: str) -> UpstreamGuard:
+        guard = self.guards.get(model)
+        if guard is None:
+            guard = self.guards[model] = self._guard_factory()
+
+        retry_after_s = guard.breaker.allow()
+        if retry_after_s is not None:
+            _rejections.add(1, {**self._attributes(model), "reason": "circuit_open"})
+            raise UpstreamUnavailableError(
+                f"Upstream for model {model} is unavailable, "
+                f"retry in {retry_after_s:.1f}s",
+                retry_after_s=retry_after_s,
+            )
+
+        if not guard.limiter.try_acquire():
+            guard.breaker.release_probe()
+            _rejections.add(1, {**self._attributes(model), "reason": "overloaded"})
+            raise UpstreamOverloadedError(
+                f"Upstream for model {model} is at its concurrency limit "
+                f"({guard.limiter.limit})"
+            )
+
+        return guard
+
+    def _attributes(self, model: str) -> dict[str, str]:
+        if self._name is None:
+            return {"model": model}
+        return {"model": model, "server.address": self._name}
+
+    def _record_error(self, guard: UpstreamGuard, error: Exception) -> Outcome:
+        outcome, retry_after_s = classify_error(error)
+        if outcome == "dropped":
+            guard.breaker.record_failure(retry_after_s)
+        return outcome
+
+    def _release(
+        self, guard: UpstreamGuard, outcome: Outcome, slow: bool = False
+    ) -> None:
+        # A slow but successful request shrinks the limit without tripping the breaker
+        guard.limiter.release("dropped" if slow and outcome == "success" else outcome)
+        if outcome == "success":
+            guard.breaker.record_success()
+        elif outcome == "ignored":
+            guard.breaker.release_probe()
@@ -0,0 +1,293 @@
+"""Exact-match response cache for deterministic chat completions."""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+from collections.abc import AsyncIterator
+from dataclasses import asdict, dataclass, field
+from typing import Any, Protocol
+
+from opentelemetry import metrics
+
+from ai_core.orchestration.services.llm_service import (
+    ChatRequest,
+    ChatResponse,
+    ChatStreamEvent,
+    LLMClient,
+    StreamDone,
+    StreamUsage,
+    TokenDelta,
+    Usage,
+)
+from ai_core.orchestration.streaming import closing_stream
+from ai_infra.cache import TtlLruCache
+from ai_infra.llms.client import build_payload
+
+log = logging.getLogger("llms.response_cache")
+meter = metrics.get_meter("llms.response_cache")
+
+_lookups = meter.create_counter(
+    "llm_cache.lookups",
+    unit="{request}",
+    description="Response cache lookups by result (hit/miss) and tier",
+)
+_hit_bytes = meter.create_counter(
+    "llm_cache.hit_bytes",
+    unit="By",
+    description="Completion bytes served from the response cache",
+)
+_stored_bytes = meter.create_counter(
+    "llm_cache.stored_bytes",
+    unit="By",
+    description="Completion bytes written to the response cache",
+)
+
+
+@dataclass
+class CachedCompletion:
+    """A completed response, kept as the token chunks it was streamed in."""
+
+    chunks: list[str]
+    finish_reason: str | None = None
+    usage: Usage | None = None
+    size_bytes: int = field(default=0, compare=False)
+
+    def __post_init__(self) -> None:
+        if not self.size_bytes:
+            self.size_bytes = sum(len(chunk.encode()) for chunk in self.chunks)
+
+    @property
+    def text(self) -> str:
+        """The full completion text."""
+        return "".join(self.chunks)
+
+    def to_json(self) -> dict[str, Any]:
+        """Serialize for the persistent tier."""
+        return {
+            "chunks": self.chunks,
+            "finish_reason": self.finish_reason,
+            "usage": asdict(self.usage) if self.usage is not None else None,
+        }
+
+    @staticmethod
+    def from_json(data: dict[str, Any]) -> CachedCompletion:
+        """Deserialize from the persistent tier."""
+        usage = data.get("usage")
+        return CachedCompletion(
+            chunks=data["chunks"],
+            finish_reason=data.get("finish_reason"),
+            usage=Usage(**usage) if usage is not None else None,
+        )
+
+
+class ResponseCacheStore(Protocol):
+    """Protocol for persistent response cache tiers."""
+
+    async def get(self, key: str) -> CachedCompletion | None:
+        """Get an unexpired completion by key."""
+        ...
+
+    async def set(self, key: str, value: CachedCompletion, ttl_s: float) -> None:
+        """Store a completion for ttl_s seconds."""
+        ...
+
+
+def cache_key(request: ChatRequest) -> str:
+    """
+    Hash the upstream payload of a request into a cache key.
+
+    The stream flags are left out so streaming and non-streaming calls share
+    entries, and keys are serialized canonically so dict ordering can't
+    change the hash.
+
+    Args:
+        request: Chat request parameters.
+
+    Returns:
+        Hex SHA-256 digest of the canonical payload.
+    """
+    payload = build_payload(request)
+    payload.pop("stream", None)
+    payload.pop("stream_options", None)
+    canonical = json.dumps(
+        payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False
+    )
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+class CachingLLMClient(LLMClient):
+    """
+    LLMClient decorator serving repeated requests from a response cache.
+
+    Only requests with ``cache`` set (from the model profile opt-in) are
+    cached. Entries live in an in-memory LRU with TTL, backed by an optional
+    persistent tier. Cached streams are replayed as the original TokenDelta
+    chunks followed by the original usage and finish reason. Streams that
+    fail or are abandoned before StreamDone are not cached.
+
+    New entries go into the memory tier right away. Writes to the persistent
+    tier run in background tasks, so a miss doesn't wait for a database
+    round-trip before its StreamDone; aclose() waits for them to finish.
+    """
+
+    def __init__(
+        self,
+        inner: LLMClient,
+        memory: TtlLruCache[str, CachedCompletion],
+        persistent: ResponseCacheStore | None = None,
+        ttl_s: float = 3600.0,
+        max_entry_bytes: int = 256 * 1024,
+    ) -> None:
+        """
+        Initialize the caching client.
+
+        Args:
+            inner: The client to call on a cache miss.
+            memory: In-memory LRU/TTL tier.
+            persistent: Optional shared tier, consulted after a memory miss.
+            ttl_s: Lifetime of new entries in both tiers.
+            max_entry_bytes: Completions larger than this are not cached.
+        """
+        self._inner = inner
+        self._memory = memory
+        self._persistent = persistent
+        self._ttl_s = ttl_s
+        self._max_entry_bytes = max_entry_bytes
+        self._pending_writes: set[asyncio.Task[None]] = set()
+
+    async def chat(self, request: ChatRequest) -> ChatResponse:
+        """
+        Send a non-streaming chat request, serving it from the cache if possible.
+
+        Args:
+            request: Chat request parameters.
+
+        Returns:
+            Chat response with text and metadata.
+        """
+        if not request.cache:
+            return await self._inner.chat(request)
+
+        key = cache_key(request)
+        cached = await self._lookup(key)
+        if cached is not None:
+            return ChatResponse(
+                text=cached.text,
+                finish_reason=cached.finish_reason,
+                usage=cached.usage,
+            )
+
+        response = await self._inner.chat(request)
+        self._store(
+            key,
+            CachedCompletion(
+                chunks=[response.text],
+                finish_reason=response.finish_reason,
+                usage=response.usage,
+            ),
+        )
+        return response
+
+    async def stream_chat(self, request: ChatRequest) -> AsyncIterator[ChatStreamEvent]:
+        """
+        Send a streaming chat request, replaying it from the cache if possible.
+
+        Args:
+            request: Chat request parameters (stream will be forced to True).
+
+        Yields:
+            ChatStreamEvent objects (TokenDelta, StreamUsage, StreamDone).
+        """
+        if not request.cache:
+            stream = self._inner.stream_chat(request)
+            async with closing_stream(stream):
+                async for event in stream:
+                    yield event
+            return
+
+        key = cache_key(request)
+        cached = await self._lookup(key)
+        if cached is not None:
+            for chunk in cached.chunks:
+                yield TokenDelta(text=chunk)
+            if cached.usage is not None:
+                yield StreamUsage(usage=cached.usage)
+            yield StreamDone(finish_reason=cached.finish_reason)
+            return
+
+        chunks: list[str] = []
+        usage: Usage | None = None
+        stream = self._inner.stream_chat(request)
+        async with closing_stream(stream):
+            async for event in stream:
+                if isinstance(event, TokenDelta):
+                    chunks.append(event.text)
+                elif isinstance(event, StreamUsage):
+                    usage = event.usage
+                elif isinstance(event, StreamDone):
+                    self._store(
+                        key,
+                        CachedCompletion(
+                            chunks=chunks,
+                            finish_reason=event.finish_reason,
+                            usage=usage,
+                        ),
+                    )
+                yield event
+
+    async def warm_up(self) -> None:
+        """Open upstream connections ahead of the first request."""
+        await self._inner.warm_up()
+
+    async def aclose(self) -> None:
+        """Wait for pending persistent writes, then close the wrapped client."""
+        if self._pending_writes:
+            await asyncio.gather(*self._pending_writes, return_exceptions=True)
+        await self._inner.aclose()
+
+    async def _lookup(self, key: str) -> CachedCompletion | None:
+        found, cached = self._memory.get(key)
+        if found and cached is not None:
+            self._record_hit(cached, "memory")
+            return cached
+
+        if self._persistent is not None:
+            try:
+                cached = await self._persistent.get(key)
+            except Exception as e:
+                log.warning("response_cache.get_failed", extra={"error": str(e)})
+                cached = None
+            if cached is not None:
+                self._memory.set(key, cached)
+                self._record_hit(cached, "persistent")
+                return cached
+
+        _lookups.add(1, {"result": "miss"})
+        return None
+
+    def _store(self, key: str, value: CachedCompletion) -> None:
+        if value.size_bytes > self._max_entry_bytes:
+            return
+
+        self._memory.set(key, value, ttl_s=self._ttl_s)
+        _stored_bytes.add(value.size_bytes)
+        if self._persistent is not None:
+            # Keep a reference so the task isn't garbage collected mid-write
+            task = asyncio.create_task(self._store_persistent(key, value))
+            self._pending_writes.add(task)
+            task.add_done_callback(self._pending_writes.discard)
+
+    async def _store_persistent(self, key: str, value: CachedCompletion) -> None:
+        assert self._persistent is not None
+        try:
+            await self._persistent.set(key, value, self._ttl_s)
+        except Exception as e:
+            log.warning("response_cache.set_failed", extra={"error": str(e)})
+
+    @staticmethod
+    def _record_hit(cached: CachedCompletion, tier: str) -> None:
+        _lookups.add(1, {"result": "hit", "tier": tier})
+        _hit_bytes.add(cached.size_bytes, {"tier": tier})
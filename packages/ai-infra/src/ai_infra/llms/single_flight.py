@@ -0,0 +1,224 @@
+"""Single-flight coalescing of identical in-flight streaming requests."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections.abc import AsyncIterator
+from dataclasses import replace
+
+from opentelemetry import metrics
+
+from ai_core.exceptions import DeadlineExceededError, StreamOverflowError
+from ai_core.orchestration.services.llm_service import (
+    ChatRequest,
+    ChatResponse,
+    ChatStreamEvent,
+    LLMClient,
+)
+from ai_core.orchestration.streaming import closing_stream
+from ai_infra.llms.client import deadline_expired
+from ai_infra.llms.response_cache import cache_key
+
+log = logging.getLogger("llms.single_flight")
+meter = metrics.get_meter("llms.single_flight")
+
+_subscriptions = meter.create_counter(
+    "llm_single_flight.subscriptions",
+    unit="{request}",
+    description="Coalescable streams by role (leader starts upstream, follower attaches)",
+)
+_overflows = meter.create_counter(
+    "llm_single_flight.overflows",
+    unit="{request}",
+    description="Subscribers detached for falling too far behind a shared stream",
+)
+
+
+def is_deterministic(request: ChatRequest) -> bool:
+    """Whether identical requests can share one upstream generation."""
+    return request.cache or request.temperature == 0
+
+
+class _Flight:
+    """One upstream stream and the events it has produced so far."""
+
+    def __init__(self) -> None:
+        self.events: list[ChatStreamEvent] = []
+        self.done = False
+        self.error: BaseException | None = None
+        self.subscribers = 0
+        self.producer: asyncio.Task[None] | None = None
+        self._wakeup = asyncio.Event()
+
+    def publish(self) -> None:
+        """Wake every subscriber waiting for new events."""
+        self._wakeup.set()
+        self._wakeup = asyncio.Event()
+
+    async def wait(self) -> None:
+        """Wait until new events are published or the stream ends."""
+        await self._wakeup.wait()
+
+
+class SingleFlightLLMClient(LLMClient):
+    """
+    LLMClient decorator sharing one upstream stream between identical requests.
+
+    Concurrent deterministic requests with the same payload attach to the
+    stream the first of them started, and every ChatStreamEvent is fanned out
+    to all subscribers. Subscribers that join late are replayed the events
+    produced so far. Each subscriber reads at its own pace from the shared
+    event history, so a slow consumer never holds up the producer; one that
+    falls more than ``max_lag`` events behind is detached with
+    StreamOverflowError. The shared stream runs without a deadline, and each
+    subscriber leaves with DeadlineExceededError at its own. When the last
+    subscriber leaves, the upstream stream is cancelled.
+    """
+
+    def __init__(self, inner: LLMClient, max_lag: int = 1024) -> None:
+        """
+        Initialize the single-flight client.
+
+        Args:
+            inner: The client producing upstream streams.
+            max_lag: Unread events a subscriber may fall behind before it is detached.
+        """
+        self._inner = inner
+        self._max_lag = max_lag
+        self._flights: dict[str, _Flight] = {}
+
+    async def chat(self, request: ChatRequest) -> ChatResponse:
+        """
+        Send a non-streaming chat request (not coalesced).
+
+        Args:
+            request: Chat request parameters.
+
+        Returns:
+            Chat response with text and metadata.
+        """
+        return await self._inner.chat(request)
+
+    async def stream_chat(self, request: ChatRequest) -> AsyncIterator[ChatStreamEvent]:
+        """
+        Send a streaming chat request, sharing an identical in-flight stream.
+
+        Args:
+            request: Chat request parameters (stream will be forced to True).
+
+        Yields:
+            ChatStreamEvent objects (TokenDelta, StreamUsage, StreamDone).
+
+        Raises:
+            StreamOverflowError: If this consumer falls too far behind.
+            DeadlineExceededError: If the request's deadline passes first.
+        """
+        if not is_deterministic(request):
+            stream = self._inner.stream_chat(request)
+            async with closing_stream(stream):
+                async for event in stream:
+                    yield event
+            return
+
+        if deadline_expired(request):
+            raise DeadlineExceededError("deadline passed before the request was sent")
+
+        # Request deadlines are on time.monotonic(); timeouts use the loop clock
+        loop = asyncio.get_running_loop()
+        wait_until = (
+            None
+            if request.deadline is None
+            else loop.time() + request.deadline - time.monotonic()
+        )
+
+        key = cache_key(request)
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = self._flights[key] = _Flight()
+            # The shared stream outlives any one subscriber's deadline; each
+            # subscriber leaves at its own, and the last one out cancels it
+            upstream_request = replace(request, deadline=None)
+            flight.producer = asyncio.create_task(
+                self._produce(key, flight, upstream_request)
+            )
+            _subscriptions.add(1, {"role": "leader"})
+        else:
+            _subscriptions.add(1, {"role": "follower"})
+
+        flight.subscribers += 1
+        # Late joiners are replayed the history without counting it as lag
+        joined_at = len(flight.events)
+        cursor = 0
+        try:
+            while True:
+                events = flight.events
+                if cursor < len(events):
+                    if len(events) - max(cursor, joined_at) > self._max_lag:
+                        _overflows.add(1)
+                        raise StreamOverflowError(
+                            f"Consumer fell more than {self._max_lag} events "
+                            "behind the shared upstream stream"
+                        )
+                    end = len(events)
+                    for event in events[cursor:end]:
+                        if deadline_expired(request):
+                            raise DeadlineExceededError("stream ran past its deadline")
+                        yield event
+                    cursor = end
+                elif flight.done:
+                    if flight.error is not None:
+                        raise flight.error
+                    return
+                else:
+                    # Only the wait is under the timeout: a timeout around the
+                    # yields would cancel the consumer's code instead
+                    try:
+                        async with asyncio.timeout_at(wait_until):
+                            await flight.wait()
+                    except TimeoutError:
+                        raise DeadlineExceededError(
+                            "shared stream ran past this request's deadline"
+                        ) from None
+        finally:
+            flight.subscribers -= 1
+            if flight.subscribers == 0 and not flight.done:
+                # Nobody is listening any more: stop generating upstream
+                if flight.producer is not None:
+                    flight.producer.cancel()
+                self._forget(key, flight)
+
+    async def warm_up(self) -> None:
+        """Open upstream connections ahead of the first request."""
+        await self._inner.warm_up()
+
+    async def aclose(self) -> None:
+        """Cancel in-flight streams and close the wrapped client."""
+        for flight in list(self._flights.values()):
+            if flight.producer is not None:
+                flight.producer.cancel()
+        self._flights.clear()
+        await self._inner.aclose()
+
+    async def _produce(self, key: str, flight: _Flight, request: ChatRequest) -> None:
+        """Read the upstream stream into the flight's history."""
+        try:
+            stream = self._inner.stream_chat(request)
+            async with closing_stream(stream):
+                async for event in stream:
+                    flight.events.append(event)
+                    flight.publish()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            flight.error = e
+        finally:
+            flight.done = True
+            self._forget(key, flight)
+            flight.publish()
+
+    def _forget(self, key: str, flight: _Flight) -> None:
+        # New requests start a fresh flight; current subscribers keep theirs
+        if self._flights.get(key) is flight:
+            del self._flights[key]
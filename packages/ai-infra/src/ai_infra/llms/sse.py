@@ -0,0 +1,270 @@
+"""Incremental server-sent events decoding for streaming chat completions."""
+
+from __future__ import annotations
+
+import json
+from collections.abc import AsyncIterable, AsyncIterator, Callable
+from typing import Any
+
+from ai_core.orchestration.streaming import (
+    ChatStreamEvent,
+    StreamDone,
+    StreamUsage,
+    TokenDelta,
+    Usage,
+)
+
+try:
+    import msgspec
+except ImportError:  # pragma: no cover - optional speedup
+    msgspec = None  # type: ignore[assignment]
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None  # type: ignore[assignment]
+
+DONE = b"[DONE]"
+
+
+class SseDecoder:
+    """
+    Incremental SSE decoder working on raw byte chunks.
+
+    Bytes are fed as they arrive from the network; events may be split across
+    chunks at any byte. Only ``data`` fields are kept: multi-line data is
+    joined with newlines, comments and other fields are ignored. Lines may end
+    with LF, CRLF or CR.
+    """
+
+    __slots__ = ("_buffer",)
+
+    def __init__(self) -> None:
+        self._buffer = b""
+
+    def feed(self, chunk: bytes) -> list[bytes]:
+        """
+        Feed a chunk of bytes into the decoder.
+
+        Args:
+            chunk: Raw bytes read from the response body.
+
+        Returns:
+            The data payloads of all events completed by this chunk.
+        """
+        buffer = self._buffer + chunk if self._buffer else chunk
+        tail = b""
+        if b"\r" in buffer:
+            # A trailing CR may be the first half of a CRLF split across chunks
+            if buffer.endswith(b"\r"):
+                buffer, tail = buffer[:-1], b"\r"
+            buffer = buffer.replace(b"\r\n", b"\n").replace(b"\r", b"\n")
+
+        blocks = buffer.split(b"\n\n")
+        self._buffer = blocks.pop() + tail
+        return self._dispatch(blocks)
+
+    def flush(self) -> list[bytes]:
+        """
+        Dispatch whatever is left once the stream has ended.
+
+        Strictly, an event without its terminating blank line is incomplete,
+        but some servers close the stream right after the last ``data`` line.
+
+        Returns:
+            The data payload of the trailing event, if any.
+        """
+        block = self._buffer.replace(b"\r\n", b"\n").replace(b"\r", b"\n")
+        self._buffer = b""
+        return self._dispatch([block.rstrip(b"\n")])
+
+    @staticmethod
+    def _dispatch(blocks: list[bytes]) -> list[bytes]:
+        events = []
+        for block in blocks:
+            # Fast path: a single ``data`` line, which is what LLM servers send
+            if block.startswith(b"data: ") and b"\n" not in block:
+                events.append(block[6:])
+                continue
+
+            data = []
+            for line in block.split(b"\n"):
+                if line.startswith(b"data:"):
+                    value = line[5:]
+                    data.append(value[1:] if value[:1] == b" " else value)
+                elif line == b"data":
+                    data.append(b"")
+            if data:
+                events.append(b"\n".join(data))
+        return events
+
+
+ChunkEvents = tuple[ChatStreamEvent, ...]
+ChunkDecoder = Callable[[bytes], ChunkEvents]
+
+_NO_EVENTS: ChunkEvents = ()
+
+
+def _chunk_events(
+    content: str | None, finish_reason: str | None, usage: Usage | None
+) -> ChunkEvents:
+    """Build the stream events for one chunk; a StreamDone is always last."""
+    if usage is None and not finish_reason:
+        return (TokenDelta(text=content),) if content else _NO_EVENTS
+
+    events: list[ChatStreamEvent] = []
+    if content:
+        events.append(TokenDelta(text=content))
+    if usage is not None:
+        events.append(StreamUsage(usage=usage))
+    if finish_reason:
+        events.append(StreamDone(finish_reason=finish_reason))
+    return tuple(events)
+
+
+def _dict_events(data: Any) -> ChunkEvents:
+    """Build the stream events for a chunk decoded to plain Python objects."""
+    try:
+        choice = data["choices"][0]
+    except (KeyError, IndexError, TypeError):
+        choice = None
+
+    content = None
+    finish_reason = None
+    if isinstance(choice, dict):
+        delta = choice.get("delta")
+        if isinstance(delta, dict):
+            content = delta.get("content")
+        finish_reason = choice.get("finish_reason")
+
+    usage = None
+    usage_data = data.get("usage") if isinstance(data, dict) else None
+    if isinstance(usage_data, dict):
+        usage = Usage(
+            prompt_tokens=usage_data.get("prompt_tokens"),
+            completion_tokens=usage_data.get("completion_tokens"),
+            total_tokens=usage_data.get("total_tokens"),
+        )
+
+    return _chunk_events(content, finish_reason, usage)
+
+
+def _decode_json(data: bytes) -> ChunkEvents:
+    try:
+        return _dict_events(json.loads(data.decode()))
+    except ValueError:
+        return _NO_EVENTS
+
+
+CHUNK_DECODERS: dict[str, ChunkDecoder] = {"json": _decode_json}
+
+if orjson is not None:
+
+    def _decode_orjson(data: bytes) -> ChunkEvents:
+        try:
+            return _dict_events(orjson.loads(data))
+        except orjson.JSONDecodeError:
+            return _NO_EVENTS
+
+    CHUNK_DECODERS["orjson"] = _decode_orjson
+
+if msgspec is not None:
+
+    class _Delta(msgspec.Struct, gc=False):
+        content: str | None = None
+
+    class _Choice(msgspec.Struct, gc=False):
+        delta: _Delta | None = None
+        finish_reason: str | None = None
+
+    class _Usage(msgspec.Struct, gc=False):
+        prompt_tokens: int | None = None
+        completion_tokens: int | None = None
+        total_tokens: int | None = None
+
+    class _Chunk(msgspec.Struct, gc=False):
+        choices: list[_Choice] = []
+        usage: _Usage | None = None
+
+    _chunk_decoder = msgspec.json.Decoder(_Chunk)
+
+    def _decode_msgspec(data: bytes) -> ChunkEvents:
+        try:
+            chunk = _chunk_decoder.decode(data)
+        except msgspec.ValidationError:
+            # Valid JSON that doesn't match the typed schema: take the slow path
+            return _dict_events(msgspec.json.decode(data))
+        except msgspec.DecodeError:
+            return _NO_EVENTS
+
+        content = None
+        finish_reason = None
+        if chunk.choices:
+            choice = chunk.choices[0]
+            if choice.delta is not None:
+                content = choice.delta.content
+            finish_reason = choice.finish_reason
+
+        usage = None
+        if chunk.usage is not None:
+            usage = Usage(
+                prompt_tokens=chunk.usage.prompt_tokens,
+                completion_tokens=chunk.usage.completion_tokens,
+                total_tokens=chunk.usage.total_tokens,
+            )
+
+        return _chunk_events(content, finish_reason, usage)
+
+    CHUNK_DECODERS["msgspec"] = _decode_msgspec
+
+# Fastest available backend: msgspec, then orjson, then the standard library
+JSON_BACKEND = next(
+    name for name in ("msgspec", "orjson", "json") if name in CHUNK_DECODERS
+)
+decode_chunk: ChunkDecoder = CHUNK_DECODERS[JSON_BACKEND]
+
+
+async def aiter_stream_events(
+    byte_stream: AsyncIterable[bytes], decode: ChunkDecoder = decode_chunk
+) -> AsyncIterator[ChatStreamEvent]:
+    """
+    Decode a streaming chat completion response body into stream events.
+
+    A chunk with a finish reason doesn't end the stream: OpenAI-compatible
+    servers asked for usage send it afterwards in a chunk with no choices,
+    so reading continues until the ``[DONE]`` sentinel or the end of the
+    body. Only usage is taken from chunks after the finish reason, and the
+    StreamDone is always the last event. Malformed chunks are skipped.
+
+    Args:
+        byte_stream: Raw response body chunks.
+        decode: Chunk decoder, defaulting to the fastest available backend.
+
+    Yields:
+        ChatStreamEvent objects (TokenDelta, StreamUsage, StreamDone).
+    """
+    decoder = SseDecoder()
+    done: StreamDone | None = None
+    async for raw in byte_stream:
+        for data in decoder.feed(raw):
+            if data == DONE:
+                yield done or StreamDone()
+                return
+            for event in decode(data):
+                if isinstance(event, StreamDone):
+                    done = done or event
+                elif done is None or isinstance(event, StreamUsage):
+                    yield event
+
+    # Some servers close the body without a blank line after the last event
+    for data in decoder.flush():
+        if data == DONE:
+            yield done or StreamDone()
+            return
+        for event in decode(data):
+            if isinstance(event, StreamDone):
+                done = done or event
+            elif done is None or isinstance(event, StreamUsage):
+                yield event
+    if done is not None:
+        yield done
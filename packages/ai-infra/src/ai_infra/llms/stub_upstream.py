@@ -0,0 +1,467 @@
+"""
+OpenAI-compatible stub upstream for offline load and latency testing.
+
+Serves ``POST /chat/completions`` (streaming and non-streaming) and
+``GET /models`` over plain HTTP/1.1 with keep-alive, using only asyncio, so
+benchmarks and tests can drive the real OpenAiLLMClient without a provider.
+Time to first token, token rate, jitter, errors, 429s and stalls are
+configurable.
+
+Usage:
+    uv run python -m ai_infra.llms.stub_upstream --port 8001 --ttft-s 0.2
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import math
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Any, Literal
+
+log = logging.getLogger("llms.stub_upstream")
+
+Jitter = Literal["none", "uniform", "normal", "lognormal"]
+
+_REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    429: "Too Many Requests",
+    500: "Internal Server Error",
+}
+
+
+@dataclass
+class StubUpstreamConfig:
+    """Behaviour of the stub upstream."""
+
+    host: str = "127.0.0.1"
+    port: int = 0
+    model: str = "stub-model"
+    ttft_s: float = 0.2
+    tokens_per_s: float = 50.0
+    completion_tokens: int = 64
+    jitter: Jitter = "none"
+    jitter_ratio: float = 0.0
+    error_rate: float = 0.0
+    error_status: int = 500
+    rate_limit_rate: float = 0.0
+    retry_after_s: float = 1.0
+    stall_rate: float = 0.0
+    stall_s: float = 30.0
+    include_usage: bool = True
+    seed: int | None = None
+
+
+@dataclass
+class StubUpstreamStats:
+    """Counters describing the traffic the stub upstream has served."""
+
+    requests: int = 0
+    active: int = 0
+    errors: int = 0
+    rate_limited: int = 0
+    stalled: int = 0
+    completion_tokens: int = 0
+    models: set[str] = field(default_factory=set)
+
+
+class StubUpstream:
+    """
+    In-process OpenAI-compatible server with injectable latency and faults.
+
+    Each request independently draws its fault from ``error_rate``,
+    ``rate_limit_rate`` and ``stall_rate``. Latencies are sampled around
+    their configured means from the ``jitter`` distribution, with spread
+    ``jitter_ratio`` relative to the mean. The completion is ``max_tokens``
+    (capped at ``completion_tokens``) tokens of the form `` tokN``, and
+    streams end with a finish chunk carrying usage, then ``data: [DONE]``.
+    """
+
+    def __init__(self, config: StubUpstreamConfig | None = None) -> None:
+        """
+        Initialize the stub upstream.
+
+        Args:
+            config: Stub behaviour; defaults to StubUpstreamConfig().
+        """
+        self.config = config or StubUpstreamConfig()
+        self.stats = StubUpstreamStats()
+        self._random = random.Random(self.config.seed)
+        self._server: asyncio.Server | None = None
+
+    @property
+    def url(self) -> str:
+        """Base URL to configure OpenAiLLMClient with."""
+        if self._server is None:
+            raise RuntimeError("StubUpstream is not running")
+        host, port = self._server.sockets[0].getsockname()[:2]
+        return f"http://{host}:{port}/v1"
+
+    async def start(self) -> None:
+        """Start listening; with port 0 an ephemeral port is chosen."""
+        self._server = await asyncio.start_server(
+            self._handle_connection, self.config.host, self.config.port
+        )
+
+    async def stop(self) -> None:
+        """Stop listening and drop open connections."""
+        if self._server is not None:
+            self._server.close()
+            self._server.close_clients()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def serve_forever(self) -> None:
+        """Start and serve until cancelled."""
+        await self.start()
+        assert self._server is not None
+        log.info("stub_upstream.listening", extra={"url": self.url})
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.stop()
+
+    async def __aenter__(self) -> StubUpstream:
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.stop()
+
+    def sample(self, mean_s: float) -> float:
+        """Sample a latency around mean_s from the configured jitter distribution."""
+        ratio = self.config.jitter_ratio
+        if mean_s <= 0 or ratio <= 0 or self.config.jitter == "none":
+            return max(mean_s, 0.0)
+        match self.config.jitter:
+            case "uniform":
+                return mean_s * self._random.uniform(1 - ratio, 1 + ratio)
+            case "normal":
+                return max(0.0, self._random.gauss(mean_s, mean_s * ratio))
+            case "lognormal":
+                # Parameterized so the distribution's mean stays at mean_s
+                sigma = ratio
+                mu = math.log(mean_s) - sigma * sigma / 2
+                return self._random.lognormvariate(mu, sigma)
+        return mean_s
+
+    async def _handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    return
+                method, path, headers = _parse_head(head)
+                length = int(headers.get("content-length", "0"))
+                body = await reader.readexactly(length) if length else b""
+
+                await self._dispatch(method, path, body, writer)
+                if headers.get("connection", "").lower() == "close":
+                    return
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def _dispatch(
+        self, method: str, path: str, body: bytes, writer: asyncio.StreamWriter
+    ) -> None:
+        path = path.split("?", 1)[0]
+        if method == "GET" and path.endswith("/models"):
+            await _write_json(
+                writer, 200, {"object": "list", "data": [{"id": self.config.model}]}
+            )
+        elif method == "POST" and path.endswith("/chat/completions"):
+            try:
+                payload = json.loads(body)
+            except ValueError:
+                await _write_json(writer, 400, _error("Invalid JSON body"))
+                return
+            await self._chat_completions(payload, writer)
+        else:
+            await _write_json(writer, 404, _error(f"No route for {method} {path}"))
+
+    async def _chat_completions(
+        self, payload: dict[str, Any], writer: asyncio.StreamWriter
+    ) -> None:
+        config = self.config
+        model = payload.get("model") or config.model
+        self.stats.requests += 1
+        self.stats.models.add(model)
+
+        roll = self._random.random()
+        if roll < config.rate_limit_rate:
+            self.stats.rate_limited += 1
+            await _write_json(
+                writer,
+                429,
+                _error("Rate limit exceeded"),
+                {"retry-after": f"{config.retry_after_s:g}"},
+            )
+            return
+        if roll < config.rate_limit_rate + config.error_rate:
+            self.stats.errors += 1
+            await _write_json(writer, config.error_status, _error("Injected failure"))
+            return
+
+        n_tokens = config.completion_tokens
+        if isinstance(payload.get("max_tokens"), int):
+            n_tokens = min(n_tokens, payload["max_tokens"])
+        # Stall at a random point, including before the first token
+        stall_at = (
+            self._random.randint(0, n_tokens)
+            if self._random.random() < config.stall_rate
+            else None
+        )
+        usage = {
+            "prompt_tokens": _count_prompt_tokens(payload.get("messages")),
+            "completion_tokens": n_tokens,
+        }
+        usage["total_tokens"] = usage["prompt_tokens"] + n_tokens
+
+        self.stats.active += 1
+        try:
+            if payload.get("stream"):
+                # Like OpenAI, streams only report usage when asked to
+                stream_options = payload.get("stream_options") or {}
+                await self._stream(
+                    model,
+                    n_tokens,
+                    stall_at,
+                    usage if stream_options.get("include_usage") else None,
+                    writer,
+                )
+            else:
+                await self._complete(model, n_tokens, stall_at, usage, writer)
+        finally:
+            self.stats.active -= 1
+
+    async def _stream(
+        self,
+        model: str,
+        n_tokens: int,
+        stall_at: int | None,
+        usage: dict[str, int] | None,
+        writer: asyncio.StreamWriter,
+    ) -> None:
+        writer.write(
+            _status_line(200)
+            + b"content-type: text/event-stream\r\n"
+            + b"cache-control: no-cache\r\n"
+            + b"transfer-encoding: chunked\r\n\r\n"
+        )
+        await writer.drain()
+
+        completion_id = f"chatcmpl-stub{self.stats.requests}"
+        created = int(time.time())
+        # Tokens are scheduled against the clock so delays don't accumulate
+        # write overhead; a slow reader simply receives a burst
+        loop = asyncio.get_running_loop()
+        due = loop.time() + self.sample(self.config.ttft_s)
+        interval = 1 / self.config.tokens_per_s if self.config.tokens_per_s > 0 else 0
+        for i in range(n_tokens):
+            if i == stall_at:
+                await self._stall()
+            await _sleep_until(loop, due)
+            chunk = _chunk(completion_id, created, model, {"content": f" tok{i}"})
+            await _write_chunk(writer, _sse(chunk))
+            self.stats.completion_tokens += 1
+            due += self.sample(interval)
+        if stall_at == n_tokens:
+            await self._stall()
+
+        final = _chunk(completion_id, created, model, {}, finish_reason="stop")
+        await _write_chunk(writer, _sse(final))
+        # Usage follows the finish chunk in a chunk of its own, with no choices
+        if usage is not None and self.config.include_usage:
+            usage_chunk = _chunk(completion_id, created, model)
+            usage_chunk["choices"] = []
+            usage_chunk["usage"] = usage
+            await _write_chunk(writer, _sse(usage_chunk))
+        await _write_chunk(writer, b"data: [DONE]\n\n")
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
+
+    async def _complete(
+        self,
+        model: str,
+        n_tokens: int,
+        stall_at: int | None,
+        usage: dict[str, int],
+        writer: asyncio.StreamWriter,
+    ) -> None:
+        interval = 1 / self.config.tokens_per_s if self.config.tokens_per_s > 0 else 0
+        delay = self.sample(self.config.ttft_s) + sum(
+            self.sample(interval) for _ in range(max(n_tokens - 1, 0))
+        )
+        if stall_at is not None:
+            await self._stall()
+        await asyncio.sleep(delay)
+        self.stats.completion_tokens += n_tokens
+
+        response: dict[str, Any] = {
+            "id": f"chatcmpl-stub{self.stats.requests}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [
+                {
+                    "index": 0,
+                    "message": {
+                        "role": "assistant",
+                        "content": "".join(f" tok{i}" for i in range(n_tokens)),
+                    },
+                    "finish_reason": "stop",
+                }
+            ],
+        }
+        if self.config.include_usage:
+            response["usage"] = usage
+        await _write_json(writer, 200, response)
+
+    async def _stall(self) -> None:
+        self.stats.stalled += 1
+        await asyncio.sleep(self.config.stall_s)
+
+
+def _parse_head(head: bytes) -> tuple[str, str, dict[str, str]]:
+    lines = head.decode("latin-1").split("\r\n")
+    method, path, _ = lines[0].split(" ", 2)
+    headers = {}
+    for line in lines[1:]:
+        if ":" in line:
+            name, value = line.split(":", 1)
+            headers[name.strip().lower()] = value.strip()
+    return method, path, headers
+
+
+def _count_prompt_tokens(messages: Any) -> int:
+    """Approximate prompt tokens as whitespace-separated words."""
+    if not isinstance(messages, list):
+        return 0
+    return sum(
+        len(str(message.get("content") or "").split())
+        for message in messages
+        if isinstance(message, dict)
+    )
+
+
+def _chunk(
+    completion_id: str,
+    created: int,
+    model: str,
+    delta: dict[str, Any] | None = None,
+    finish_reason: str | None = None,
+) -> dict[str, Any]:
+    return {
+        "id": completion_id,
+        "object": "chat.completion.chunk",
+        "created": created,
+        "model": model,
+        "choices": [{"index": 0, "delta": delta or {}, "finish_reason": finish_reason}],
+    }
+
+
+def _error(message: str) -> dict[str, Any]:
+    return {"error": {"message": message, "type": "stub_error"}}
+
+
+def _sse(data: dict[str, Any]) -> bytes:
+    return b"data: " + json.dumps(data, separators=(",", ":")).encode() + b"\n\n"
+
+
+def _status_line(status: int) -> bytes:
+    return f"HTTP/1.1 {status} {_REASONS.get(status, 'Error')}\r\n".encode()
+
+
+async def _write_chunk(writer: asyncio.StreamWriter, data: bytes) -> None:
+    writer.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+    await writer.drain()
+
+
+async def _write_json(
+    writer: asyncio.StreamWriter,
+    status: int,
+    body: dict[str, Any],
+    headers: dict[str, str] | None = None,
+) -> None:
+    data = json.dumps(body).encode()
+    head = _status_line(status) + b"content-type: application/json\r\n"
+    for name, value in (headers or {}).items():
+        head += f"{name}: {value}\r\n".encode()
+    writer.write(head + f"content-length: {len(data)}\r\n\r\n".encode() + data)
+    await writer.drain()
+
+
+async def _sleep_until(loop: asyncio.AbstractEventLoop, deadline: float) -> None:
+    delay = deadline - loop.time()
+    if delay > 0:
+        await asyncio.sleep(delay)
+
+
+def main() -> None:
+    """Run the stub upstream from the command line."""
+    defaults = StubUpstreamConfig()
+    parser = argparse.ArgumentParser(
+        description="OpenAI-compatible stub upstream for load and latency testing."
+    )
+    parser.add_argument("--host", default=defaults.host)
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--model", default=defaults.model)
+    parser.add_argument("--ttft-s", type=float, default=defaults.ttft_s)
+    parser.add_argument("--tokens-per-s", type=float, default=defaults.tokens_per_s)
+    parser.add_argument(
+        "--completion-tokens", type=int, default=defaults.completion_tokens
+    )
+    parser.add_argument(
+        "--jitter", choices=["none", "uniform", "normal", "lognormal"], default="none"
+    )
+    parser.add_argument("--jitter-ratio", type=float, default=defaults.jitter_ratio)
+    parser.add_argument("--error-rate", type=float, default=defaults.error_rate)
+    parser.add_argument("--error-status", type=int, default=defaults.error_status)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--retry-after-s", type=float, default=defaults.retry_after_s)
+    parser.add_argument("--stall-rate", type=float, default=defaults.stall_rate)
+    parser.add_argument("--stall-s", type=float, default=defaults.stall_s)
+    parser.add_argument("--no-usage", action="store_true")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    config = StubUpstreamConfig(
+        host=args.host,
+        port=args.port,
+        model=args.model,
+        ttft_s=args.ttft_s,
+        tokens_per_s=args.tokens_per_s,
+        completion_tokens=args.completion_tokens,
+        jitter=args.jitter,
+        jitter_ratio=args.jitter_ratio,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        rate_limit_rate=args.rate_limit_rate,
+        retry_after_s=args.retry_after_s,
+        stall_rate=args.stall_rate,
+        stall_s=args.stall_s,
+        include_usage=not args.no_usage,
+        seed=args.seed,
+    )
+    logging.basicConfig(level=logging.INFO)
+    stub = StubUpstream(config)
+    print(f"Stub upstream listening on http://{config.host}:{config.port}/v1")
+    try:
+        asyncio.run(stub.serve_forever())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,11 @@
+"""In-memory profile repositories for tests, benchmarks and local runs."""
+
+from ai_infra.memory.repositories import (
+    InMemoryGraphProfileRepository,
+    InMemoryModelProfileRepository,
+)
+
+__all__ = [
+    "InMemoryGraphProfileRepository",
+    "InMemoryModelProfileRepository",
+]
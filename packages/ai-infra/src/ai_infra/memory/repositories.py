@@ -0,0 +1,53 @@
+"""Dict-backed implementations of the async profile repositories."""
+
+from collections.abc import Iterable
+from typing import Optional
+from uuid import UUID
+
+from ai_core.models import GraphProfile, ModelProfile
+from ai_core.repositories import (
+    AsyncGraphProfileRepository,
+    AsyncModelProfileRepository,
+)
+
+
+class InMemoryGraphProfileRepository(AsyncGraphProfileRepository):
+    """Graph profile repository holding a fixed set of profiles in memory."""
+
+    def __init__(self, profiles: Iterable[GraphProfile] = ()) -> None:
+        self._profiles = {profile.id: profile for profile in profiles}
+
+    def add(self, profile: GraphProfile) -> None:
+        """Add or replace a graph profile."""
+        self._profiles[profile.id] = profile
+
+    async def get_by_id(self, id: UUID) -> Optional[GraphProfile]:
+        """Retrieve a graph profile by its ID."""
+        return self._profiles.get(id)
+
+    async def get_all(self) -> list[GraphProfile]:
+        """Retrieve all graph profiles."""
+        return list(self._profiles.values())
+
+
+class InMemoryModelProfileRepository(AsyncModelProfileRepository):
+    """Model profile repository holding a fixed set of profiles in memory."""
+
+    def __init__(self, profiles: Iterable[ModelProfile] = ()) -> None:
+        self._profiles = {profile.id: profile for profile in profiles}
+
+    def add(self, profile: ModelProfile) -> None:
+        """Add or replace a model profile."""
+        self._profiles[profile.id] = profile
+
+    async def get_by_id(self, id: UUID) -> Optional[ModelProfile]:
+        """Retrieve a model profile by its ID."""
+        return self._profiles.get(id)
+
+    async def get_by_ids(self, ids: Iterable[UUID]) -> dict[UUID, ModelProfile]:
+        """Retrieve model profiles by their IDs, omitting unknown IDs."""
+        return {id: self._profiles[id] for id in ids if id in self._profiles}
+
+    async def get_all(self) -> list[ModelProfile]:
+        """Retrieve all model profiles."""
+        return list(self._profiles.values())
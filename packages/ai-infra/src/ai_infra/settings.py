@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic import HttpUrl, PostgresDsn
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -11,10 +13,114 @@ class Settings(BaseSettings):
 
     http_port: int
     grpc_port: int
+    # Merge ChatTurn token deltas into fewer messages; clients can override
+    # per call with the x-aisp-coalesce metadata key
+    grpc_coalesce_tokens: bool = True
+    grpc_coalesce_max_bytes: int = 256
+    grpc_coalesce_interval_s: float = 0.02
+    # Events read ahead of a slow client before the upstream stops being read
+    grpc_coalesce_max_pending: int = 64
     ai_api_key: str
     ai_base_url: str
+    ai_http2: bool = False
+    ai_max_connections: int = 100
+    ai_max_keepalive_connections: int = 20
+    ai_keepalive_expiry_s: float = 30.0
+    ai_timeout_s: float = 60.0
+    ai_connect_timeout_s: float | None = None
+    ai_read_timeout_s: float | None = None
+    ai_write_timeout_s: float | None = None
+    ai_pool_timeout_s: float | None = None
+
+    # Upstream load balancing; ai_base_url is used when no replicas are listed
+    ai_upstream_urls: list[str] = []
+    ai_lb_strategy: Literal["least_outstanding", "ewma_ttft"] = "least_outstanding"
+    ai_lb_session_affinity: bool = False
+    ai_lb_eject_after_failures: int = 3
+    ai_lb_ejection_s: float = 30.0
+    # Hedge streams whose first token is late; off unless a delay or percentile is set
+    ai_lb_hedge_delay_s: float | None = None
+    ai_lb_hedge_percentile: float | None = None
+
+    # Adaptive concurrency limit and circuit breaker per endpoint and model.
+    # The limit starts at the connection pool size (ai_max_connections)
+    # unless ai_limit_initial is set, so it only ever throttles below what
+    # the pool would allow once the upstream has pushed back
+    ai_resilience_enabled: bool = True
+    ai_limit_initial: int | None = None
+    ai_limit_min: int = 1
+    ai_limit_max: int = 256
+    ai_limit_ttft_threshold_s: float | None = None
+    ai_breaker_failure_threshold: int = 5
+    ai_breaker_reset_timeout_s: float = 30.0
+
     pg_dsn: PostgresDsn
+    pg_pool_size: int = 5
+    pg_max_overflow: int = 10
+    pg_pool_pre_ping: bool = True
+    pg_pool_recycle_s: int = 1800
+    pg_pool_timeout_s: float = 30.0
     log_level: str = "INFO"
+    # Format and write logs on a listener thread, dropping records when the
+    # bounded queue is full instead of blocking the event loop
+    log_async: bool = False
+    log_queue_size: int = 10000
+    # Fraction of info/debug records to keep per logger (and its children),
+    # e.g. {"http": 0.1, "sql_alchemy.repositories": 0.01}
+    log_sample_rates: dict[str, float] = {}
     enable_tracing: bool = False
     service_name: str = "ai-orchestrator"
     otel_exporter_otlp_endpoint: HttpUrl | None = None
+    # Prometheus /metrics endpoint on the HTTP port
+    enable_metrics: bool = True
+    event_loop_lag_interval_s: float = 0.1
+    # Blocks of the event loop longer than this are logged with the stack of
+    # the blocking code; None turns the watchdog thread off
+    event_loop_slow_callback_ms: float | None = 100.0
+    # Bearer token for the /admin endpoints (profiling); unset disables them
+    admin_token: str | None = None
+
+    # Startup warm-up
+    warmup_enabled: bool = True
+    warmup_llm_connections: int = 1
+    warmup_synthetic_turn: bool = False
+    warmup_retry_delay_s: float = 5.0
+
+    # Exact-match LLM response cache (used by model profiles that opt in)
+    llm_cache_enabled: bool = True
+    llm_cache_max_entries: int = 1024
+    llm_cache_ttl_s: float = 3600.0
+    llm_cache_max_entry_bytes: int = 256 * 1024
+    llm_cache_persistent: bool = False
+    # Time between deletions of expired rows from the persistent tier
+    llm_cache_purge_interval_s: float = 600.0
+
+    # Prompt tokens of conversation history sent with each turn; the oldest
+    # turns are trimmed in steps of history_trim_step_tokens (default: half
+    # the budget) so the prompt prefix stays cacheable. None disables trimming
+    history_max_tokens: int | None = 8192
+    history_trim_step_tokens: int | None = None
+
+    # Tokenizers for prompt token counting, loaded from
+    # <tokenizer_dir>/<family>/tokenizer.json (needs the tokenizers package).
+    # tokenizer_families maps model name prefixes to family names; other
+    # models are estimated at token_chars_per_token characters per token
+    tokenizer_dir: str | None = None
+    tokenizer_families: dict[str, str] = {}
+    token_chars_per_token: float = 4.0
+    token_count_cache_size: int = 8192
+
+    # Completion tokens one chat turn may generate across all of its LLM
+    # calls; None leaves turns bounded only by their profiles' max_tokens
+    turn_token_budget: int | None = None
+
+    # Coalescing of identical in-flight deterministic requests
+    llm_single_flight_enabled: bool = True
+    llm_single_flight_max_lag: int = 1024
+
+    # Profile cache
+    profile_cache_enabled: bool = True
+    profile_cache_max_size: int = 1024
+    profile_cache_ttl_s: float = 300.0
+    profile_cache_negative_ttl_s: float = 5.0
+    profile_cache_listen: bool = True
@@ -0,0 +1,106 @@
+"""Postgres LISTEN/NOTIFY based invalidation for cached profiles."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+from typing import Protocol
+from uuid import UUID
+
+import psycopg
+from sqlalchemy.engine import make_url
+
+log = logging.getLogger("sql_alchemy.notifications")
+
+# Channel written to by the notify_profile_change() trigger function
+PROFILE_CHANGE_CHANNEL = "profile_change"
+
+
+class CacheInvalidator(Protocol):
+    def invalidate(self, id: UUID) -> None:
+        """Drop a single cached entry."""
+        ...
+
+    def invalidate_all(self) -> None:
+        """Drop every cached entry."""
+        ...
+
+
+class ProfileChangeListener:
+    """
+    Listens for profile change notifications and invalidates cached profiles.
+
+    Each notification payload is a JSON object with ``table``, ``op`` and ``id``
+    keys, as emitted by the triggers on the profile tables. Whenever the
+    listening connection is (re)established every target is cleared, since
+    notifications sent while disconnected are lost.
+    """
+
+    def __init__(
+        self,
+        dsn: str,
+        targets: dict[str, CacheInvalidator],
+        reconnect_delay_s: float = 5.0,
+    ) -> None:
+        """
+        Initialize the listener.
+
+        Args:
+            dsn: SQLAlchemy-style Postgres DSN (e.g. ``postgresql+psycopg://...``).
+            targets: Mapping of table name to the cache invalidated on changes to it.
+            reconnect_delay_s: Delay before reconnecting after a connection failure.
+        """
+        # psycopg does not understand the SQLAlchemy "+driver" suffix
+        self._conninfo = (
+            make_url(dsn)
+            .set(drivername="postgresql")
+            .render_as_string(hide_password=False)
+        )
+        self._targets = targets
+        self._reconnect_delay_s = reconnect_delay_s
+
+    async def run(self) -> None:
+        """Listen for notifications until cancelled, reconnecting on failure."""
+        while True:
+            try:
+                await self._listen()
+            except (psycopg.Error, OSError) as e:
+                log.warning(
+                    "profile_change_listener.disconnected", extra={"error": str(e)}
+                )
+            await asyncio.sleep(self._reconnect_delay_s)
+
+    async def _listen(self) -> None:
+        async with await psycopg.AsyncConnection.connect(
+            self._conninfo, autocommit=True
+        ) as conn:
+            await conn.execute(f"LISTEN {PROFILE_CHANGE_CHANNEL}")
+            log.info("profile_change_listener.listening")
+
+            # Anything may have changed while we were not listening
+            for target in self._targets.values():
+                target.invalidate_all()
+
+            async for notify in conn.notifies():
+                self.handle_payload(notify.payload)
+
+    def handle_payload(self, payload: str) -> None:
+        """
+        Apply a single notification payload.
+
+        Args:
+            payload: JSON payload of the notification.
+        """
+        try:
+            data = json.loads(payload)
+            target = self._targets.get(data["table"])
+            id = UUID(data["id"])
+        except (ValueError, KeyError, TypeError):
+            log.warning(
+                "profile_change_listener.bad_payload", extra={"payload": payload}
+            )
+            return
+
+        if target is not None:
+            target.invalidate(id)
@@ -2,7 +2,8 @@ from __future__ import annotations
 from datetime import datetime
 from uuid import UUID
 
-from sqlalchemy import Boolean, DateTime, Float, Integer, String, Text
+from sqlalchemy import Boolean, DateTime, Float, Integer, String, Text, false
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 
 from ai_core.models import GraphProfile, ModelProfile
@@ -71,6 +72,9 @@ class ModelProfileOrm(Base):
     temperature: Mapped[float | None] = mapped_column(Float, nullable=True)
     top_p: Mapped[float | None] = mapped_column(Float, nullable=True)
     max_tokens: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    response_cache_enabled: Mapped[bool] = mapped_column(
+        Boolean, nullable=False, server_default=false()
+    )
 
     def to_domain(self) -> ModelProfile:
         return ModelProfile(
@@ -84,6 +88,7 @@ class ModelProfileOrm(Base):
             temperature=self.temperature,
             top_p=self.top_p,
             max_tokens=self.max_tokens,
+            response_cache_enabled=self.response_cache_enabled,
         )
 
     @staticmethod
@@ -99,4 +104,19 @@ class ModelProfileOrm(Base):
             temperature=model_profile.temperature,
             top_p=model_profile.top_p,
             max_tokens=model_profile.max_tokens,
+            response_cache_enabled=model_profile.response_cache_enabled,
         )
+
+
+class LlmResponseCacheOrm(Base):
+    __tablename__ = "llm_response_cache"
+
+    key: Mapped[str] = mapped_column(String(64), primary_key=True)
+    value: Mapped[dict] = mapped_column(JSONB, nullable=False)
+    size_bytes: Mapped[int] = mapped_column(Integer, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False
+    )
+    expires_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, index=True
+    )
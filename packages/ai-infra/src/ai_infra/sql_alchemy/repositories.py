@@ -1,17 +1,44 @@
 import logging
+import time
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
 from typing import Optional
 from uuid import UUID
 
-from opentelemetry import trace
+from opentelemetry import metrics, trace
 from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 from sqlalchemy.orm import Session
 
 from ai_core.models import GraphProfile, ModelProfile
-from ai_core.repositories import GraphProfileRepository, ModelProfileRepository
+from ai_core.repositories import (
+    AsyncGraphProfileRepository,
+    AsyncModelProfileRepository,
+    GraphProfileRepository,
+    ModelProfileRepository,
+)
 from .orm import GraphProfileOrm, ModelProfileOrm
 
 log = logging.getLogger("sql_alchemy.repositories")
 tracer = trace.get_tracer("sql_alchemy.repositories")
+meter = metrics.get_meter("sql_alchemy.repositories")
+
+_lookup_time = meter.create_histogram(
+    "db.lookup_time",
+    unit="s",
+    description="Time spent on profile repository lookups, by operation",
+)
+
+
+@contextmanager
+def _lookup(operation: str) -> Iterator[None]:
+    """Trace a repository lookup and record how long it took."""
+    start = time.perf_counter()
+    try:
+        with tracer.start_as_current_span(operation):
+            yield
+    finally:
+        _lookup_time.record(time.perf_counter() - start, {"operation": operation})
 
 
 class SqlAlchemyGraphProfileRepository(GraphProfileRepository):
@@ -52,6 +79,19 @@ class SqlAlchemyModelProfileRepository(ModelProfileRepository):
                 return orm.to_domain()
             return None
 
+    def get_by_ids(self, ids: Iterable[UUID]) -> dict[UUID, ModelProfile]:
+        """Retrieve model profiles by ID with a single query."""
+        with tracer.start_as_current_span("model_profile_repository.get_by_ids"):
+            id_list = list(set(ids))
+            log.debug(
+                "model_profile_repository.get_by_ids", extra={"count": len(id_list)}
+            )
+            if not id_list:
+                return {}
+            stmt = select(ModelProfileOrm).where(ModelProfileOrm.id.in_(id_list))
+            orms = self._session.scalars(stmt).all()
+            return {orm.id: orm.to_domain() for orm in orms}
+
     def get_all(self) -> list[ModelProfile]:
         """Retrieve all model profiles."""
         with tracer.start_as_current_span("model_profile_repository.get_all"):
@@ -60,3 +100,83 @@ class SqlAlchemyModelProfileRepository(ModelProfileRepository):
             count = len(orms)
             log.debug("model_profile_repository.get_all", extra={"count": count})
             return [orm.to_domain() for orm in orms]
+
+
+class AsyncSqlAlchemyGraphProfileRepository(AsyncGraphProfileRepository):
+    """
+    Async graph profile repository.
+
+    Every call runs in its own short-lived session taken from the session
+    factory, so concurrent requests never share an AsyncSession.
+    """
+
+    def __init__(self, session_factory: async_sessionmaker[AsyncSession]):
+        self._session_factory = session_factory
+
+    async def get_by_id(self, id: UUID) -> Optional[GraphProfile]:
+        with _lookup("graph_profile_repository.get_by_id"):
+            log.debug(
+                "graph_profile_repository.get_by_id", extra={"graph_profile_id": id}
+            )
+            async with self._session_factory() as session:
+                orm = await session.get(GraphProfileOrm, id)
+                if orm:
+                    return orm.to_domain()
+                return None
+
+    async def get_all(self) -> list[GraphProfile]:
+        """Retrieve all graph profiles."""
+        with _lookup("graph_profile_repository.get_all"):
+            stmt = select(GraphProfileOrm)
+            async with self._session_factory() as session:
+                orms = (await session.scalars(stmt)).all()
+            count = len(orms)
+            log.debug("graph_profile_repository.get_all", extra={"count": count})
+            return [orm.to_domain() for orm in orms]
+
+
+class AsyncSqlAlchemyModelProfileRepository(AsyncModelProfileRepository):
+    """
+    Async model profile repository.
+
+    Every call runs in its own short-lived session taken from the session
+    factory, so concurrent requests never share an AsyncSession.
+    """
+
+    def __init__(self, session_factory: async_sessionmaker[AsyncSession]):
+        self._session_factory = session_factory
+
+    async def get_by_id(self, id: UUID) -> Optional[ModelProfile]:
+        with _lookup("model_profile_repository.get_by_id"):
+            log.debug(
+                "model_profile_repository.get_by_id", extra={"model_profile_id": id}
+            )
+            async with self._session_factory() as session:
+                orm = await session.get(ModelProfileOrm, id)
+                if orm:
+                    return orm.to_domain()
+                return None
+
+    async def get_by_ids(self, ids: Iterable[UUID]) -> dict[UUID, ModelProfile]:
+        """Retrieve model profiles by ID with a single query."""
+        with _lookup("model_profile_repository.get_by_ids"):
+            id_list = list(set(ids))
+            log.debug(
+                "model_profile_repository.get_by_ids", extra={"count": len(id_list)}
+            )
+            if not id_list:
+                return {}
+            stmt = select(ModelProfileOrm).where(ModelProfileOrm.id.in_(id_list))
+            async with self._session_factory() as session:
+                orms = (await session.scalars(stmt)).all()
+            return {orm.id: orm.to_domain() for orm in orms}
+
+    async def get_all(self) -> list[ModelProfile]:
+        """Retrieve all model profiles."""
+        with _lookup("model_profile_repository.get_all"):
+            stmt = select(ModelProfileOrm)
+            async with self._session_factory() as session:
+                orms = (await session.scalars(stmt)).all()
+            count = len(orms)
+            log.debug("model_profile_repository.get_all", extra={"count": count})
+            return [orm.to_domain() for orm in orms]
@@ -0,0 +1,90 @@
+"""Postgres tier for the LLM response cache."""
+
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any, cast
+
+from opentelemetry import trace
+from sqlalchemy import CursorResult, delete, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from ai_infra.llms.response_cache import CachedCompletion, ResponseCacheStore
+from .orm import LlmResponseCacheOrm
+
+log = logging.getLogger("sql_alchemy.response_cache")
+tracer = trace.get_tracer("sql_alchemy.response_cache")
+
+
+class SqlAlchemyResponseCacheStore(ResponseCacheStore):
+    """
+    Response cache tier stored in the llm_response_cache table.
+
+    Entries are shared by every orchestrator replica. Expired rows are never
+    returned, and are deleted by purge_expired(), which run_purge() calls
+    periodically.
+    """
+
+    def __init__(self, session_factory: async_sessionmaker[AsyncSession]):
+        self._session_factory = session_factory
+
+    async def get(self, key: str) -> CachedCompletion | None:
+        with tracer.start_as_current_span("response_cache_store.get"):
+            stmt = select(LlmResponseCacheOrm.value).where(
+                LlmResponseCacheOrm.key == key,
+                LlmResponseCacheOrm.expires_at > datetime.now(timezone.utc),
+            )
+            async with self._session_factory() as session:
+                value = await session.scalar(stmt)
+            if value is None:
+                return None
+            return CachedCompletion.from_json(value)
+
+    async def set(self, key: str, value: CachedCompletion, ttl_s: float) -> None:
+        with tracer.start_as_current_span("response_cache_store.set"):
+            now = datetime.now(timezone.utc)
+            row = {
+                "key": key,
+                "value": value.to_json(),
+                "size_bytes": value.size_bytes,
+                "created_at": now,
+                "expires_at": now + timedelta(seconds=ttl_s),
+            }
+            stmt = insert(LlmResponseCacheOrm).values(**row)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[LlmResponseCacheOrm.key],
+                set_={name: stmt.excluded[name] for name in row if name != "key"},
+            )
+            async with self._session_factory() as session:
+                await session.execute(stmt)
+                await session.commit()
+
+    async def purge_expired(self) -> int:
+        """Delete expired entries, returning how many were removed."""
+        with tracer.start_as_current_span("response_cache_store.purge_expired"):
+            stmt = delete(LlmResponseCacheOrm).where(
+                LlmResponseCacheOrm.expires_at <= datetime.now(timezone.utc)
+            )
+            async with self._session_factory() as session:
+                result = cast(CursorResult[Any], await session.execute(stmt))
+                await session.commit()
+            count = result.rowcount
+            log.debug("response_cache_store.purge_expired", extra={"count": count})
+            return count
+
+    async def run_purge(self, interval_s: float) -> None:
+        """
+        Delete expired entries every interval_s seconds until cancelled.
+
+        Args:
+            interval_s: Time between purges, in seconds.
+        """
+        while True:
+            await asyncio.sleep(interval_s)
+            try:
+                await self.purge_expired()
+            except Exception as e:
+                log.warning(
+                    "response_cache_store.purge_failed", extra={"error": str(e)}
+                )
@@ -0,0 +1,296 @@
+import asyncio
+from collections.abc import AsyncIterator
+
+import httpx
+import pytest
+
+from ai_core.exceptions import UpstreamOverloadedError, UpstreamUnavailableError
+from ai_core.orchestration.services.llm_service import (
+    ChatRequest,
+    ChatResponse,
+    ChatStreamEvent,
+    StreamDone,
+    TokenDelta,
+)
+from ai_infra.llms.balancer import BalancingLLMClient
+from ai_infra.llms.resilience import (
+    AimdLimiter,
+    CircuitBreaker,
+    ResilientLLMClient,
+    UpstreamGuard,
+)
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeLLMClient:
+    def __init__(
+        self,
+        clock: FakeClock,
+        ttft_s: float = 0.0,
+        error: Exception | None = None,
+        delay_s: float = 0.0,
+        text: str = "ok",
+    ) -> None:
+        self.clock = clock
+        self.ttft_s = ttft_s
+        self.error = error
+        self.delay_s = delay_s
+        self.text = text
+        self.calls = 0
+        self.closed = 0
+
+    async def chat(self, request: ChatRequest) -> ChatResponse:
+        self.calls += 1
+        if self.error is not None:
+            raise self.error
+        return ChatResponse(text="ok")
+
+    async def stream_chat(self, request: ChatRequest) -> AsyncIterator[ChatStreamEvent]:
+        self.calls += 1
+        try:
+            await asyncio.sleep(self.delay_s)
+            if self.error is not None:
+                raise self.error
+            self.clock.now += self.ttft_s
+            yield TokenDelta(text=self.text)
+            yield StreamDone(finish_reason="stop")
+        finally:
+            self.closed += 1
+
+    async def warm_up(self) -> None:
+        pass
+
+    async def aclose(self) -> None:
+        pass
+
+
+def make_request(affinity_key: str | None = None) -> ChatRequest:
+    return ChatRequest(model="test-model", messages=[], affinity_key=affinity_key)
+
+
+async def drain(client: BalancingLLMClient, request: ChatRequest) -> None:
+    async for _ in client.stream_chat(request):
+        pass
+
+
+def test_least_outstanding_prefers_idle_endpoint():
+    clock = FakeClock()
+    balancer = BalancingLLMClient(
+        {"a": FakeLLMClient(clock), "b": FakeLLMClient(clock)}, clock=clock
+    )
+    balancer.endpoints[0].outstanding = 2
+
+    assert balancer.select(make_request()).name == "b"
+
+
+@pytest.mark.asyncio
+async def test_ewma_ttft_prefers_faster_endpoint():
+    clock = FakeClock()
+    slow = FakeLLMClient(clock, ttft_s=2.0)
+    fast = FakeLLMClient(clock, ttft_s=0.1)
+    balancer = BalancingLLMClient(
+        {"slow": slow, "fast": fast}, strategy="ewma_ttft", clock=clock
+    )
+
+    # Unmeasured endpoints are probed first
+    await drain(balancer, make_request())
+    await drain(balancer, make_request())
+    assert (slow.calls, fast.calls) == (1, 1)
+
+    for _ in range(5):
+        await drain(balancer, make_request())
+    assert (slow.calls, fast.calls) == (1, 6)
+
+
+@pytest.mark.asyncio
+async def test_session_affinity_sticks_to_one_endpoint():
+    clock = FakeClock()
+    clients = {name: FakeLLMClient(clock) for name in ("a", "b", "c")}
+    balancer = BalancingLLMClient(clients, session_affinity=True, clock=clock)
+
+    for _ in range(5):
+        await drain(balancer, make_request(affinity_key="session-1"))
+    assert sorted(client.calls for client in clients.values()) == [0, 0, 5]
+
+
+@pytest.mark.asyncio
+async def test_failing_endpoint_is_ejected_and_readmitted():
+    clock = FakeClock()
+    broken = FakeLLMClient(clock, error=httpx.ConnectError("refused"))
+    balancer = BalancingLLMClient(
+        {"broken": broken, "ok": FakeLLMClient(clock)},
+        session_affinity=True,
+        eject_after_failures=2,
+        ejection_s=10.0,
+        clock=clock,
+    )
+    sessions = [f"session-{i}" for i in range(20)]
+    routes = {key: balancer.select(make_request(key)).name for key in sessions}
+    broken_session = next(key for key, name in routes.items() if name == "broken")
+
+    for _ in range(2):
+        with pytest.raises(httpx.ConnectError):
+            await drain(balancer, make_request(broken_session))
+
+    # Affinity falls through to the next endpoint on the ring while ejected
+    assert {balancer.select(make_request(key)).name for key in sessions} == {"ok"}
+
+    clock.now = 10.0
+    assert {key: balancer.select(make_request(key)).name for key in sessions} == routes
+
+
+@pytest.mark.asyncio
+async def test_all_endpoints_ejected_still_serves():
+    clock = FakeClock()
+    balancer = BalancingLLMClient(
+        {"a": FakeLLMClient(clock, error=httpx.ReadTimeout("timeout"))},
+        eject_after_failures=1,
+        clock=clock,
+    )
+
+    with pytest.raises(httpx.ReadTimeout):
+        await balancer.chat(make_request())
+
+    assert balancer.endpoints[0].ejected_until == 30.0
+    assert balancer.select(make_request()).name == "a"
+
+
+@pytest.mark.asyncio
+async def test_client_errors_do_not_eject():
+    clock = FakeClock()
+    request = httpx.Request("POST", "http://upstream/chat/completions")
+    error = httpx.HTTPStatusError(
+        "bad request", request=request, response=httpx.Response(400, request=request)
+    )
+    balancer = BalancingLLMClient(
+        {"a": FakeLLMClient(clock, error=error)}, eject_after_failures=1, clock=clock
+    )
+
+    with pytest.raises(httpx.HTTPStatusError):
+        await balancer.chat(make_request())
+    assert balancer.endpoints[0].ejected_until == 0.0
+
+
+@pytest.mark.asyncio
+async def test_hedge_fires_and_cancels_slow_primary():
+    clock = FakeClock()
+    slow = FakeLLMClient(clock, delay_s=5.0, text="slow")
+    fast = FakeLLMClient(clock, text="fast")
+    balancer = BalancingLLMClient(
+        {"slow": slow, "fast": fast}, hedge_delay_s=0.01, clock=clock
+    )
+    # Make the slow endpoint the primary choice
+    balancer.endpoints[1].outstanding = 1
+
+    events = [event async for event in balancer.stream_chat(make_request())]
+
+    assert events == [TokenDelta(text="fast"), StreamDone(finish_reason="stop")]
+    assert (slow.calls, fast.calls) == (1, 1)
+    assert (slow.closed, fast.closed) == (1, 1)
+    assert [e.outstanding for e in balancer.endpoints] == [0, 1]
+
+
+@pytest.mark.asyncio
+async def test_no_hedge_when_first_token_is_on_time():
+    clock = FakeClock()
+    clients = {"a": FakeLLMClient(clock), "b": FakeLLMClient(clock)}
+    balancer = BalancingLLMClient(clients, hedge_delay_s=1.0, clock=clock)
+
+    await drain(balancer, make_request())
+
+    assert sum(client.calls for client in clients.values()) == 1
+
+
+@pytest.mark.asyncio
+async def test_hedge_survives_primary_failing_after_the_delay():
+    clock = FakeClock()
+    broken = FakeLLMClient(clock, error=httpx.ConnectError("refused"), delay_s=0.05)
+    slow = FakeLLMClient(clock, delay_s=0.1, text="slow")
+    balancer = BalancingLLMClient(
+        {"broken": broken, "slow": slow}, hedge_delay_s=0.01, clock=clock
+    )
+    balancer.endpoints[1].outstanding = 1
+
+    events = [event async for event in balancer.stream_chat(make_request())]
+
+    assert events[0] == TokenDelta(text="slow")
+
+
+def test_hedge_delay_uses_ttft_percentile():
+    clock = FakeClock()
+    balancer = BalancingLLMClient(
+        {"a": FakeLLMClient(clock), "b": FakeLLMClient(clock)},
+        hedge_delay_s=2.0,
+        hedge_percentile=0.9,
+        hedge_min_samples=10,
+        clock=clock,
+    )
+    endpoint = balancer.endpoints[0]
+
+    for ttft_s in range(1, 10):
+        balancer._record_ttft(endpoint, ttft_s / 10)
+    assert balancer.hedge_delay() == 2.0
+
+    balancer._record_ttft(endpoint, 1.0)
+    assert balancer.hedge_delay() == 1.0
+
+
+@pytest.mark.asyncio
+async def test_rejected_requests_move_to_another_endpoint():
+    clock = FakeClock()
+    full = FakeLLMClient(clock, error=UpstreamOverloadedError("at limit"))
+    ok = FakeLLMClient(clock)
+    balancer = BalancingLLMClient(
+        {"full": full, "ok": ok}, eject_after_failures=1, clock=clock
+    )
+
+    for _ in range(5):
+        # Keep the full endpoint the first choice
+        balancer.endpoints[1].outstanding = 1
+        assert (await balancer.chat(make_request())).text == "ok"
+        await drain(balancer, make_request())
+
+    assert (full.calls, ok.calls) == (10, 10)
+    assert balancer.endpoints[0].ejected_until == 0.0
+
+    # When every endpoint turns the request away, the last rejection is raised
+    ok.error = UpstreamUnavailableError("circuit open")
+    with pytest.raises(UpstreamUnavailableError):
+        await balancer.chat(make_request())
+    assert (full.calls, ok.calls) == (11, 11)
+
+
+@pytest.mark.asyncio
+async def test_hedges_take_a_slot_on_their_endpoint():
+    clock = FakeClock()
+    guarded = {
+        name: ResilientLLMClient(
+            FakeLLMClient(clock, delay_s=delay_s, text=name),
+            guard_factory=lambda: UpstreamGuard(
+                AimdLimiter(initial_limit=1), CircuitBreaker()
+            ),
+        )
+        for name, delay_s in (("slow", 0.05), ("fast", 0.0))
+    }
+    balancer = BalancingLLMClient(guarded, hedge_delay_s=0.01, clock=clock)
+    balancer.endpoints[1].outstanding = 1
+
+    # The fast endpoint is at its limit, so the hedge is turned away there
+    busy = guarded["fast"].stream_chat(make_request())
+    assert await anext(busy) == TokenDelta(text="fast")
+    events = [event async for event in balancer.stream_chat(make_request())]
+    await busy.aclose()  # type: ignore[attr-defined]
+
+    assert events[0] == TokenDelta(text="slow")
+    assert guarded["fast"].guards["test-model"].limiter.inflight == 0
+
+    # With the slot free again, the hedge gets it and wins
+    events = [event async for event in balancer.stream_chat(make_request())]
+    assert events[0] == TokenDelta(text="fast")
@@ -0,0 +1,86 @@
+import time
+
+import pytest
+
+from ai_core.exceptions import DeadlineExceededError
+from ai_core.orchestration.services.llm_service import (
+    ChatMessage,
+    ChatRequest,
+    TokenDelta,
+)
+from ai_infra.llms.client import OpenAiLLMClient, OpenAiLLMClientConfig
+from ai_infra.llms.stub_upstream import StubUpstream, StubUpstreamConfig
+
+
+def make_request(deadline: float | None = None) -> ChatRequest:
+    return ChatRequest(
+        model="test-model",
+        messages=[ChatMessage(role="user", content="hi")],
+        deadline=deadline,
+    )
+
+
+def pooled_connections(client: OpenAiLLMClient) -> int:
+    return len(client._transport._pool.connections)
+
+
+@pytest.mark.asyncio
+async def test_closing_stream_drops_upstream_connection_at_once():
+    # Slow enough that draining the rest of the stream would take seconds
+    config = StubUpstreamConfig(ttft_s=0, tokens_per_s=10, completion_tokens=100)
+    async with StubUpstream(config) as stub:
+        client = OpenAiLLMClient(OpenAiLLMClientConfig(base_url=stub.url))
+        stream = client.stream_chat(make_request())
+        assert isinstance(await anext(stream), TokenDelta)
+        assert pooled_connections(client) == 1
+
+        start = time.perf_counter()
+        await stream.aclose()  # type: ignore[attr-defined]
+        elapsed = time.perf_counter() - start
+
+        assert elapsed < 0.05
+        assert pooled_connections(client) == 0
+        await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_expired_deadline_fails_before_sending():
+    async with StubUpstream() as stub:
+        client = OpenAiLLMClient(OpenAiLLMClientConfig(base_url=stub.url))
+        with pytest.raises(DeadlineExceededError):
+            async for _ in client.stream_chat(make_request(time.monotonic())):
+                pass
+        with pytest.raises(DeadlineExceededError):
+            await client.chat(make_request(time.monotonic() - 1))
+        await client.aclose()
+
+    assert stub.stats.requests == 0
+
+
+@pytest.mark.asyncio
+async def test_stalled_upstream_fails_at_deadline_not_client_timeout():
+    config = StubUpstreamConfig(ttft_s=0, stall_rate=1.0, stall_s=30)
+    async with StubUpstream(config) as stub:
+        client = OpenAiLLMClient(OpenAiLLMClientConfig(base_url=stub.url, timeout_s=60))
+        start = time.perf_counter()
+        with pytest.raises(DeadlineExceededError):
+            async for _ in client.stream_chat(make_request(time.monotonic() + 0.2)):
+                pass
+        elapsed = time.perf_counter() - start
+        await client.aclose()
+
+    assert 0.2 <= elapsed < 1.0
+
+
+@pytest.mark.asyncio
+async def test_stream_stops_between_chunks_once_deadline_passes():
+    config = StubUpstreamConfig(ttft_s=0, tokens_per_s=20, completion_tokens=100)
+    async with StubUpstream(config) as stub:
+        client = OpenAiLLMClient(OpenAiLLMClientConfig(base_url=stub.url))
+        tokens = 0
+        with pytest.raises(DeadlineExceededError):
+            async for event in client.stream_chat(make_request(time.monotonic() + 0.3)):
+                tokens += isinstance(event, TokenDelta)
+        await client.aclose()
+
+    assert 0 < tokens < 100
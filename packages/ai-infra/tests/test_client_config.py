@@ -0,0 +1,106 @@
+import asyncio
+
+import httpx
+import pytest
+
+from ai_core.orchestration.services.llm_service import (
+    ChatMessage,
+    ChatRequest,
+    TokenDelta,
+)
+from ai_infra.llms import client as client_module
+from ai_infra.llms.client import OpenAiLLMClient, OpenAiLLMClientConfig
+from ai_infra.llms.stub_upstream import StubUpstream, StubUpstreamConfig
+
+
+def make_request() -> ChatRequest:
+    return ChatRequest(
+        model="test-model", messages=[ChatMessage(role="user", content="hi")]
+    )
+
+
+def pool_requests(client: OpenAiLLMClient) -> dict[str, int]:
+    return {
+        str(observation.attributes["state"]): int(observation.value)
+        for observation in client._observe_pool_requests()
+        if observation.attributes
+    }
+
+
+def test_timeout_falls_back_to_overall_timeout_per_phase():
+    config = OpenAiLLMClientConfig(
+        base_url="http://upstream", timeout_s=30.0, connect_timeout_s=2.0
+    )
+
+    assert config.timeout() == httpx.Timeout(30.0, connect=2.0)
+    assert OpenAiLLMClientConfig(
+        base_url="http://upstream",
+        timeout_s=30.0,
+        connect_timeout_s=1.0,
+        read_timeout_s=120.0,
+        write_timeout_s=5.0,
+        pool_timeout_s=0.5,
+    ).timeout() == httpx.Timeout(connect=1.0, read=120.0, write=5.0, pool=0.5)
+
+
+def test_limits_map_pool_settings():
+    config = OpenAiLLMClientConfig(
+        base_url="http://upstream",
+        max_connections=8,
+        max_keepalive_connections=4,
+        keepalive_expiry_s=30.0,
+    )
+
+    assert config.limits() == httpx.Limits(
+        max_connections=8, max_keepalive_connections=4, keepalive_expiry=30.0
+    )
+    assert OpenAiLLMClientConfig(
+        base_url="http://upstream", max_connections=None
+    ).limits() == httpx.Limits(
+        max_connections=None, max_keepalive_connections=20, keepalive_expiry=5.0
+    )
+
+
+@pytest.mark.parametrize("http2", [False, True])
+def test_transport_gets_http2_switch_and_limits(monkeypatch, http2):
+    transports: list[dict] = []
+
+    class RecordingTransport(httpx.AsyncHTTPTransport):
+        def __init__(self, **kwargs) -> None:
+            transports.append(kwargs)
+            # Building an HTTP/2 pool needs the optional h2 package
+            super().__init__(**{**kwargs, "http2": False})
+
+    monkeypatch.setattr(client_module.httpx, "AsyncHTTPTransport", RecordingTransport)
+    config = OpenAiLLMClientConfig(
+        base_url="http://upstream", http2=http2, max_connections=3
+    )
+    OpenAiLLMClient(config)
+
+    assert transports == [
+        {"http2": http2, "limits": config.limits(), "verify": True},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_pool_occupancy_splits_waiting_and_connected_requests():
+    config = StubUpstreamConfig(ttft_s=0.2, tokens_per_s=1000, completion_tokens=2)
+    async with StubUpstream(config) as stub:
+        client = OpenAiLLMClient(
+            OpenAiLLMClientConfig(base_url=stub.url, max_connections=1)
+        )
+
+        async def first_token() -> None:
+            stream = client.stream_chat(make_request())
+            assert isinstance(await anext(stream), TokenDelta)
+            await stream.aclose()  # type: ignore[attr-defined]
+
+        tasks = [asyncio.create_task(first_token()) for _ in range(2)]
+        while stub.stats.requests < 1:
+            await asyncio.sleep(0.01)
+        # One request holds the only connection while the other waits for it
+        assert pool_requests(client) == {"connected": 1, "waiting": 1}
+
+        await asyncio.gather(*tasks)
+        assert pool_requests(client) == {"connected": 0, "waiting": 0}
+        await client.aclose()
@@ -0,0 +1,203 @@
+from collections.abc import AsyncIterator
+
+import httpx
+import pytest
+
+from ai_core.exceptions import UpstreamOverloadedError, UpstreamUnavailableError
+from ai_core.orchestration.services.llm_service import (
+    ChatRequest,
+    ChatResponse,
+    ChatStreamEvent,
+    StreamDone,
+    TokenDelta,
+)
+from ai_infra.llms.resilience import (
+    AimdLimiter,
+    CircuitBreaker,
+    ResilientLLMClient,
+    UpstreamGuard,
+    parse_retry_after,
+)
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeLLMClient:
+    def __init__(self) -> None:
+        self.error: Exception | None = None
+
+    async def chat(self, request: ChatRequest) -> ChatResponse:
+        if self.error is not None:
+            raise self.error
+        return ChatResponse(text="ok")
+
+    async def stream_chat(self, request: ChatRequest) -> AsyncIterator[ChatStreamEvent]:
+        if self.error is not None:
+            raise self.error
+        yield TokenDelta(text="ok")
+        yield StreamDone(finish_reason="stop")
+
+    async def warm_up(self) -> None:
+        pass
+
+    async def aclose(self) -> None:
+        pass
+
+
+def status_error(status: int, headers: dict[str, str] | None = None) -> Exception:
+    request = httpx.Request("POST", "http://upstream/chat/completions")
+    response = httpx.Response(status, headers=headers, request=request)
+    return httpx.HTTPStatusError("error", request=request, response=response)
+
+
+def make_request(model: str = "test-model") -> ChatRequest:
+    return ChatRequest(model=model, messages=[])
+
+
+def test_parse_retry_after_headers():
+    def response(headers: dict[str, str]) -> httpx.Response:
+        return httpx.Response(429, headers=headers)
+
+    assert parse_retry_after(response({"retry-after": "7"})) == 7.0
+    assert parse_retry_after(response({"retry-after-ms": "250"})) == 0.25
+    assert (
+        parse_retry_after(
+            response(
+                {
+                    "x-ratelimit-remaining-requests": "0",
+                    "x-ratelimit-reset-requests": "1m30s",
+                    "x-ratelimit-remaining-tokens": "1000",
+                    "x-ratelimit-reset-tokens": "5m",
+                }
+            )
+        )
+        == 90.0
+    )
+    assert parse_retry_after(response({})) is None
+
+
+def test_aimd_limiter_grows_on_success_and_halves_on_drop():
+    limiter = AimdLimiter(initial_limit=4, min_limit=1, max_limit=6)
+
+    for _ in range(4):
+        assert limiter.try_acquire()
+    assert not limiter.try_acquire()
+    for _ in range(4):
+        limiter.release("ignored")
+    assert limiter.limit == 4
+
+    # Saturated windows of successful requests grow the limit up to the max
+    for _ in range(10):
+        limit = limiter.limit
+        for _ in range(limit):
+            assert limiter.try_acquire()
+        for _ in range(limit):
+            limiter.release("success")
+    assert limiter.limit == 6
+
+    assert limiter.try_acquire()
+    limiter.release("dropped")
+    assert limiter.limit == 3
+
+
+def test_circuit_breaker_opens_and_probes():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout_s=10.0, clock=clock)
+
+    breaker.record_failure()
+    assert breaker.allow() is None
+    breaker.record_failure()
+    assert breaker.allow() == 10.0
+
+    # After the timeout, exactly one probe goes through
+    clock.now = 10.0
+    assert breaker.allow() is None
+    assert breaker.allow() == 0.0
+
+    # A failed probe re-opens the circuit, a successful one closes it
+    breaker.record_failure()
+    assert breaker.state == "open"
+    clock.now = 20.0
+    assert breaker.allow() is None
+    breaker.record_success()
+    assert breaker.state == "closed"
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_opens_circuit_for_retry_after():
+    clock = FakeClock()
+    inner = FakeLLMClient()
+    client = ResilientLLMClient(
+        inner,
+        guard_factory=lambda: UpstreamGuard(
+            AimdLimiter(initial_limit=8), CircuitBreaker(clock=clock)
+        ),
+    )
+    inner.error = status_error(429, {"retry-after": "3"})
+
+    with pytest.raises(httpx.HTTPStatusError):
+        async for _ in client.stream_chat(make_request()):
+            pass
+
+    with pytest.raises(UpstreamUnavailableError) as exc_info:
+        await client.chat(make_request())
+    assert exc_info.value.code == "UPSTREAM_UNAVAILABLE"
+    assert exc_info.value.retry_after_s == 3.0
+    assert client.guards["test-model"].limiter.limit == 4
+
+    inner.error = None
+
+    # Other models are unaffected
+    assert (await client.chat(make_request("other-model"))).text == "ok"
+    with pytest.raises(UpstreamUnavailableError):
+        await client.chat(make_request())
+
+    clock.now = 3.0
+    assert (await client.chat(make_request())).text == "ok"
+    assert client.guards["test-model"].breaker.state == "closed"
+
+
+@pytest.mark.asyncio
+async def test_requests_over_the_limit_fail_fast():
+    client = ResilientLLMClient(
+        FakeLLMClient(),
+        guard_factory=lambda: UpstreamGuard(
+            AimdLimiter(initial_limit=1), CircuitBreaker()
+        ),
+    )
+
+    stream = client.stream_chat(make_request())
+    assert await anext(stream) == TokenDelta(text="ok")
+
+    with pytest.raises(UpstreamOverloadedError) as exc_info:
+        await client.chat(make_request())
+    assert exc_info.value.code == "UPSTREAM_OVERLOADED"
+
+    await stream.aclose()
+    assert (await client.chat(make_request())).text == "ok"
+
+
+@pytest.mark.asyncio
+async def test_client_errors_do_not_trip_the_breaker():
+    inner = FakeLLMClient()
+    client = ResilientLLMClient(
+        inner,
+        guard_factory=lambda: UpstreamGuard(
+            AimdLimiter(initial_limit=8), CircuitBreaker(failure_threshold=1)
+        ),
+    )
+    inner.error = status_error(400)
+
+    for _ in range(3):
+        with pytest.raises(httpx.HTTPStatusError):
+            await client.chat(make_request())
+
+    guard = client.guards["test-model"]
+    assert guard.breaker.state == "closed"
+    assert guard.limiter.limit == 8
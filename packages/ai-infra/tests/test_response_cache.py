@@ -0,0 +1,197 @@
+import asyncio
+from collections.abc import AsyncIterator
+
+import pytest
+
+from ai_core.orchestration.services.llm_service import (
+    ChatMessage,
+    ChatRequest,
+    ChatResponse,
+    ChatStreamEvent,
+    StreamDone,
+    StreamUsage,
+    TokenDelta,
+    Usage,
+)
+from ai_infra.cache import TtlLruCache
+from ai_infra.llms.response_cache import CachedCompletion, CachingLLMClient, cache_key
+from ai_infra.sql_alchemy.response_cache import SqlAlchemyResponseCacheStore
+
+USAGE = Usage(prompt_tokens=5, completion_tokens=2, total_tokens=7)
+
+
+class FakeLLMClient:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    async def chat(self, request: ChatRequest) -> ChatResponse:
+        self.calls += 1
+        return ChatResponse(text="Hello!", finish_reason="stop", usage=USAGE)
+
+    async def stream_chat(self, request: ChatRequest) -> AsyncIterator[ChatStreamEvent]:
+        self.calls += 1
+        yield TokenDelta(text="Hel")
+        yield TokenDelta(text="lo!")
+        yield StreamUsage(usage=USAGE)
+        yield StreamDone(finish_reason="stop")
+
+    async def warm_up(self) -> None:
+        pass
+
+    async def aclose(self) -> None:
+        pass
+
+
+class DictStore:
+    def __init__(self) -> None:
+        self.entries: dict[str, CachedCompletion] = {}
+
+    async def get(self, key: str) -> CachedCompletion | None:
+        return self.entries.get(key)
+
+    async def set(self, key: str, value: CachedCompletion, ttl_s: float) -> None:
+        self.entries[key] = value
+
+
+def make_request(content: str = "Hi", cache: bool = True) -> ChatRequest:
+    return ChatRequest(
+        model="test-model",
+        messages=[ChatMessage(role="user", content=content)],
+        temperature=0.0,
+        cache=cache,
+    )
+
+
+def make_client(
+    inner: FakeLLMClient, persistent: DictStore | None = None
+) -> CachingLLMClient:
+    memory: TtlLruCache[str, CachedCompletion] = TtlLruCache(max_size=16, ttl_s=60.0)
+    return CachingLLMClient(inner, memory, persistent=persistent)
+
+
+async def collect(client: CachingLLMClient, request: ChatRequest) -> list:
+    return [event async for event in client.stream_chat(request)]
+
+
+def test_cache_key_is_canonical():
+    request = make_request()
+    streaming = make_request()
+    streaming.stream = True
+
+    assert cache_key(request) == cache_key(streaming)
+    assert cache_key(request) != cache_key(make_request("Hi!"))
+
+
+@pytest.mark.asyncio
+async def test_stream_is_replayed_from_cache():
+    inner = FakeLLMClient()
+    client = make_client(inner)
+
+    first = await collect(client, make_request())
+    second = await collect(client, make_request())
+
+    assert second == first
+    assert inner.calls == 1
+
+    # The same entry also serves non-streaming calls
+    response = await client.chat(make_request())
+    assert (response.text, response.finish_reason, response.usage) == (
+        "Hello!",
+        "stop",
+        USAGE,
+    )
+    assert inner.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_requests_without_opt_in_bypass_cache():
+    inner = FakeLLMClient()
+    client = make_client(inner)
+
+    await client.chat(make_request(cache=False))
+    await client.chat(make_request(cache=False))
+
+    assert inner.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_abandoned_stream_is_not_cached():
+    inner = FakeLLMClient()
+    client = make_client(inner)
+
+    stream = client.stream_chat(make_request())
+    await anext(stream)
+    await stream.aclose()
+    await collect(client, make_request())
+
+    assert inner.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_persistent_tier_is_shared():
+    store = DictStore()
+    first = make_client(FakeLLMClient(), store)
+    await collect(first, make_request())
+    await first.aclose()
+
+    # A fresh client (e.g. another replica) finds the entry in the shared tier
+    inner = FakeLLMClient()
+    events = await collect(make_client(inner, store), make_request())
+
+    assert inner.calls == 0
+    assert events == [
+        TokenDelta(text="Hel"),
+        TokenDelta(text="lo!"),
+        StreamUsage(usage=USAGE),
+        StreamDone(finish_reason="stop"),
+    ]
+
+
+class BlockingStore(DictStore):
+    def __init__(self) -> None:
+        super().__init__()
+        self.release = asyncio.Event()
+
+    async def set(self, key: str, value: CachedCompletion, ttl_s: float) -> None:
+        await self.release.wait()
+        await super().set(key, value, ttl_s)
+
+
+@pytest.mark.asyncio
+async def test_persistent_write_does_not_delay_stream_done():
+    store = BlockingStore()
+    inner = FakeLLMClient()
+    client = make_client(inner, store)
+
+    events = await asyncio.wait_for(collect(client, make_request()), timeout=1.0)
+    assert events[-1] == StreamDone(finish_reason="stop")
+    assert store.entries == {}
+
+    # Served from memory while the shared tier is still being written
+    await collect(client, make_request())
+    assert inner.calls == 1
+
+    store.release.set()
+    await client.aclose()
+    assert list(store.entries) == [cache_key(make_request())]
+
+
+@pytest.mark.asyncio
+async def test_run_purge_keeps_going_after_failures():
+    store = SqlAlchemyResponseCacheStore(session_factory=None)  # type: ignore[arg-type]
+    calls = 0
+
+    async def purge_expired() -> int:
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            raise OSError("connection refused")
+        if calls == 3:
+            raise asyncio.CancelledError
+        return 0
+
+    store.purge_expired = purge_expired  # type: ignore[method-assign]
+    with pytest.raises(asyncio.CancelledError):
+        await store.run_purge(interval_s=0.001)
+
+    assert calls == 3
@@ -0,0 +1,203 @@
+import asyncio
+import time
+from collections.abc import AsyncIterator
+from dataclasses import replace
+
+import pytest
+
+from ai_core.exceptions import DeadlineExceededError, StreamOverflowError
+from ai_core.orchestration.services.llm_service import (
+    ChatMessage,
+    ChatRequest,
+    ChatResponse,
+    ChatStreamEvent,
+    StreamDone,
+    TokenDelta,
+)
+from ai_infra.llms.single_flight import SingleFlightLLMClient
+
+TOKENS = ["a", "b", "c"]
+EXPECTED = [TokenDelta(text=t) for t in TOKENS] + [StreamDone(finish_reason="stop")]
+
+
+class GatedLLMClient:
+    """Streams tokens, one per permit released."""
+
+    def __init__(self, tokens: list[str] = TOKENS, fail: bool = False) -> None:
+        self.tokens = tokens
+        self.fail = fail
+        self.calls = 0
+        self.cancelled = False
+        self.permits = asyncio.Semaphore(0)
+
+    async def chat(self, request: ChatRequest) -> ChatResponse:
+        raise NotImplementedError
+
+    async def stream_chat(self, request: ChatRequest) -> AsyncIterator[ChatStreamEvent]:
+        self.calls += 1
+        try:
+            for token in self.tokens:
+                await self.permits.acquire()
+                yield TokenDelta(text=token)
+                # Like a network read, give other tasks a turn between tokens
+                await asyncio.sleep(0)
+            if self.fail:
+                raise RuntimeError("upstream failed")
+            yield StreamDone(finish_reason="stop")
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+
+    def release(self, n: int = 1) -> None:
+        for _ in range(n):
+            self.permits.release()
+
+    async def warm_up(self) -> None:
+        pass
+
+    async def aclose(self) -> None:
+        pass
+
+
+def make_request(temperature: float | None = 0.0, content: str = "Hi") -> ChatRequest:
+    return ChatRequest(
+        model="test-model",
+        messages=[ChatMessage(role="user", content=content)],
+        temperature=temperature,
+    )
+
+
+async def collect(client: SingleFlightLLMClient, request: ChatRequest) -> list:
+    return [event async for event in client.stream_chat(request)]
+
+
+@pytest.mark.asyncio
+async def test_identical_requests_share_one_upstream_stream():
+    inner = GatedLLMClient()
+    client = SingleFlightLLMClient(inner)
+
+    tasks = [asyncio.create_task(collect(client, make_request())) for _ in range(3)]
+    await asyncio.sleep(0)
+    inner.release(len(TOKENS))
+    results = await asyncio.gather(*tasks)
+
+    assert inner.calls == 1
+    assert results == [EXPECTED] * 3
+
+
+@pytest.mark.asyncio
+async def test_non_deterministic_and_different_requests_are_not_shared():
+    inner = GatedLLMClient()
+    inner.release(4 * len(TOKENS))
+    client = SingleFlightLLMClient(inner)
+
+    await asyncio.gather(
+        collect(client, make_request(temperature=0.7)),
+        collect(client, make_request(temperature=0.7)),
+        collect(client, make_request(content="Hi")),
+        collect(client, make_request(content="Hello")),
+    )
+
+    assert inner.calls == 4
+
+
+@pytest.mark.asyncio
+async def test_late_joiner_is_replayed_history():
+    inner = GatedLLMClient()
+    client = SingleFlightLLMClient(inner)
+    first = client.stream_chat(make_request())
+
+    inner.release(2)
+    assert await anext(first) == TokenDelta(text="a")
+    assert await anext(first) == TokenDelta(text="b")
+    late_task = asyncio.create_task(collect(client, make_request()))
+    await asyncio.sleep(0)
+    inner.release()
+    late = await late_task
+
+    assert late == EXPECTED
+    assert [event async for event in first] == EXPECTED[2:]
+    assert inner.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_slow_subscriber_is_detached_without_stalling_others():
+    inner = GatedLLMClient(tokens=[str(i) for i in range(10)])
+    client = SingleFlightLLMClient(inner, max_lag=3)
+    slow = client.stream_chat(make_request())
+    inner.release()
+    assert await anext(slow) == TokenDelta(text="0")
+
+    fast_task = asyncio.create_task(collect(client, make_request()))
+    await asyncio.sleep(0)
+    inner.release(9)
+    fast = await fast_task
+
+    assert len(fast) == 11
+    with pytest.raises(StreamOverflowError):
+        await anext(slow)
+
+
+@pytest.mark.asyncio
+async def test_upstream_error_reaches_every_subscriber():
+    inner = GatedLLMClient(fail=True)
+    client = SingleFlightLLMClient(inner)
+
+    tasks = [asyncio.create_task(collect(client, make_request())) for _ in range(2)]
+    await asyncio.sleep(0)
+    inner.release(len(TOKENS))
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+
+    assert inner.calls == 1
+    assert all(isinstance(r, RuntimeError) for r in results)
+
+
+@pytest.mark.asyncio
+async def test_upstream_cancelled_when_last_subscriber_leaves():
+    inner = GatedLLMClient()
+    client = SingleFlightLLMClient(inner)
+    stream = client.stream_chat(make_request())
+    inner.release()
+    await anext(stream)
+
+    await stream.aclose()
+    await asyncio.sleep(0)
+
+    assert inner.cancelled
+    # A new request starts a fresh upstream stream
+    inner.release(len(TOKENS))
+    assert await collect(client, make_request()) == EXPECTED
+    assert inner.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_subscriber_leaves_at_its_own_deadline():
+    inner = GatedLLMClient()
+    client = SingleFlightLLMClient(inner)
+    patient = asyncio.create_task(collect(client, make_request()))
+    await asyncio.sleep(0)
+    hurried = replace(make_request(), deadline=time.monotonic() + 0.05)
+
+    start = time.perf_counter()
+    with pytest.raises(DeadlineExceededError):
+        await collect(client, hurried)
+    assert time.perf_counter() - start < 0.5
+
+    # The other subscriber keeps the shared stream going
+    assert not inner.cancelled
+    inner.release(len(TOKENS))
+    assert await patient == EXPECTED
+    assert inner.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_last_subscriber_past_deadline_cancels_upstream():
+    inner = GatedLLMClient()
+    client = SingleFlightLLMClient(inner)
+    request = replace(make_request(), deadline=time.monotonic() + 0.05)
+
+    with pytest.raises(DeadlineExceededError):
+        await collect(client, request)
+    await asyncio.sleep(0)
+
+    assert inner.cancelled
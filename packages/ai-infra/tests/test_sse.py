@@ -0,0 +1,113 @@
+import json
+from collections.abc import AsyncIterator
+
+import pytest
+
+from ai_core.orchestration.streaming import StreamDone, StreamUsage, TokenDelta, Usage
+from ai_infra.llms.sse import CHUNK_DECODERS, SseDecoder, aiter_stream_events
+
+
+def chunk(content: str | None = None, finish_reason: str | None = None) -> bytes:
+    data = {
+        "id": "chatcmpl-1",
+        "object": "chat.completion.chunk",
+        "choices": [
+            {
+                "index": 0,
+                "delta": {"content": content},
+                "finish_reason": finish_reason,
+            }
+        ],
+    }
+    return b"data: " + json.dumps(data).encode() + b"\n\n"
+
+
+async def byte_stream(*chunks: bytes) -> AsyncIterator[bytes]:
+    for c in chunks:
+        yield c
+
+
+def test_decoder_handles_events_split_across_chunks():
+    decoder = SseDecoder()
+    body = b'data: {"a": 1}\r\n\r\n: keep-alive\n\nevent: x\ndata: {"b": 2}\n\n'
+
+    events = []
+    for i in range(len(body)):
+        events.extend(decoder.feed(body[i : i + 1]))
+
+    assert events == [b'{"a": 1}', b'{"b": 2}']
+
+
+def test_decoder_joins_multi_line_data():
+    decoder = SseDecoder()
+
+    assert decoder.feed(b"data: first\ndata:second\ndata\n\n") == [b"first\nsecond\n"]
+    assert decoder.feed(b"data: trailing") == []
+    assert decoder.flush() == [b"trailing"]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("backend", sorted(CHUNK_DECODERS))
+async def test_stream_events(backend):
+    usage = b'data: {"choices": [], "usage": {"prompt_tokens": 3, "completion_tokens": 2, "total_tokens": 5}}\n\n'
+    body = (
+        chunk("Hel")
+        + b"data: not json\n\n"
+        + chunk("lo")
+        + usage
+        + chunk(finish_reason="stop")
+        + chunk("ignored")
+    )
+    # Split at arbitrary points, including inside events
+    stream = byte_stream(body[:7], body[7:100], body[100:])
+
+    events = [
+        event
+        async for event in aiter_stream_events(stream, decode=CHUNK_DECODERS[backend])
+    ]
+
+    assert events == [
+        TokenDelta(text="Hel"),
+        TokenDelta(text="lo"),
+        StreamUsage(usage=Usage(prompt_tokens=3, completion_tokens=2, total_tokens=5)),
+        StreamDone(finish_reason="stop"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_stream_events_stop_at_done_sentinel():
+    stream = byte_stream(chunk("Hi"), b"data: [DONE]\n\n", chunk("ignored"))
+
+    events = [event async for event in aiter_stream_events(stream)]
+
+    assert events == [TokenDelta(text="Hi"), StreamDone()]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("backend", sorted(CHUNK_DECODERS))
+async def test_stream_events_read_usage_after_finish_reason(backend):
+    # OpenAI sends usage in its own chunk between the finish chunk and [DONE]
+    usage = b'data: {"choices": [], "usage": {"prompt_tokens": 3, "completion_tokens": 1, "total_tokens": 4}}\n\n'
+    stream = byte_stream(
+        chunk("Hi"), chunk(finish_reason="stop"), usage, b"data: [DONE]\n\n"
+    )
+
+    events = [
+        event
+        async for event in aiter_stream_events(stream, decode=CHUNK_DECODERS[backend])
+    ]
+
+    assert events == [
+        TokenDelta(text="Hi"),
+        StreamUsage(usage=Usage(prompt_tokens=3, completion_tokens=1, total_tokens=4)),
+        StreamDone(finish_reason="stop"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_stream_events_end_of_body_after_finish_reason():
+    stream = byte_stream(chunk("Hi"), chunk(finish_reason="length")[:-2])
+
+    events = [event async for event in aiter_stream_events(stream)]
+
+    assert events == [TokenDelta(text="Hi"), StreamDone(finish_reason="length")]
@@ -0,0 +1,98 @@
+import time
+
+import httpx
+import pytest
+
+from ai_core.orchestration.services.llm_service import (
+    ChatMessage,
+    ChatRequest,
+    StreamDone,
+    StreamUsage,
+    TokenDelta,
+    Usage,
+)
+from ai_infra.llms.client import OpenAiLLMClient, OpenAiLLMClientConfig
+from ai_infra.llms.resilience import parse_retry_after
+from ai_infra.llms.stub_upstream import StubUpstream, StubUpstreamConfig
+
+
+def make_request(max_tokens: int | None = None) -> ChatRequest:
+    return ChatRequest(
+        model="test-model",
+        messages=[ChatMessage(role="user", content="say three words")],
+        max_tokens=max_tokens,
+    )
+
+
+@pytest.mark.asyncio
+async def test_streams_tokens_usage_and_done_through_real_client():
+    config = StubUpstreamConfig(ttft_s=0.05, tokens_per_s=1000, completion_tokens=5)
+    async with StubUpstream(config) as stub:
+        client = OpenAiLLMClient(OpenAiLLMClientConfig(base_url=stub.url))
+        start = time.perf_counter()
+        events = []
+        async for event in client.stream_chat(make_request(max_tokens=3)):
+            events.append(event)
+            if len(events) == 1:
+                ttft = time.perf_counter() - start
+        response = await client.chat(make_request())
+        await client.aclose()
+
+    assert ttft >= 0.05
+    assert [e.text for e in events if isinstance(e, TokenDelta)] == [
+        " tok0",
+        " tok1",
+        " tok2",
+    ]
+    # Usage arrives in its own chunk after the finish reason, before [DONE]
+    assert events[-2:] == [
+        StreamUsage(usage=Usage(prompt_tokens=3, completion_tokens=3, total_tokens=6)),
+        StreamDone(finish_reason="stop"),
+    ]
+    assert response.text == "".join(f" tok{i}" for i in range(5))
+    assert stub.stats.requests == 2
+    assert stub.stats.completion_tokens == 8
+
+
+@pytest.mark.asyncio
+async def test_injects_rate_limits_and_errors():
+    async with StubUpstream(StubUpstreamConfig(rate_limit_rate=1.0)) as stub:
+        client = OpenAiLLMClient(OpenAiLLMClientConfig(base_url=stub.url))
+        with pytest.raises(httpx.HTTPStatusError) as rate_limited:
+            await client.chat(make_request())
+        stub.config.rate_limit_rate = 0.0
+        stub.config.error_rate = 1.0
+        with pytest.raises(httpx.HTTPStatusError) as failed:
+            async for _ in client.stream_chat(make_request()):
+                pass
+        await client.aclose()
+
+    assert rate_limited.value.response.status_code == 429
+    assert parse_retry_after(rate_limited.value.response) == 1.0
+    assert failed.value.response.status_code == 500
+
+
+@pytest.mark.asyncio
+async def test_stall_trips_the_client_read_timeout():
+    config = StubUpstreamConfig(ttft_s=0, stall_rate=1.0, stall_s=5, seed=1)
+    async with StubUpstream(config) as stub:
+        client = OpenAiLLMClient(
+            OpenAiLLMClientConfig(base_url=stub.url, read_timeout_s=0.1)
+        )
+        with pytest.raises(httpx.ReadTimeout):
+            async for _ in client.stream_chat(make_request()):
+                pass
+        await client.aclose()
+
+    assert stub.stats.stalled == 1
+
+
+@pytest.mark.parametrize("jitter", ["uniform", "normal", "lognormal"])
+def test_jitter_keeps_the_mean(jitter):
+    stub = StubUpstream(StubUpstreamConfig(jitter=jitter, jitter_ratio=0.3, seed=7))
+
+    samples = [stub.sample(0.1) for _ in range(5000)]
+
+    assert min(samples) >= 0
+    assert len(set(samples)) > 1
+    assert sum(samples) / len(samples) == pytest.approx(0.1, rel=0.05)
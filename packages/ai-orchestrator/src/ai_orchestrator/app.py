@@ -3,7 +3,13 @@ import uvicorn
 from ai_orchestrator.http.server import app as fastapi_app
 from ai_orchestrator.grpc.server import serve as serve_grpc
 from ai_orchestrator.context import AppContext
-from ai_orchestrator.telemetry import configure_logging, configure_tracing
+from ai_orchestrator.loop_monitor import EventLoopLagMonitor
+from ai_orchestrator.telemetry import (
+    configure_logging,
+    configure_metrics,
+    configure_tracing,
+)
+from ai_orchestrator.warmup import warm_up
 
 
 async def run_grpc(server, port: int):
@@ -19,10 +25,12 @@ async def start():
     if settings.enable_tracing:
         configure_tracing(settings)
 
-    configure_logging(settings)
+    log_listener = configure_logging(settings)
+    metrics_reader = configure_metrics(settings)
 
     # Inject dependencies
     fastapi_app.state.context = app_context
+    fastapi_app.state.metrics_reader = metrics_reader
 
     config = uvicorn.Config(
         fastapi_app, host="0.0.0.0", port=settings.http_port, log_level="info"
@@ -31,7 +39,33 @@ async def start():
 
     grpc_server = await serve_grpc(app_context)
 
+    profile_change_listener = app_context.get_profile_change_listener()
+    response_cache_store = app_context.get_response_cache_store()
+
     print("Starting AI Orchestrator services...")
-    async with anyio.create_task_group() as tg:
-        tg.start_soon(http_server.serve)
-        tg.start_soon(run_grpc, grpc_server, settings.grpc_port)
+    try:
+        async with anyio.create_task_group() as tg:
+            tg.start_soon(http_server.serve)
+            tg.start_soon(run_grpc, grpc_server, settings.grpc_port)
+            tg.start_soon(warm_up, app_context)
+            loop_monitor = EventLoopLagMonitor(
+                settings.event_loop_lag_interval_s,
+                slow_callback_s=(
+                    settings.event_loop_slow_callback_ms / 1000
+                    if settings.event_loop_slow_callback_ms is not None
+                    else None
+                ),
+            )
+            tg.start_soon(loop_monitor.run)
+            if profile_change_listener is not None:
+                tg.start_soon(profile_change_listener.run)
+            if response_cache_store is not None:
+                tg.start_soon(
+                    response_cache_store.run_purge,
+                    settings.llm_cache_purge_interval_s,
+                )
+    finally:
+        await app_context.aclose()
+        if log_listener is not None:
+            # Flush queued records before exiting
+            log_listener.stop()
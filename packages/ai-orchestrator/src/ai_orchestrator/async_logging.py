@@ -0,0 +1,158 @@
+"""Logging that keeps formatting and I/O off the event loop thread."""
+
+from __future__ import annotations
+
+import json
+import logging
+import queue
+import random
+from collections.abc import Iterable, Mapping
+from logging.handlers import QueueHandler
+from typing import Any
+
+from opentelemetry import metrics
+from opentelemetry.metrics import CallbackOptions, Observation
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None  # type: ignore[assignment]
+
+meter = metrics.get_meter("logging")
+
+# LogRecord attributes that are not extras passed by the caller
+_RECORD_ATTRS = frozenset(
+    vars(logging.LogRecord("", logging.INFO, "", 0, "", None, None))
+) | {"message", "asctime"}
+
+# Records dropped before reaching the output, by reason (queue_full/sampled).
+# Kept as plain ints since OTel counters cost microseconds per add, and read
+# at collection time.
+_dropped = {"queue_full": 0, "sampled": 0}
+
+
+def _observe_dropped(options: CallbackOptions) -> Iterable[Observation]:
+    for reason, count in _dropped.items():
+        yield Observation(count, {"reason": reason})
+
+
+meter.create_observable_counter(
+    "logging.records.dropped",
+    callbacks=[_observe_dropped],
+    unit="{record}",
+    description="Log records dropped before being written, by reason (queue_full/sampled)",
+)
+
+
+def _dumps(payload: dict[str, Any]) -> str:
+    if orjson is not None:
+        return orjson.dumps(
+            payload, default=str, option=orjson.OPT_NON_STR_KEYS
+        ).decode()
+    return json.dumps(payload, default=str, separators=(",", ":"))
+
+
+class JsonLogFormatter(logging.Formatter):
+    """
+    One JSON object per line, with the caller's extras as top-level keys.
+
+    Uses the same keys as the synchronous python-json-logger setup
+    (asctime, levelname, name, message, request_id), encoded with orjson
+    when it is installed.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        """Encode a record as a JSON line."""
+        payload: dict[str, Any] = {
+            "asctime": self.formatTime(record),
+            "levelname": record.levelname,
+            "name": record.name,
+            "message": record.getMessage(),
+            "request_id": getattr(record, "request_id", None),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS:
+                payload[key] = value
+        if record.exc_info:
+            payload["exc_info"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            payload["exc_info"] = record.exc_text
+        if record.stack_info:
+            payload["stack_info"] = self.formatStack(record.stack_info)
+        return _dumps(payload)
+
+
+class LogSampler(logging.Filter):
+    """
+    Keeps a fraction of the records from high-volume loggers.
+
+    Rates apply to a logger and its children, the most specific name
+    winning. Warnings and errors are always kept. Records carrying a
+    ``request_id`` are sampled by request, so a request's start and finish
+    lines are kept or dropped together.
+    """
+
+    def __init__(self, rates: Mapping[str, float]) -> None:
+        """
+        Initialize the sampler.
+
+        Args:
+            rates: Logger names mapped to the fraction of records to keep.
+        """
+        super().__init__()
+        self._rates = dict(rates)
+        self._logger_rates: dict[str, float] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        """Decide whether to keep a record."""
+        if record.levelno >= logging.WARNING:
+            return True
+        rate = self._rate(record.name)
+        if rate >= 1.0:
+            return True
+        request_id = getattr(record, "request_id", None)
+        if request_id is not None:
+            keep = (hash(request_id) & 0xFFFF) < rate * 0x10000
+        else:
+            keep = random.random() < rate
+        if not keep:
+            _dropped["sampled"] += 1
+        return keep
+
+    def _rate(self, name: str) -> float:
+        try:
+            return self._logger_rates[name]
+        except KeyError:
+            pass
+        rate = 1.0
+        prefix = name
+        while prefix:
+            if prefix in self._rates:
+                rate = self._rates[prefix]
+                break
+            prefix = prefix.rpartition(".")[0]
+        self._logger_rates[name] = rate
+        return rate
+
+
+class DroppingQueueHandler(QueueHandler):
+    """
+    Hands records to a QueueListener thread, dropping them when it falls behind.
+
+    The calling thread only renders the message; formatting and writing
+    happen on the listener thread. When the bounded queue is full the record
+    is counted and dropped instead of blocking the event loop.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """Render the message now, since its arguments may change later."""
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        """Queue a record, counting it as dropped if the queue is full."""
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            _dropped["queue_full"] += 1
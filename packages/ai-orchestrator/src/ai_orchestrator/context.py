@@ -1,14 +1,38 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import Session, sessionmaker
+from dataclasses import replace
+from uuid import UUID
 
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from ai_core.models import GraphProfile, ModelProfile
 from ai_core.orchestration.services.llm_service import LLMClient
-from ai_core.repositories import GraphProfileRepository, ModelProfileRepository
+from ai_core.orchestration.services.token_counter import TokenCounter
+from ai_core.repositories import (
+    AsyncGraphProfileRepository,
+    AsyncModelProfileRepository,
+)
+from ai_infra.cache import (
+    CachingGraphProfileRepository,
+    CachingModelProfileRepository,
+    TtlLruCache,
+    register_cache,
+)
+from ai_infra.llms.balancer import BalancingLLMClient
 from ai_infra.llms.client import OpenAiLLMClient, OpenAiLLMClientConfig
+from ai_infra.llms.resilience import (
+    AimdLimiter,
+    CircuitBreaker,
+    ResilientLLMClient,
+    UpstreamGuard,
+)
+from ai_infra.llms.response_cache import CachedCompletion, CachingLLMClient
+from ai_infra.llms.single_flight import SingleFlightLLMClient
 from ai_infra.settings import Settings
+from ai_infra.sql_alchemy.notifications import ProfileChangeListener
 from ai_infra.sql_alchemy.repositories import (
-    SqlAlchemyGraphProfileRepository,
-    SqlAlchemyModelProfileRepository,
+    AsyncSqlAlchemyGraphProfileRepository,
+    AsyncSqlAlchemyModelProfileRepository,
 )
+from ai_infra.sql_alchemy.response_cache import SqlAlchemyResponseCacheStore
 
 
 class AppContext:
@@ -19,45 +43,212 @@ class AppContext:
         # Load Settings
         self._settings = Settings()
 
-        # Create SQLAlchemy engine and session factory
-        engine = create_engine(str(self._settings.pg_dsn))
-        self._session_factory = sessionmaker(
-            autocommit=False, autoflush=False, bind=engine
+        # Create async SQLAlchemy engine and session factory
+        self._engine = create_async_engine(
+            str(self._settings.pg_dsn),
+            pool_size=self._settings.pg_pool_size,
+            max_overflow=self._settings.pg_max_overflow,
+            pool_pre_ping=self._settings.pg_pool_pre_ping,
+            pool_recycle=self._settings.pg_pool_recycle_s,
+            pool_timeout=self._settings.pg_pool_timeout_s,
+        )
+        self._session_factory = async_sessionmaker(
+            self._engine, autoflush=False, expire_on_commit=False
         )
-
-        # Create a session for initialization
-        session: Session = self._session_factory()
 
         # Create repositories
-        self.graph_profile_repository: GraphProfileRepository = (
-            SqlAlchemyGraphProfileRepository(session)
+        self.graph_profile_repository: AsyncGraphProfileRepository = (
+            AsyncSqlAlchemyGraphProfileRepository(self._session_factory)
         )
-        self.model_profile_repository: ModelProfileRepository = (
-            SqlAlchemyModelProfileRepository(session)
+        self.model_profile_repository: AsyncModelProfileRepository = (
+            AsyncSqlAlchemyModelProfileRepository(self._session_factory)
         )
 
+        # Wrap repositories with the in-memory profile cache
+        self._profile_change_listener: ProfileChangeListener | None = None
+        if self._settings.profile_cache_enabled:
+            self._init_profile_cache()
+
         # Create LLMClient
         client_config = OpenAiLLMClientConfig(
             base_url=self._settings.ai_base_url,
             api_key=self._settings.ai_api_key,
+            timeout_s=self._settings.ai_timeout_s,
+            connect_timeout_s=self._settings.ai_connect_timeout_s,
+            read_timeout_s=self._settings.ai_read_timeout_s,
+            write_timeout_s=self._settings.ai_write_timeout_s,
+            pool_timeout_s=self._settings.ai_pool_timeout_s,
+            http2=self._settings.ai_http2,
+            max_connections=self._settings.ai_max_connections,
+            max_keepalive_connections=self._settings.ai_max_keepalive_connections,
+            keepalive_expiry_s=self._settings.ai_keepalive_expiry_s,
+            warmup_connections=self._settings.warmup_llm_connections,
+        )
+        self._llm_client: LLMClient
+        if self._settings.ai_upstream_urls:
+            self._llm_client = BalancingLLMClient(
+                {
+                    url: self._build_upstream_client(
+                        replace(client_config, base_url=url)
+                    )
+                    for url in self._settings.ai_upstream_urls
+                },
+                strategy=self._settings.ai_lb_strategy,
+                session_affinity=self._settings.ai_lb_session_affinity,
+                eject_after_failures=self._settings.ai_lb_eject_after_failures,
+                ejection_s=self._settings.ai_lb_ejection_s,
+                hedge_delay_s=self._settings.ai_lb_hedge_delay_s,
+                hedge_percentile=self._settings.ai_lb_hedge_percentile,
+            )
+        else:
+            self._llm_client = self._build_upstream_client(client_config)
+
+        # Identical concurrent misses share one upstream stream and limiter slot
+        if self._settings.llm_single_flight_enabled:
+            self._llm_client = SingleFlightLLMClient(
+                self._llm_client,
+                max_lag=self._settings.llm_single_flight_max_lag,
+            )
+
+        # Cache hits are served without touching the limiter or the upstream
+        self._response_cache_store: SqlAlchemyResponseCacheStore | None = None
+        if self._settings.llm_cache_enabled:
+            if self._settings.llm_cache_persistent:
+                self._response_cache_store = SqlAlchemyResponseCacheStore(
+                    self._session_factory
+                )
+            self._llm_client = CachingLLMClient(
+                self._llm_client,
+                memory=TtlLruCache[str, CachedCompletion](
+                    max_size=self._settings.llm_cache_max_entries,
+                    ttl_s=self._settings.llm_cache_ttl_s,
+                ),
+                persistent=self._response_cache_store,
+                ttl_s=self._settings.llm_cache_ttl_s,
+                max_entry_bytes=self._settings.llm_cache_max_entry_bytes,
+            )
+
+        # Shared by every turn so tokenizers load once and counts stay cached
+        self._token_counter = TokenCounter(
+            tokenizer_dir=self._settings.tokenizer_dir,
+            families=self._settings.tokenizer_families,
+            chars_per_token=self._settings.token_chars_per_token,
+            cache_size=self._settings.token_count_cache_size,
+        )
+        register_cache("token_count", self._token_counter)
+
+        # Set once the startup warm-up has completed
+        self._ready = False
+
+    def _init_profile_cache(self) -> None:
+        """Wrap the profile repositories with caches and set up push invalidation."""
+        settings = self._settings
+
+        graph_profile_cache: TtlLruCache[UUID, GraphProfile | None] = TtlLruCache(
+            max_size=settings.profile_cache_max_size,
+            ttl_s=settings.profile_cache_ttl_s,
+        )
+        model_profile_cache: TtlLruCache[UUID, ModelProfile | None] = TtlLruCache(
+            max_size=settings.profile_cache_max_size,
+            ttl_s=settings.profile_cache_ttl_s,
+        )
+        register_cache("graph_profile", graph_profile_cache)
+        register_cache("model_profile", model_profile_cache)
+        graph_profile_repository = CachingGraphProfileRepository(
+            self.graph_profile_repository,
+            graph_profile_cache,
+            negative_ttl_s=settings.profile_cache_negative_ttl_s,
+        )
+        model_profile_repository = CachingModelProfileRepository(
+            self.model_profile_repository,
+            model_profile_cache,
+            negative_ttl_s=settings.profile_cache_negative_ttl_s,
         )
-        self._llm_client = OpenAiLLMClient(client_config)
+        self.graph_profile_repository = graph_profile_repository
+        self.model_profile_repository = model_profile_repository
+
+        if settings.profile_cache_listen:
+            self._profile_change_listener = ProfileChangeListener(
+                str(settings.pg_dsn),
+                targets={
+                    "graph_profile": graph_profile_repository,
+                    "model_profile": model_profile_repository,
+                },
+            )
+
+    def _build_upstream_client(self, config: OpenAiLLMClientConfig) -> LLMClient:
+        """
+        Build the client for one upstream endpoint.
+
+        With resilience enabled, the endpoint gets its own limiter and breaker
+        per model, below the balancer, so a slow replica only throttles itself
+        and hedged requests take a slot like any other.
+        """
+        client: LLMClient = OpenAiLLMClient(config)
+        if self._settings.ai_resilience_enabled:
+            client = ResilientLLMClient(
+                client,
+                guard_factory=self._build_upstream_guard,
+                ttft_threshold_s=self._settings.ai_limit_ttft_threshold_s,
+                name=config.base_url,
+            )
+        return client
 
-        # Close the initialization session
-        session.close()
+    def _build_upstream_guard(self) -> UpstreamGuard:
+        """Build the concurrency limiter and circuit breaker for an upstream model."""
+        settings = self._settings
+        initial_limit = settings.ai_limit_initial
+        if initial_limit is None:
+            initial_limit = min(settings.ai_max_connections, settings.ai_limit_max)
+        return UpstreamGuard(
+            limiter=AimdLimiter(
+                initial_limit=initial_limit,
+                min_limit=settings.ai_limit_min,
+                max_limit=settings.ai_limit_max,
+            ),
+            breaker=CircuitBreaker(
+                failure_threshold=settings.ai_breaker_failure_threshold,
+                reset_timeout_s=settings.ai_breaker_reset_timeout_s,
+            ),
+        )
 
     def get_settings(self) -> Settings:
         """Get the Settings instance."""
         return self._settings
 
-    def get_model_profile_repository(self) -> ModelProfileRepository:
-        """Get the ModelProfileRepository."""
+    def get_token_counter(self) -> TokenCounter:
+        """Get the shared TokenCounter."""
+        return self._token_counter
+
+    def get_model_profile_repository(self) -> AsyncModelProfileRepository:
+        """Get the AsyncModelProfileRepository."""
         return self.model_profile_repository
 
-    def get_graph_profile_repository(self) -> GraphProfileRepository:
-        """Get the GraphProfileRepository."""
+    def get_graph_profile_repository(self) -> AsyncGraphProfileRepository:
+        """Get the AsyncGraphProfileRepository."""
         return self.graph_profile_repository
 
+    def get_profile_change_listener(self) -> ProfileChangeListener | None:
+        """Get the profile cache invalidation listener, if enabled."""
+        return self._profile_change_listener
+
+    def get_response_cache_store(self) -> SqlAlchemyResponseCacheStore | None:
+        """Get the persistent response cache tier, if enabled."""
+        return self._response_cache_store
+
     def get_llm_client(self) -> LLMClient:
         """Get the LLMClient instance."""
         return self._llm_client
+
+    def is_ready(self) -> bool:
+        """Whether the application has finished warming up and can take traffic."""
+        return self._ready
+
+    def mark_ready(self) -> None:
+        """Mark the application as ready to take traffic."""
+        self._ready = True
+
+    async def aclose(self) -> None:
+        """Close the LLMClient and dispose of the database connection pool."""
+        await self._llm_client.aclose()
+        await self._engine.dispose()
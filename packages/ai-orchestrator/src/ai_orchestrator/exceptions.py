@@ -1,3 +1,12 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from ai_orchestrator.loop_monitor import SlowCallback
+
+
 class ChatTurnPlanError(Exception):
     """Exception raised when ChatTurnPlan.build() encounters an error during parsing or validation."""
 
@@ -12,3 +21,18 @@ class ChatTurnPlanError(Exception):
         self.code = code
         self.message = message
         super().__init__(f"{code}: {message}")
+
+
+class BlockedEventLoopError(Exception):
+    """Exception raised by a strict EventLoopLagMonitor when the loop was blocked."""
+
+    def __init__(self, message: str, slow_callbacks: Iterable[SlowCallback]):
+        """
+        Initialize BlockedEventLoopError.
+
+        Args:
+            message: Error message summarizing the blocks.
+            slow_callbacks: The recorded blocks, with their stacks.
+        """
+        self.slow_callbacks = list(slow_callbacks)
+        super().__init__(message)
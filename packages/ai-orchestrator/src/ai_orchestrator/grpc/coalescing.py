@@ -0,0 +1,140 @@
+"""Coalescing of token deltas into fewer ChatTurn messages."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncGenerator, AsyncIterator, Sequence
+from contextlib import suppress
+from dataclasses import dataclass
+
+from ai_core.orchestration.streaming import ChatStreamEvent, TokenDelta
+
+# Invocation metadata key clients use to opt in or out per request
+COALESCE_METADATA_KEY = "x-aisp-coalesce"
+
+_OFF_VALUES = frozenset({"0", "false", "off", "no"})
+_ON_VALUES = frozenset({"1", "true", "on", "yes"})
+
+
+@dataclass
+class _EndOfStream:
+    error: Exception | None = None
+
+
+def coalescing_requested(
+    metadata: Sequence[tuple[str, str | bytes]] | None, default: bool
+) -> bool:
+    """
+    Decide whether to coalesce tokens for a call from its invocation metadata.
+
+    Args:
+        metadata: The call's invocation metadata, if any.
+        default: The server-wide setting, used when the client expresses no preference.
+
+    Returns:
+        True if token deltas should be coalesced.
+    """
+    for key, value in metadata or ():
+        if key != COALESCE_METADATA_KEY:
+            continue
+        text = value.decode() if isinstance(value, bytes) else value
+        if text.lower() in _OFF_VALUES:
+            return False
+        if text.lower() in _ON_VALUES:
+            return True
+    return default
+
+
+async def coalesce_tokens(
+    events: AsyncIterator[ChatStreamEvent],
+    max_bytes: int = 256,
+    flush_interval_s: float = 0.02,
+    max_pending: int = 64,
+) -> AsyncGenerator[ChatStreamEvent]:
+    """
+    Merge consecutive TokenDeltas into larger ones.
+
+    The first token is passed through at once so time to first token is
+    unaffected. After that, deltas are buffered until ``max_bytes`` of text
+    has accumulated or ``flush_interval_s`` has passed since the first
+    buffered delta, whichever comes first. Any other event flushes the buffer
+    and is passed through in order. The source is read by a separate task so
+    the interval is honoured even while the upstream is quiet, and tokens that
+    pile up while the consumer is busy are merged on the next read. At most
+    ``max_pending`` events are read ahead, so a slow consumer still stops the
+    source from being read, and upstream flow control keeps working.
+
+    Args:
+        events: Stream events to coalesce.
+        max_bytes: UTF-8 size at which buffered text is flushed.
+        flush_interval_s: Longest time a delta is held back.
+        max_pending: Most events read from the source but not yet consumed.
+
+    Yields:
+        The same events, with runs of TokenDeltas merged.
+    """
+    queue: asyncio.Queue[ChatStreamEvent | _EndOfStream] = asyncio.Queue(
+        maxsize=max_pending
+    )
+
+    async def pump() -> None:
+        try:
+            async for event in events:
+                await queue.put(event)
+        except Exception as e:
+            await queue.put(_EndOfStream(error=e))
+        else:
+            await queue.put(_EndOfStream())
+
+    pump_task = asyncio.create_task(pump())
+    loop = asyncio.get_running_loop()
+    buffer: list[str] = []
+    buffered_bytes = 0
+    deadline = 0.0
+    first_token_sent = False
+    try:
+        while True:
+            if not buffer:
+                item = await queue.get()
+            else:
+                try:
+                    item = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    try:
+                        item = await asyncio.wait_for(
+                            queue.get(), max(deadline - loop.time(), 0)
+                        )
+                    except TimeoutError:
+                        yield TokenDelta(text="".join(buffer))
+                        buffer.clear()
+                        buffered_bytes = 0
+                        continue
+
+            if isinstance(item, TokenDelta):
+                if not first_token_sent:
+                    first_token_sent = True
+                    yield item
+                    continue
+                if not buffer:
+                    deadline = loop.time() + flush_interval_s
+                buffer.append(item.text)
+                buffered_bytes += len(item.text.encode())
+                if buffered_bytes >= max_bytes:
+                    yield TokenDelta(text="".join(buffer))
+                    buffer.clear()
+                    buffered_bytes = 0
+                continue
+
+            if buffer:
+                yield TokenDelta(text="".join(buffer))
+                buffer.clear()
+                buffered_bytes = 0
+            if isinstance(item, _EndOfStream):
+                if item.error is not None:
+                    raise item.error
+                return
+            yield item
+    finally:
+        pump_task.cancel()
+        with suppress(asyncio.CancelledError):
+            await pump_task
@@ -1,5 +1,7 @@
+from ai_core.models import GenerationParams
+from ai_core.orchestration.history import HistoryWindow
 from ai_core.orchestration.orchestrator import ChatOrchestrator
-from ai_core.orchestration.services import LLMService, Services
+from ai_core.orchestration.services import LLMService, Services, TokenBudget
 from ai_orchestrator.context import AppContext
 from ai_orchestrator.grpc.plan import ChatTurnPlan
 
@@ -16,12 +18,21 @@ class ChatOrchestratorFactory:
         """
         self._app_context = app_context
 
-    def create(self, plan: ChatTurnPlan) -> ChatOrchestrator:
+    def create(
+        self,
+        plan: ChatTurnPlan,
+        deadline: float | None = None,
+        params: GenerationParams | None = None,
+    ) -> ChatOrchestrator:
         """
         Create a ChatOrchestrator instance from a ChatTurnPlan.
 
         Args:
             plan: The ChatTurnPlan containing all parsed and validated information.
+            deadline: ``time.monotonic()`` time by which the turn must finish,
+                usually the gRPC call's deadline. None means no deadline.
+            params: Request-level generation parameters, which take precedence
+                over the model profile and graph node settings.
 
         Returns:
             ChatOrchestrator: A configured ChatOrchestrator instance ready to execute.
@@ -29,16 +40,38 @@ class ChatOrchestratorFactory:
         # Get LLM client from AppContext
         client = self._app_context.get_llm_client()
 
-        # Create LLM service
-        main_llm_service = LLMService(client, plan.main_model_profile)
+        settings = self._app_context.get_settings()
 
-        # Create Services container
-        services = Services(llm_main=main_llm_service)
+        # Every LLM call in the turn draws on the same token budget
+        budget_total = settings.turn_token_budget
+        budget = TokenBudget(budget_total) if budget_total is not None else None
+
+        # Create LLM service, keeping the session on one upstream replica
+        main_llm_service = LLMService(
+            client,
+            plan.main_model_profile,
+            affinity_key=str(plan.session_id),
+            deadline=deadline,
+            params=params,
+            budget=budget,
+        )
 
-        # Build graph
-        graph = plan.graph_builder(services)
+        # Create Services container
+        history_window = (
+            HistoryWindow(
+                max_tokens=settings.history_max_tokens,
+                step_tokens=settings.history_trim_step_tokens,
+            )
+            if settings.history_max_tokens is not None
+            else None
+        )
+        services = Services(
+            llm_main=main_llm_service,
+            history_window=history_window,
+            token_counter=self._app_context.get_token_counter(),
+        )
 
-        # Create orchestrator
-        orchestrator = ChatOrchestrator(graph)
+        # Create orchestrator around the shared compiled graph
+        orchestrator = ChatOrchestrator(plan.graph, services)
 
         return orchestrator
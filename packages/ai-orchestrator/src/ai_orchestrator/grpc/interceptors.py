@@ -1,14 +1,37 @@
 from __future__ import annotations
 
+import asyncio
 import logging
 import time
 from typing import Any
 
 import grpc
-from opentelemetry import trace
+from opentelemetry import metrics, trace
 from opentelemetry.trace.status import Status, StatusCode
 
+from ai_core.orchestration.streaming import closing_stream
+
 log = logging.getLogger("grpc")
+meter = metrics.get_meter("grpc")
+
+_cancelled_calls = meter.create_counter(
+    "chat_turn.cancelled",
+    unit="{call}",
+    description="ChatTurn calls abandoned before completion, by reason (client/deadline)",
+)
+_active_calls = meter.create_up_down_counter(
+    "chat_turn.active",
+    unit="{call}",
+    description="ChatTurn streams currently in progress",
+)
+
+
+def _cancel_reason(context: grpc.ServicerContext) -> str:
+    """Tell a call that ran out of time from one the client walked away from."""
+    remaining_s = context.time_remaining()
+    if remaining_s is not None and remaining_s <= 0:
+        return "deadline"
+    return "client"
 
 
 class ChatTurnAttributesInterceptor(grpc.aio.ServerInterceptor):
@@ -58,10 +81,29 @@ class ChatTurnAttributesInterceptor(grpc.aio.ServerInterceptor):
                 )
 
                 chunks = 0
+                events = inner(request, context)
+                _active_calls.add(1)
                 try:
-                    async for event in inner(request, context):
-                        chunks += 1
-                        yield event
+                    async with closing_stream(events):
+                        async for event in events:
+                            chunks += 1
+                            yield event
+                except (GeneratorExit, asyncio.CancelledError):
+                    # grpc.aio closes the handler when the client cancels and
+                    # cancels it when the deadline passes
+                    reason = _cancel_reason(context)
+                    _cancelled_calls.add(1, {"reason": reason})
+                    log.info(
+                        "request.cancelled",
+                        extra={
+                            "request_id": request_id,
+                            "session_id": session_id,
+                            "user_id": user_id,
+                            "reason": reason,
+                            "chunks": chunks,
+                        },
+                    )
+                    raise
                 except Exception as e:
                     # Record on current span (the gRPC server span)
                     span = trace.get_current_span()
@@ -70,6 +112,7 @@ class ChatTurnAttributesInterceptor(grpc.aio.ServerInterceptor):
                         span.set_status(Status(StatusCode.ERROR))
                     raise
                 finally:
+                    _active_calls.add(-1)
                     latency_ms = int((time.perf_counter() - start) * 1000)
                     span = trace.get_current_span()
                     if span and span.is_recording():
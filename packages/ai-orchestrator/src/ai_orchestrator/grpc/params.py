@@ -0,0 +1,78 @@
+"""Per-call generation parameter overrides carried in invocation metadata."""
+
+from __future__ import annotations
+
+import math
+from collections.abc import Sequence
+from typing import Any
+
+from ai_core.models import GenerationParams
+from ai_orchestrator.exceptions import ChatTurnPlanError
+
+# Invocation metadata keys clients use to override the model profile per call.
+# The stop key may be sent more than once, one stop sequence per entry.
+TEMPERATURE_METADATA_KEY = "x-aisp-temperature"
+TOP_P_METADATA_KEY = "x-aisp-top-p"
+MAX_TOKENS_METADATA_KEY = "x-aisp-max-tokens"
+STOP_METADATA_KEY = "x-aisp-stop"
+
+
+def _invalid(key: str, text: str) -> ChatTurnPlanError:
+    return ChatTurnPlanError(
+        code="INVALID_GENERATION_PARAMS",
+        message=f"Invalid {key} metadata value: {text!r}",
+    )
+
+
+def _parse_float(key: str, text: str, low: float, high: float) -> float:
+    try:
+        value = float(text)
+    except ValueError as e:
+        raise _invalid(key, text) from e
+    if not math.isfinite(value) or not low <= value <= high:
+        raise _invalid(key, text)
+    return value
+
+
+def _parse_max_tokens(text: str) -> int:
+    try:
+        value = int(text)
+    except ValueError as e:
+        raise _invalid(MAX_TOKENS_METADATA_KEY, text) from e
+    if value < 1:
+        raise _invalid(MAX_TOKENS_METADATA_KEY, text)
+    return value
+
+
+def requested_generation_params(
+    metadata: Sequence[tuple[str, str | bytes]] | None,
+) -> GenerationParams | None:
+    """
+    Read request-level generation parameters from a call's invocation metadata.
+
+    Args:
+        metadata: The call's invocation metadata, if any.
+
+    Returns:
+        The requested parameters, or None if the client set none of them.
+
+    Raises:
+        ChatTurnPlanError: If a parameter value cannot be parsed or is out of range.
+    """
+    overrides: dict[str, Any] = {}
+    stop: list[str] = []
+    for key, value in metadata or ():
+        text = value.decode() if isinstance(value, bytes) else value
+        if key == TEMPERATURE_METADATA_KEY:
+            overrides["temperature"] = _parse_float(key, text, 0.0, 2.0)
+        elif key == TOP_P_METADATA_KEY:
+            overrides["top_p"] = _parse_float(key, text, 0.0, 1.0)
+        elif key == MAX_TOKENS_METADATA_KEY:
+            overrides["max_tokens"] = _parse_max_tokens(text)
+        elif key == STOP_METADATA_KEY:
+            stop.append(text)
+    if stop:
+        overrides["stop"] = stop
+    if not overrides:
+        return None
+    return GenerationParams.from_overrides(overrides)
@@ -1,15 +1,21 @@
+import asyncio
 from dataclasses import dataclass
-from typing import Callable
 from uuid import UUID
 
 from ai_core.models import GraphProfile, ModelProfile
-from ai_core.orchestration.graphs import graph_registry
+from ai_core.orchestration.graphs import get_graph
 from ai_core.orchestration.graphs.graph import OrchestratorGraph
-from ai_core.orchestration.services import Services
+from ai_core.orchestration.services.llm_service import ChatMessage, Role
 from ai_orchestrator.context import AppContext
 from ai_orchestrator.exceptions import ChatTurnPlanError
 from ai_orchestrator.grpc.generated.aisp.v1 import chat_orchestrator_pb2
 
+_HISTORY_ROLES: dict[int, Role] = {
+    chat_orchestrator_pb2.ROLE_USER: "user",
+    chat_orchestrator_pb2.ROLE_ASSISTANT: "assistant",
+    chat_orchestrator_pb2.ROLE_SYSTEM: "system",
+}
+
 
 @dataclass
 class ChatTurnPlan:
@@ -24,12 +30,14 @@ class ChatTurnPlan:
     user_id: UUID
     graph_profile_id: UUID
     graph_profile: GraphProfile
-    graph_builder: Callable[[Services], OrchestratorGraph]
+    graph: OrchestratorGraph
     model_bindings: dict[str, ModelProfile]
     main_model_profile: ModelProfile
+    system_prompt: str | None
+    history: list[ChatMessage]
 
     @classmethod
-    def build(
+    async def build(
         cls,
         request: chat_orchestrator_pb2.ChatTurnRequest,
         app_context: AppContext,
@@ -81,8 +89,35 @@ class ChatTurnPlan:
                 message=f"Invalid graph_profile_id format: {request.assistant.graph_profile_id}",
             ) from e
 
-        graph_profile = app_context.get_graph_profile_repository().get_by_id(
-            graph_profile_id
+        # Convert the conversation history, keeping each message's role
+        history: list[ChatMessage] = []
+        for entry in request.history.tail:
+            role = _HISTORY_ROLES.get(entry.role)
+            if role is None:
+                raise ChatTurnPlanError(
+                    code="INVALID_HISTORY_ROLE",
+                    message=f"History message {entry.id or len(history)} has no role",
+                )
+            history.append(ChatMessage(role=role, content=entry.content))
+
+        # Parse model binding IDs up front so they can be resolved in one batch
+        binding_ids: list[tuple[str, UUID]] = []
+        for binding in request.assistant.model_bindings:
+            try:
+                model_profile_id = UUID(binding.model_profile_id)
+            except ValueError as e:
+                raise ChatTurnPlanError(
+                    code="INVALID_MODEL_PROFILE_ID",
+                    message=f"Invalid model_profile_id format: {binding.model_profile_id}",
+                ) from e
+            binding_ids.append((binding.slot_name, model_profile_id))
+
+        # Fetch the graph profile and all bound model profiles concurrently
+        graph_profile, model_profiles = await asyncio.gather(
+            app_context.get_graph_profile_repository().get_by_id(graph_profile_id),
+            app_context.get_model_profile_repository().get_by_ids(
+                [model_profile_id for _, model_profile_id in binding_ids]
+            ),
         )
         if graph_profile is None:
             raise ChatTurnPlanError(
@@ -90,35 +125,25 @@ class ChatTurnPlan:
                 message=f"Graph profile {graph_profile_id} not found",
             )
 
-        # Get graph builder function
+        # Get the compiled graph (built once per registry entry)
         try:
-            graph_builder = graph_registry[graph_profile.graph_name]
+            graph = get_graph(graph_profile.graph_name)
         except KeyError:
             raise ChatTurnPlanError(
                 code="GRAPH_BUILDER_NOT_FOUND",
                 message=f"Graph builder for '{graph_profile.graph_name}' not found",
             )
 
-        # Build model bindings dict from request using AppContext
+        # Build model bindings dict from the resolved profiles
         model_bindings: dict[str, ModelProfile] = {}
-        for binding in request.assistant.model_bindings:
-            try:
-                model_profile_id = UUID(binding.model_profile_id)
-            except ValueError as e:
-                raise ChatTurnPlanError(
-                    code="INVALID_MODEL_PROFILE_ID",
-                    message=f"Invalid model_profile_id format: {binding.model_profile_id}",
-                ) from e
-
-            model_profile = app_context.get_model_profile_repository().get_by_id(
-                model_profile_id
-            )
+        for slot_name, model_profile_id in binding_ids:
+            model_profile = model_profiles.get(model_profile_id)
             if model_profile is None:
                 raise ChatTurnPlanError(
                     code="MODEL_PROFILE_NOT_FOUND",
                     message=f"Model profile {model_profile_id} not found",
                 )
-            model_bindings[binding.slot_name] = model_profile
+            model_bindings[slot_name] = model_profile
 
         # Get model profile for main LLM service
         try:
@@ -135,7 +160,9 @@ class ChatTurnPlan:
             user_id=user_id,
             graph_profile_id=graph_profile_id,
             graph_profile=graph_profile,
-            graph_builder=graph_builder,
+            graph=graph,
             model_bindings=model_bindings,
             main_model_profile=main_model_profile,
+            system_prompt=request.assistant.system_prompt or None,
+            history=history,
         )
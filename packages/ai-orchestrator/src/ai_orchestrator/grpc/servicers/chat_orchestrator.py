@@ -1,13 +1,30 @@
+import time
 from typing import Any
-from collections.abc import AsyncIterator
+from collections.abc import AsyncGenerator, AsyncIterator
+from contextlib import aclosing
 
-from ai_core.orchestration.streaming import StreamDone, TokenDelta
+from ai_core.exceptions import LLMClientError
+from ai_core.orchestration.streaming import (
+    ChatStreamEvent,
+    StreamDone,
+    TokenDelta,
+    closing_stream,
+)
+from ai_core.orchestration.turn_metrics import TurnMetrics
 from ai_orchestrator.context import AppContext
 from ai_orchestrator.exceptions import ChatTurnPlanError
+from ai_orchestrator.grpc.coalescing import coalesce_tokens, coalescing_requested
 from ai_orchestrator.grpc.factory import ChatOrchestratorFactory
 from ai_orchestrator.grpc.generated.aisp.v1 import chat_orchestrator_pb2
 from ai_orchestrator.grpc.generated.aisp.v1 import chat_orchestrator_pb2_grpc
+from ai_orchestrator.grpc.params import requested_generation_params
 from ai_orchestrator.grpc.plan import ChatTurnPlan
+from ai_orchestrator.grpc.turn_metrics import (
+    metrics_event,
+    record_turn_metrics,
+    trailing_metadata,
+    turn_timings,
+)
 
 
 class ChatOrchestratorService(chat_orchestrator_pb2_grpc.ChatOrchestratorServicer):
@@ -25,10 +42,14 @@ class ChatOrchestratorService(chat_orchestrator_pb2_grpc.ChatOrchestratorService
         request: chat_orchestrator_pb2.ChatTurnRequest,
         context: Any,
     ) -> AsyncIterator[chat_orchestrator_pb2.ChatEvent]:
+        turn = TurnMetrics()
         try:
-            # Build plan from request
+            # Build plan from request, with any generation parameters the
+            # client set in the call's metadata
             try:
-                plan = ChatTurnPlan.build(request, self._app_context)
+                params = requested_generation_params(context.invocation_metadata())
+                plan = await ChatTurnPlan.build(request, self._app_context)
+                turn.plan_s = time.perf_counter() - turn.started_at
             except ChatTurnPlanError as e:
                 yield chat_orchestrator_pb2.ChatEvent(
                     error=chat_orchestrator_pb2.ErrorEvent(
@@ -38,9 +59,13 @@ class ChatOrchestratorService(chat_orchestrator_pb2_grpc.ChatOrchestratorService
                 )
                 return
 
-            # Create orchestrator from plan
+            # Create orchestrator from plan, bounded by the call's deadline
+            remaining_s = context.time_remaining()
+            deadline = (
+                time.monotonic() + remaining_s if remaining_s is not None else None
+            )
             factory = ChatOrchestratorFactory(self._app_context)
-            orchestrator = factory.create(plan)
+            orchestrator = factory.create(plan, deadline=deadline, params=params)
 
             # Prepare initial state
             initial_state = {
@@ -49,25 +74,64 @@ class ChatOrchestratorService(chat_orchestrator_pb2_grpc.ChatOrchestratorService
                 "user_id": plan.user_id,
                 "model_bindings": plan.model_bindings,
                 "messages": [request.input.message],
+                "system_prompt": plan.system_prompt,
+                "history": plan.history,
             }
 
-            # Stream events from orchestrator
-            async for sourced_event in orchestrator.execute(initial_state):
-                event = sourced_event.event
-                if isinstance(event, TokenDelta):
-                    yield chat_orchestrator_pb2.ChatEvent(
-                        token=chat_orchestrator_pb2.TokenChunkEvent(
-                            content=event.text,
+            # Stream events from orchestrator, merging token deltas unless
+            # the client asked for one message per token. Both generators are
+            # closed explicitly so a cancelled call releases the upstream stream
+            # at once instead of when the garbage collector gets to it.
+            source = orchestrator.execute(initial_state, metrics=turn)
+            events: AsyncGenerator[ChatStreamEvent] = (
+                sourced_event.event async for sourced_event in source
+            )
+            settings = self._app_context.get_settings()
+            if coalescing_requested(
+                context.invocation_metadata(), settings.grpc_coalesce_tokens
+            ):
+                events = coalesce_tokens(
+                    events,
+                    max_bytes=settings.grpc_coalesce_max_bytes,
+                    flush_interval_s=settings.grpc_coalesce_interval_s,
+                    max_pending=settings.grpc_coalesce_max_pending,
+                )
+
+            async with closing_stream(source), aclosing(events):
+                async for event in events:
+                    if isinstance(event, TokenDelta):
+                        yield chat_orchestrator_pb2.ChatEvent(
+                            token=chat_orchestrator_pb2.TokenChunkEvent(
+                                content=event.text,
+                            )
                         )
-                    )
-                elif isinstance(event, StreamDone):
-                    # Send DoneEvent
-                    yield chat_orchestrator_pb2.ChatEvent(
-                        done=chat_orchestrator_pb2.DoneEvent()
-                    )
-                    break
-                # StreamUsage events are currently not converted to protobuf
+                    elif isinstance(event, StreamDone):
+                        # Report the turn's usage, then send DoneEvent. The
+                        # timings have no MetricsEvent fields, so they go to
+                        # trailing metadata, the span and histograms instead.
+                        turn.finish(time.perf_counter())
+                        timings = turn_timings(turn)
+                        record_turn_metrics(
+                            turn,
+                            timings,
+                            graph=plan.graph_profile.graph_name,
+                            model_profile=plan.main_model_profile.name,
+                        )
+                        context.set_trailing_metadata(trailing_metadata(timings))
+                        yield metrics_event(turn)
+                        yield chat_orchestrator_pb2.ChatEvent(
+                            done=chat_orchestrator_pb2.DoneEvent()
+                        )
+                        break
+                    # StreamUsage events are summed into the turn's MetricsEvent
 
+        except LLMClientError as e:
+            yield chat_orchestrator_pb2.ChatEvent(
+                error=chat_orchestrator_pb2.ErrorEvent(
+                    code=e.code,
+                    message=e.message,
+                )
+            )
         except Exception as e:
             yield chat_orchestrator_pb2.ChatEvent(
                 error=chat_orchestrator_pb2.ErrorEvent(
@@ -0,0 +1,169 @@
+"""Reporting of per-turn measurements to clients, traces and metrics."""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+
+from opentelemetry import metrics, trace
+
+from ai_core.orchestration.turn_metrics import TurnMetrics
+from ai_orchestrator.grpc.generated.aisp.v1 import chat_orchestrator_pb2
+from ai_orchestrator.histogram import BucketHistogram
+
+meter = metrics.get_meter("grpc")
+
+_queue_time = meter.create_histogram(
+    "chat_turn.queue_time",
+    unit="s",
+    description="Time from a ChatTurn call arriving to its graph starting, excluding plan build",
+)
+_plan_time = meter.create_histogram(
+    "chat_turn.plan_time",
+    unit="s",
+    description="Time spent building ChatTurn plans",
+)
+_ttft = meter.create_histogram(
+    "chat_turn.time_to_first_token",
+    unit="s",
+    description="Time from a ChatTurn call arriving to its first token",
+)
+# Recorded once per token, so aggregated in process rather than through OTel
+_inter_token = BucketHistogram(
+    "chat_turn.inter_token_latency",
+    unit="s",
+    description="Gaps between consecutive token deltas of a ChatTurn",
+    label_names=("graph", "model_profile"),
+)
+_duration = meter.create_histogram(
+    "chat_turn.duration",
+    unit="s",
+    description="Time from a ChatTurn call arriving to its last event",
+)
+_tokens_per_s = meter.create_histogram(
+    "chat_turn.tokens_per_second",
+    unit="{token}/s",
+    description="Decode rate of a ChatTurn after its first token",
+)
+_usage = meter.create_counter(
+    "chat_turn.usage",
+    unit="{token}",
+    description="Upstream-reported tokens by type (prompt/completion)",
+)
+
+# Trailing metadata keys carrying timings, which MetricsEvent has no fields for
+_TIMING_METADATA = {
+    "queue_ms": "x-aisp-queue-ms",
+    "plan_ms": "x-aisp-plan-ms",
+    "ttft_ms": "x-aisp-ttft-ms",
+    "inter_token_p50_ms": "x-aisp-inter-token-p50-ms",
+    "inter_token_p90_ms": "x-aisp-inter-token-p90-ms",
+    "inter_token_p99_ms": "x-aisp-inter-token-p99-ms",
+    "duration_ms": "x-aisp-duration-ms",
+    "tokens_per_s": "x-aisp-tokens-per-s",
+}
+
+
+def turn_timings(turn: TurnMetrics) -> dict[str, float]:
+    """
+    Summarize a turn's timings, leaving out those that were not measured.
+
+    Args:
+        turn: The finished turn's measurements.
+
+    Returns:
+        Timings in milliseconds (and tokens per second) by name.
+    """
+    values = {
+        "queue_ms": turn.queue_s,
+        "plan_ms": turn.plan_s,
+        "ttft_ms": turn.ttft_s,
+        "inter_token_p50_ms": turn.inter_token_percentile(0.5),
+        "inter_token_p90_ms": turn.inter_token_percentile(0.9),
+        "inter_token_p99_ms": turn.inter_token_percentile(0.99),
+        "duration_ms": turn.duration_s,
+    }
+    timings = {
+        name: round(value * 1000, 3)
+        for name, value in values.items()
+        if value is not None
+    }
+    tokens_per_s = turn.tokens_per_s
+    if tokens_per_s is not None:
+        timings["tokens_per_s"] = round(tokens_per_s, 1)
+    return timings
+
+
+def metrics_event(turn: TurnMetrics) -> chat_orchestrator_pb2.ChatEvent:
+    """
+    Build the MetricsEvent sent just before DoneEvent.
+
+    Args:
+        turn: The finished turn's measurements.
+
+    Returns:
+        A ChatEvent carrying the turn's upstream token usage.
+    """
+    usage = turn.usage
+    return chat_orchestrator_pb2.ChatEvent(
+        metrics=chat_orchestrator_pb2.MetricsEvent(
+            prompt_tokens=(usage.prompt_tokens or 0) if usage else 0,
+            completion_tokens=(usage.completion_tokens or 0) if usage else 0,
+            total_tokens=(usage.total_tokens or 0) if usage else 0,
+        )
+    )
+
+
+def trailing_metadata(timings: Mapping[str, float]) -> tuple[tuple[str, str], ...]:
+    """
+    Encode a turn's timings as gRPC trailing metadata.
+
+    Args:
+        timings: Output of ``turn_timings``.
+
+    Returns:
+        Metadata pairs, e.g. ``("x-aisp-ttft-ms", "212.5")``.
+    """
+    return tuple(
+        (_TIMING_METADATA[name], str(value)) for name, value in timings.items()
+    )
+
+
+def record_turn_metrics(
+    turn: TurnMetrics,
+    timings: Mapping[str, float],
+    graph: str,
+    model_profile: str,
+) -> None:
+    """
+    Record a finished turn on the current span and in the turn histograms.
+
+    Args:
+        turn: The finished turn's measurements.
+        timings: Output of ``turn_timings``.
+        graph: Name of the graph that ran the turn.
+        model_profile: Name of the turn's main model profile.
+    """
+    attributes = {"graph": graph, "model_profile": model_profile}
+    span = trace.get_current_span()
+    if span.is_recording():
+        for name, value in timings.items():
+            span.set_attribute(f"chat_turn.{name}", value)
+        span.set_attribute("chat_turn.tokens", turn.tokens)
+
+    if turn.queue_s is not None:
+        _queue_time.record(turn.queue_s, attributes)
+    _plan_time.record(turn.plan_s, attributes)
+    if turn.ttft_s is not None:
+        _ttft.record(turn.ttft_s, attributes)
+    _inter_token.record_many(turn.inter_token_s, (graph, model_profile))
+    if turn.duration_s is not None:
+        _duration.record(turn.duration_s, attributes)
+    tokens_per_s = turn.tokens_per_s
+    if tokens_per_s is not None:
+        _tokens_per_s.record(tokens_per_s, attributes)
+    usage = turn.usage
+    if usage is not None:
+        if usage.prompt_tokens:
+            _usage.add(usage.prompt_tokens, {**attributes, "type": "prompt"})
+        if usage.completion_tokens:
+            _usage.add(usage.completion_tokens, {**attributes, "type": "completion"})
@@ -1,4 +1,7 @@
-from fastapi import Request
+import hmac
+
+from fastapi import Depends, HTTPException, Request, status
+from opentelemetry.sdk.metrics.export import InMemoryMetricReader
 
 from ai_orchestrator.context import AppContext
 
@@ -6,3 +9,32 @@ from ai_orchestrator.context import AppContext
 def get_context(request: Request) -> AppContext:
     """Get the AppContext from the request state."""
     return request.app.state.context
+
+
+def get_metrics_reader(request: Request) -> InMemoryMetricReader | None:
+    """Get the metric reader backing /metrics, if metrics are enabled."""
+    return getattr(request.app.state, "metrics_reader", None)
+
+
+def require_admin(request: Request, context: AppContext = Depends(get_context)) -> None:
+    """
+    Allow only requests bearing the admin token.
+
+    Admin endpoints are hidden (404) when no admin token is configured.
+
+    Raises:
+        HTTPException: 404 if admin endpoints are disabled, 401 if the
+            ``Authorization: Bearer <token>`` header does not match.
+    """
+    token = context.get_settings().admin_token
+    if not token:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
+
+    scheme, _, credentials = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not hmac.compare_digest(
+        credentials.encode(), token.encode()
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            headers={"WWW-Authenticate": "Bearer"},
+        )
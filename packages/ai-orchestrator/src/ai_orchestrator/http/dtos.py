@@ -26,3 +26,4 @@ class ModelProfileResponse(BaseModel):
     temperature: float | None = None
     top_p: float | None = None
     max_tokens: int | None = None
+    response_cache_enabled: bool = False
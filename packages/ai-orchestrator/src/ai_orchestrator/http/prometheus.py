@@ -0,0 +1,200 @@
+"""Rendering of collected OTel metrics in the Prometheus text exposition format."""
+
+from __future__ import annotations
+
+import math
+import re
+from collections.abc import Iterable, Mapping, Sequence
+from dataclasses import dataclass, field
+from typing import Any
+
+from opentelemetry.sdk.metrics.export import (
+    Gauge,
+    Histogram,
+    Metric,
+    MetricsData,
+    NumberDataPoint,
+    Sum,
+)
+
+from ai_orchestrator.histogram import BucketHistogram
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+_INVALID_NAME_CHARS = re.compile(r"[^a-zA-Z0-9_:]")
+_INVALID_LABEL_CHARS = re.compile(r"[^a-zA-Z0-9_]")
+# UCUM annotations such as {token} carry no unit
+_UNIT_ANNOTATION = re.compile(r"\{[^}]*\}")
+_UNIT_NAMES = {
+    "s": "seconds",
+    "ms": "milliseconds",
+    "By": "bytes",
+    "1": "ratio",
+}
+
+
+@dataclass
+class _Family:
+    """Samples sharing one metric name, possibly from several meters."""
+
+    type: str
+    help: str
+    lines: list[str] = field(default_factory=list)
+
+
+def render(data: MetricsData | None, histograms: Iterable[BucketHistogram] = ()) -> str:
+    """
+    Render collected metrics as Prometheus text.
+
+    Counters get a ``_total`` suffix, units become name suffixes (``s`` as
+    ``_seconds``), and dots in metric and attribute names become
+    underscores, e.g. ``chat_turn.time_to_first_token`` in seconds becomes
+    ``chat_turn_time_to_first_token_seconds``.
+
+    Args:
+        data: Output of a metric reader's collection, if any.
+        histograms: In-process histograms to render alongside it.
+
+    Returns:
+        The exposition text.
+    """
+    families: dict[str, _Family] = {}
+    if data is not None:
+        for resource_metrics in data.resource_metrics:
+            for scope_metrics in resource_metrics.scope_metrics:
+                for metric in scope_metrics.metrics:
+                    _render_metric(metric, families)
+    for histogram in histograms:
+        _render_bucket_histogram(histogram, families)
+
+    out: list[str] = []
+    for name, family in families.items():
+        out.append(f"# HELP {name} {_escape_help(family.help)}")
+        out.append(f"# TYPE {name} {family.type}")
+        out.extend(family.lines)
+    out.append("")
+    return "\n".join(out)
+
+
+def _render_metric(metric: Metric, families: dict[str, _Family]) -> None:
+    name = _metric_name(metric.name, metric.unit)
+    data = metric.data
+    if isinstance(data, Histogram):
+        family = _family(families, name, "histogram", metric.description)
+        for point in data.data_points:
+            _render_histogram(
+                name,
+                point.attributes,
+                point.explicit_bounds,
+                point.bucket_counts,
+                point.sum,
+                point.count,
+                family.lines,
+            )
+    elif isinstance(data, Sum) and data.is_monotonic:
+        if not name.endswith("_total"):
+            name += "_total"
+        family = _family(families, name, "counter", metric.description)
+        _render_number_points(name, data.data_points, family.lines)
+    elif isinstance(data, Sum | Gauge):
+        family = _family(families, name, "gauge", metric.description)
+        _render_number_points(name, data.data_points, family.lines)
+
+
+def _render_bucket_histogram(
+    histogram: BucketHistogram, families: dict[str, _Family]
+) -> None:
+    name = _metric_name(histogram.name, histogram.unit)
+    family = _family(families, name, "histogram", histogram.description)
+    for labels, series in histogram.series():
+        _render_histogram(
+            name,
+            labels,
+            histogram.boundaries,
+            series.bucket_counts,
+            series.sum,
+            series.count,
+            family.lines,
+        )
+
+
+def _family(
+    families: dict[str, _Family], name: str, type: str, description: str | None
+) -> _Family:
+    family = families.get(name)
+    if family is None:
+        family = families[name] = _Family(type=type, help=description or "")
+    return family
+
+
+def _render_number_points(
+    name: str, points: Iterable[NumberDataPoint], lines: list[str]
+) -> None:
+    for point in points:
+        lines.append(f"{name}{_labels(point.attributes)} {_value(point.value)}")
+
+
+def _render_histogram(
+    name: str,
+    attributes: Mapping[str, Any] | None,
+    bounds: Sequence[float],
+    bucket_counts: Sequence[int],
+    sum: float,
+    count: int,
+    lines: list[str],
+) -> None:
+    # OTel bucket counts are per bucket; Prometheus buckets are cumulative
+    cumulative = 0
+    for bound, bucket_count in zip(bounds, bucket_counts):
+        cumulative += bucket_count
+        labels = _labels(attributes, le=_value(bound))
+        lines.append(f"{name}_bucket{labels} {cumulative}")
+    lines.append(f"{name}_bucket{_labels(attributes, le='+Inf')} {count}")
+    lines.append(f"{name}_sum{_labels(attributes)} {_value(sum)}")
+    lines.append(f"{name}_count{_labels(attributes)} {count}")
+
+
+def _metric_name(name: str, unit: str | None) -> str:
+    name = _INVALID_NAME_CHARS.sub("_", name)
+    suffix = _unit_suffix(unit or "")
+    if suffix and not name.endswith(suffix):
+        name = f"{name}_{suffix}"
+    return name
+
+
+def _unit_suffix(unit: str) -> str:
+    unit = _UNIT_ANNOTATION.sub("", unit)
+    if not unit:
+        return ""
+    numerator, _, denominator = unit.partition("/")
+    suffix = _UNIT_NAMES.get(numerator, numerator)
+    if denominator:
+        per = f"per_{_UNIT_NAMES.get(denominator, denominator).rstrip('s')}"
+        suffix = f"{suffix}_{per}" if suffix else per
+    return _INVALID_NAME_CHARS.sub("_", suffix)
+
+
+def _labels(attributes: Mapping[str, Any] | None, **extra: str) -> str:
+    pairs = [
+        f'{_INVALID_LABEL_CHARS.sub("_", key)}="{_escape_label(str(value))}"'
+        for key, value in {**(attributes or {}), **extra}.items()
+    ]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _value(value: float) -> str:
+    if isinstance(value, int):
+        return str(value)
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if math.isnan(value):
+        return "NaN"
+    return repr(value)
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", r"\\").replace('"', r"\"").replace("\n", r"\n")
+
+
+def _escape_help(value: str) -> str:
+    return value.replace("\\", r"\\").replace("\n", r"\n")
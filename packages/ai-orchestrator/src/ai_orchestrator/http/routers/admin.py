@@ -0,0 +1,72 @@
+import asyncio
+import json
+from collections.abc import AsyncIterator
+from dataclasses import asdict
+from typing import Any, Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+
+from ai_orchestrator import profiling
+from ai_orchestrator.http.dependencies import require_admin
+
+router = APIRouter(prefix="/admin", dependencies=[Depends(require_admin)])
+
+# One profile at a time: concurrent samplers would skew each other's results
+_profiling = asyncio.Lock()
+
+
+async def _exclusive() -> AsyncIterator[None]:
+    if _profiling.locked():
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="A profile is already being taken",
+        )
+    async with _profiling:
+        yield
+
+
+@router.get(
+    "/profile/cpu",
+    summary="Profile CPU",
+    dependencies=[Depends(_exclusive)],
+)
+async def profile_cpu(
+    duration_s: float = Query(10.0, gt=0, le=120),
+    interval_ms: float = Query(10.0, ge=1, le=1000),
+    format: Literal["speedscope", "collapsed"] = "speedscope",
+    all_threads: bool = False,
+) -> Response:
+    """
+    Sample stacks for a while and return them as a flamegraph profile.
+
+    The event loop thread is sampled by default, with samples rooted at the
+    running task's coroutine. ``collapsed`` output feeds flamegraph.pl or
+    inferno; ``speedscope`` output opens in https://www.speedscope.app.
+    """
+    profile = await profiling.profile_cpu(
+        duration_s, interval_s=interval_ms / 1000, all_threads=all_threads
+    )
+    if format == "collapsed":
+        return Response(content=profile.collapsed(), media_type="text/plain")
+    return Response(
+        content=json.dumps(
+            profile.speedscope(f"ai-orchestrator {duration_s:g}s"),
+            separators=(",", ":"),
+        ),
+        media_type="application/json",
+    )
+
+
+@router.get(
+    "/profile/memory",
+    summary="Profile Memory",
+    dependencies=[Depends(_exclusive)],
+)
+async def profile_memory(
+    duration_s: float = Query(10.0, gt=0, le=120),
+    limit: int = Query(25, ge=1, le=500),
+    frames: int = Query(10, ge=1, le=100),
+) -> dict[str, Any]:
+    """Trace allocations for a while and return the top allocation sites."""
+    allocations = await profiling.profile_memory(duration_s, limit=limit, frames=frames)
+    return {"allocations": [asdict(allocation) for allocation in allocations]}
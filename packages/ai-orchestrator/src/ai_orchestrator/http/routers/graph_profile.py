@@ -20,7 +20,7 @@ async def get_graph_profile(
 ) -> GraphProfileResponse:
     """Get a graph profile by ID."""
     repository = context.get_graph_profile_repository()
-    profile = repository.get_by_id(graph_profile_id)
+    profile = await repository.get_by_id(graph_profile_id)
 
     if profile is None:
         raise HTTPException(
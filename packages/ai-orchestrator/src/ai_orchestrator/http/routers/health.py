@@ -1,4 +1,7 @@
-from fastapi import APIRouter, status, Response
+from fastapi import APIRouter, Depends, status, Response
+
+from ai_orchestrator.context import AppContext
+from ai_orchestrator.http.dependencies import get_context
 
 router = APIRouter()
 
@@ -6,3 +9,11 @@ router = APIRouter()
 @router.get("/healthz")
 async def healthz() -> Response:
     return Response(status_code=status.HTTP_200_OK)
+
+
+@router.get("/readyz")
+async def readyz(context: AppContext = Depends(get_context)) -> Response:
+    """Report ready only once the startup warm-up has completed."""
+    if not context.is_ready():
+        return Response(status_code=status.HTTP_503_SERVICE_UNAVAILABLE)
+    return Response(status_code=status.HTTP_200_OK)
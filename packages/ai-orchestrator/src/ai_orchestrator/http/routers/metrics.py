@@ -0,0 +1,21 @@
+from fastapi import APIRouter, Depends, Response, status
+from opentelemetry.sdk.metrics.export import InMemoryMetricReader
+
+from ai_orchestrator.histogram import histograms
+from ai_orchestrator.http import prometheus
+from ai_orchestrator.http.dependencies import get_metrics_reader
+
+router = APIRouter()
+
+
+@router.get("/metrics")
+async def metrics(
+    reader: InMemoryMetricReader | None = Depends(get_metrics_reader),
+) -> Response:
+    """Expose the process's metrics for Prometheus to scrape."""
+    if reader is None:
+        return Response(status_code=status.HTTP_404_NOT_FOUND)
+    return Response(
+        content=prometheus.render(reader.get_metrics_data(), histograms()),
+        media_type=prometheus.CONTENT_TYPE,
+    )
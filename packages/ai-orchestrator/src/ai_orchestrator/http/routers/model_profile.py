@@ -20,7 +20,7 @@ async def get_model_profile(
 ) -> ModelProfileResponse:
     """Get a model profile by ID."""
     repository = context.get_model_profile_repository()
-    profile = repository.get_by_id(model_profile_id)
+    profile = await repository.get_by_id(model_profile_id)
 
     if profile is None:
         raise HTTPException(
@@ -39,4 +39,5 @@ async def get_model_profile(
         temperature=profile.temperature,
         top_p=profile.top_p,
         max_tokens=profile.max_tokens,
+        response_cache_enabled=profile.response_cache_enabled,
     )
@@ -2,7 +2,13 @@ from fastapi import FastAPI
 from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
 
 from ai_orchestrator.http.middleware import RequestContextMiddleware
-from ai_orchestrator.http.routers import graph_profile, health, model_profile
+from ai_orchestrator.http.routers import (
+    admin,
+    graph_profile,
+    health,
+    metrics,
+    model_profile,
+)
 
 app = FastAPI(
     title="AI Orchestrator",
@@ -12,6 +18,8 @@ app = FastAPI(
 app.include_router(health.router, prefix="/api/v1")
 app.include_router(graph_profile.router, prefix="/api/v1")
 app.include_router(model_profile.router, prefix="/api/v1")
+app.include_router(metrics.router)
+app.include_router(admin.router)
 
 FastAPIInstrumentor.instrument_app(app)
 
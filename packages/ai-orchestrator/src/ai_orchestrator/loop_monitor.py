@@ -0,0 +1,197 @@
+"""Event loop responsiveness monitoring."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from dataclasses import dataclass
+from types import TracebackType
+
+from opentelemetry import metrics
+
+from ai_orchestrator.exceptions import BlockedEventLoopError
+
+log = logging.getLogger("event_loop")
+meter = metrics.get_meter("event_loop")
+
+_lag = meter.create_histogram(
+    "event_loop.lag",
+    unit="s",
+    description="How late the event loop woke a sleeping task",
+)
+_slow_callbacks = meter.create_counter(
+    "event_loop.slow_callbacks",
+    unit="{callback}",
+    description="Times the event loop was blocked longer than the slow callback threshold",
+)
+
+
+@dataclass(frozen=True)
+class SlowCallback:
+    """
+    A stretch of time during which the event loop was blocked.
+
+    Attributes:
+        duration_s: How long the loop was blocked, as seen by the monitor.
+        stack: The loop thread's stack while it was blocked, innermost call
+            last, or None if the block ended before the watchdog saw it.
+    """
+
+    duration_s: float
+    stack: str | None
+
+
+class EventLoopLagMonitor:
+    """
+    Measures event loop lag by timing how late a periodic sleep wakes up.
+
+    Anything that blocks the loop (CPU-heavy work, blocking I/O, long
+    callbacks) delays every stream in the process; the lag shows by how much.
+
+    With a slow callback threshold, a watchdog thread also checks whether
+    the monitor's sleep is overdue by more than the threshold. If it is, the
+    watchdog captures the loop thread's stack, which shows the code that is
+    blocking it. Each block is logged and kept in ``slow_callbacks`` once the
+    loop resumes. In strict mode, leaving the monitor's ``async with`` block
+    raises BlockedEventLoopError if anything blocked the loop, which lets
+    tests assert that code under test never blocks.
+    """
+
+    def __init__(
+        self,
+        interval_s: float = 0.1,
+        slow_callback_s: float | None = None,
+        strict: bool = False,
+        history: int = 32,
+    ) -> None:
+        """
+        Initialize the monitor.
+
+        Args:
+            interval_s: Time between samples, in seconds.
+            slow_callback_s: Blocks longer than this are recorded with their
+                stack; None disables the watchdog.
+            strict: Raise when leaving ``async with`` if any block was recorded.
+            history: Number of recent slow callbacks to keep.
+        """
+        self._interval_s = interval_s
+        self._slow_callback_s = slow_callback_s
+        self._strict = strict
+        self.last_lag_s = 0.0
+        self.slow_callbacks: deque[SlowCallback] = deque(maxlen=history)
+        self._blocked_count = 0
+
+        # Shared with the watchdog thread; plain assignments are atomic
+        self._loop_thread_id: int | None = None
+        self._due_at: float | None = None
+        self._tick = 0
+        self._captured: tuple[int, str] | None = None
+        self._stopped = threading.Event()
+        self._task: asyncio.Task[None] | None = None
+
+    async def run(self) -> None:
+        """Sample the lag until cancelled."""
+        self._loop_thread_id = threading.get_ident()
+        watchdog = None
+        if self._slow_callback_s is not None:
+            self._stopped.clear()
+            watchdog = threading.Thread(
+                target=self._watch, name="event-loop-watchdog", daemon=True
+            )
+            watchdog.start()
+
+        interval_s = self._interval_s
+        try:
+            while True:
+                start = time.perf_counter()
+                self._due_at = start + interval_s
+                await asyncio.sleep(interval_s)
+                self._due_at = None
+                self.last_lag_s = max(time.perf_counter() - start - interval_s, 0.0)
+                _lag.record(self.last_lag_s)
+                if (
+                    self._slow_callback_s is not None
+                    and self.last_lag_s >= self._slow_callback_s
+                ):
+                    self._record_slow(self.last_lag_s)
+                self._tick += 1
+        finally:
+            # A block still in progress when the monitor stops counts too
+            due_at = self._due_at
+            self._due_at = None
+            if due_at is not None and self._slow_callback_s is not None:
+                lag_s = time.perf_counter() - due_at
+                if lag_s >= self._slow_callback_s:
+                    self._record_slow(lag_s)
+            if watchdog is not None:
+                self._stopped.set()
+
+    async def __aenter__(self) -> EventLoopLagMonitor:
+        """Start monitoring in a background task."""
+        self._task = asyncio.create_task(self.run())
+        # Let the task start its first sleep before the caller runs
+        await asyncio.sleep(0)
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        """
+        Stop monitoring.
+
+        Raises:
+            BlockedEventLoopError: In strict mode, if the loop was blocked.
+        """
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._strict and self._blocked_count and exc_type is None:
+            worst = max(self.slow_callbacks, key=lambda slow: slow.duration_s)
+            raise BlockedEventLoopError(
+                f"event loop was blocked {self._blocked_count} time(s), "
+                f"longest {worst.duration_s * 1000:.0f} ms",
+                self.slow_callbacks,
+            )
+
+    def _record_slow(self, duration_s: float) -> None:
+        captured = self._captured
+        stack = (
+            captured[1] if captured is not None and captured[0] == self._tick else None
+        )
+        self._blocked_count += 1
+        self.slow_callbacks.append(SlowCallback(duration_s=duration_s, stack=stack))
+        _slow_callbacks.add(1)
+        log.warning(
+            "event_loop.slow_callback",
+            extra={"duration_ms": round(duration_s * 1000, 1), "stack": stack},
+        )
+
+    def _watch(self) -> None:
+        """Capture the loop thread's stack while it is blocked (watchdog thread)."""
+        assert self._slow_callback_s is not None
+        threshold_s = self._slow_callback_s
+        check_s = max(threshold_s / 2, 0.001)
+        while not self._stopped.wait(check_s):
+            # Read the tick first, so a sample finishing in between is seen
+            # with the next, not yet overdue, due time
+            tick = self._tick
+            due_at = self._due_at
+            if due_at is None or time.perf_counter() - due_at < threshold_s:
+                continue
+            if self._captured is not None and self._captured[0] == tick:
+                continue
+            frame = sys._current_frames().get(self._loop_thread_id or 0)
+            if frame is not None:
+                self._captured = (tick, "".join(traceback.format_stack(frame)))
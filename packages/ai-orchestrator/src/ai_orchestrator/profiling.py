@@ -0,0 +1,351 @@
+"""On-demand CPU and memory profiling of the running process."""
+
+from __future__ import annotations
+
+import asyncio
+import signal
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from dataclasses import dataclass, field
+from types import CodeType, FrameType
+from typing import Any
+
+# A stack as frame labels, outermost first
+Stack = tuple[str, ...]
+
+# Root of event loop samples taken outside any task (I/O wait, plain callbacks)
+LOOP_FRAME = "<loop>"
+
+
+@dataclass
+class CpuProfile:
+    """
+    Stacks sampled from running threads.
+
+    Attributes:
+        stacks: Number of samples per distinct stack.
+        interval_s: Time between samples.
+        duration_s: Time spent sampling.
+    """
+
+    stacks: Counter[Stack] = field(default_factory=Counter)
+    interval_s: float = 0.0
+    duration_s: float = 0.0
+
+    def collapsed(self) -> str:
+        """
+        Render the samples as collapsed stacks, one ``a;b;c count`` per line.
+
+        This is the input format of flamegraph.pl, inferno and speedscope.
+        """
+        lines = [f"{';'.join(stack)} {count}" for stack, count in self.stacks.items()]
+        return "\n".join(sorted(lines)) + "\n"
+
+    def speedscope(self, name: str) -> dict[str, Any]:
+        """
+        Render the samples as a speedscope sampled profile.
+
+        Args:
+            name: Profile name shown in speedscope.
+
+        Returns:
+            A document following https://www.speedscope.app/file-format-schema.json.
+        """
+        frame_index: dict[str, int] = {}
+        samples: list[list[int]] = []
+        weights: list[float] = []
+        for stack, count in self.stacks.items():
+            samples.append(
+                [frame_index.setdefault(label, len(frame_index)) for label in stack]
+            )
+            weights.append(count * self.interval_s)
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": name,
+            "exporter": "ai-orchestrator",
+            "activeProfileIndex": 0,
+            "shared": {"frames": [{"name": label} for label in frame_index]},
+            "profiles": [
+                {
+                    "type": "sampled",
+                    "name": name,
+                    "unit": "seconds",
+                    "startValue": 0,
+                    "endValue": sum(weights),
+                    "samples": samples,
+                    "weights": weights,
+                }
+            ],
+        }
+
+
+class StackSampler:
+    """
+    Base class for samplers, turning frames into counted stacks.
+
+    Samples of an event loop thread are attributed to the task running at
+    that moment, with the task's coroutine as the root frame, so time spent
+    in each kind of request shows up as its own tower in a flamegraph.
+    Samples taken outside any task, e.g. while the loop waits for I/O, are
+    rooted at ``<loop>``.
+    """
+
+    def __init__(
+        self, interval_s: float, loop: asyncio.AbstractEventLoop | None = None
+    ) -> None:
+        """
+        Initialize the sampler.
+
+        Args:
+            interval_s: Time between samples, in seconds.
+            loop: Event loop whose thread is sampled with task attribution.
+        """
+        self._interval_s = interval_s
+        self._loop = loop
+        self._loop_thread_id: int | None = None
+        self._labels: dict[CodeType, str] = {}
+        self._profile = CpuProfile(interval_s=interval_s)
+        self._started_at = 0.0
+
+    def start(self) -> None:
+        """Start sampling, from the event loop thread when a loop is given."""
+        if self._loop is not None:
+            self._loop_thread_id = threading.get_ident()
+        self._started_at = time.perf_counter()
+
+    def stop(self) -> CpuProfile:
+        """
+        Stop sampling.
+
+        Returns:
+            The samples collected since start().
+        """
+        self._profile.duration_s = time.perf_counter() - self._started_at
+        return self._profile
+
+    def _record(self, thread_name: str, thread_id: int, frame: FrameType) -> None:
+        stack = self._stack(frame)
+        if thread_id == self._loop_thread_id:
+            task = asyncio.current_task(self._loop)
+            if task is None:
+                root = LOOP_FRAME
+            else:
+                coro = task.get_coro()
+                root = f"task:{getattr(coro, '__qualname__', task.get_name())}"
+            stack = (root, *stack)
+        self._profile.stacks[(f"thread:{thread_name}", *stack)] += 1
+
+    def _stack(self, frame: FrameType | None) -> Stack:
+        labels: list[str] = []
+        while frame is not None:
+            code = frame.f_code
+            label = self._labels.get(code)
+            if label is None:
+                label = self._labels[code] = (
+                    f"{code.co_qualname} ({code.co_filename}:{code.co_firstlineno})"
+                ).replace(";", ":")
+            labels.append(label)
+            frame = frame.f_back
+        labels.reverse()
+        return tuple(labels)
+
+
+class SignalStackSampler(StackSampler):
+    """
+    CPU sampler for the main thread, driven by a SIGPROF interval timer.
+
+    The timer fires after every interval of CPU time used by the process,
+    and the handler records the frame the main thread was executing. Since
+    samples are taken by the sampled thread itself, they are exact, and time
+    spent waiting for I/O is not sampled at all. The timer and handler only
+    exist while sampling.
+    """
+
+    def __init__(
+        self, interval_s: float, loop: asyncio.AbstractEventLoop | None = None
+    ) -> None:
+        """
+        Initialize the sampler.
+
+        Args:
+            interval_s: CPU time between samples, in seconds.
+            loop: Event loop running on the main thread, for task attribution.
+        """
+        super().__init__(interval_s, loop)
+        self._previous_handler: Any = None
+        self._thread_name = threading.main_thread().name
+
+    def start(self) -> None:
+        """Start sampling; must be called from the main thread."""
+        super().start()
+        self._previous_handler = signal.signal(signal.SIGPROF, self._on_signal)
+        signal.setitimer(signal.ITIMER_PROF, self._interval_s, self._interval_s)
+
+    def stop(self) -> CpuProfile:
+        """Stop sampling and restore the previous SIGPROF handler."""
+        signal.setitimer(signal.ITIMER_PROF, 0)
+        signal.signal(signal.SIGPROF, self._previous_handler)
+        return super().stop()
+
+    def _on_signal(self, signum: int, frame: FrameType | None) -> None:
+        if frame is not None:
+            self._record(self._thread_name, threading.get_ident(), frame)
+
+
+class ThreadStackSampler(StackSampler):
+    """
+    Wall-clock sampler reading other threads' stacks from its own thread.
+
+    Works for any thread, but the sampler can only run when it gets the
+    GIL, which a busy event loop mostly releases in its I/O wait, so loop
+    samples are biased towards ``select``. SignalStackSampler is exact for
+    the main thread.
+    """
+
+    def __init__(
+        self,
+        interval_s: float,
+        loop: asyncio.AbstractEventLoop | None = None,
+        thread_ids: set[int] | None = None,
+    ) -> None:
+        """
+        Initialize the sampler.
+
+        Args:
+            interval_s: Time between samples, in seconds.
+            loop: Event loop whose thread is sampled with task attribution.
+            thread_ids: Threads to sample; all threads but the sampler's if None.
+        """
+        super().__init__(interval_s, loop)
+        self._thread_ids = thread_ids
+        self._stopped = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        """Start the sampling thread."""
+        super().start()
+        self._thread = threading.Thread(
+            target=self._run, name="stack-sampler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> CpuProfile:
+        """Stop the sampling thread."""
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        return super().stop()
+
+    def _run(self) -> None:
+        own_id = threading.get_ident()
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        while not self._stopped.wait(self._interval_s):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                if self._thread_ids is not None and thread_id not in self._thread_ids:
+                    continue
+                if thread_id not in names:
+                    names = {t.ident: t.name for t in threading.enumerate()}
+                self._record(names.get(thread_id, str(thread_id)), thread_id, frame)
+
+
+async def profile_cpu(
+    duration_s: float, interval_s: float = 0.01, all_threads: bool = False
+) -> CpuProfile:
+    """
+    Sample the process's stacks for a while.
+
+    The event loop is sampled exactly by CPU time when it runs on the main
+    thread. Otherwise, or for all threads, stacks are sampled by wall-clock
+    time from a separate thread.
+
+    Args:
+        duration_s: How long to sample, in seconds.
+        interval_s: Time between samples, in seconds.
+        all_threads: Sample every thread rather than just the event loop's.
+
+    Returns:
+        The collected samples.
+    """
+    loop = asyncio.get_running_loop()
+    sampler: StackSampler
+    if (
+        not all_threads
+        and threading.current_thread() is threading.main_thread()
+        and hasattr(signal, "setitimer")
+    ):
+        sampler = SignalStackSampler(interval_s, loop=loop)
+    else:
+        sampler = ThreadStackSampler(
+            interval_s,
+            loop=loop,
+            thread_ids=None if all_threads else {threading.get_ident()},
+        )
+    sampler.start()
+    try:
+        await asyncio.sleep(duration_s)
+    finally:
+        profile = sampler.stop()
+    return profile
+
+
+@dataclass(frozen=True)
+class Allocation:
+    """
+    Memory allocated at one place and still alive at the end of a trace.
+
+    Attributes:
+        size_bytes: Total size of the live blocks.
+        count: Number of live blocks.
+        traceback: Allocating frames as ``file:line``, outermost first.
+    """
+
+    size_bytes: int
+    count: int
+    traceback: list[str]
+
+
+async def profile_memory(
+    duration_s: float, limit: int = 25, frames: int = 10
+) -> list[Allocation]:
+    """
+    Trace allocations for a while and report the top allocators.
+
+    Tracing is switched on only for the duration (unless it was already on),
+    since it slows down every allocation.
+
+    Args:
+        duration_s: How long to trace, in seconds.
+        limit: Number of allocation sites to report.
+        frames: Number of frames kept per allocation traceback.
+
+    Returns:
+        Allocation sites made during the trace, largest first.
+    """
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start(frames)
+    try:
+        before = tracemalloc.take_snapshot()
+        await asyncio.sleep(duration_s)
+        after = tracemalloc.take_snapshot()
+    finally:
+        if not was_tracing:
+            tracemalloc.stop()
+
+    stats = after.compare_to(before, "traceback")
+    growing = [stat for stat in stats if stat.size_diff > 0]
+    growing.sort(key=lambda stat: stat.size_diff, reverse=True)
+    return [
+        Allocation(
+            size_bytes=stat.size_diff,
+            count=stat.count_diff,
+            traceback=[f"{frame.filename}:{frame.lineno}" for frame in stat.traceback],
+        )
+        for stat in growing[:limit]
+    ]
@@ -1,41 +1,83 @@
 from __future__ import annotations
 
 import logging
+import queue
+from logging.handlers import QueueListener
 
-from opentelemetry import trace
+from opentelemetry import metrics, trace
 from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import OTLPSpanExporter
 from opentelemetry.instrumentation.logging import LoggingInstrumentor
+from opentelemetry.sdk.metrics import (
+    AlwaysOffExemplarFilter,
+    Histogram,
+    MeterProvider,
+)
+from opentelemetry.sdk.metrics.export import InMemoryMetricReader
+from opentelemetry.sdk.metrics.view import ExplicitBucketHistogramAggregation, View
 from opentelemetry.sdk.resources import Resource
 from opentelemetry.sdk.trace import TracerProvider
 from opentelemetry.sdk.trace.export import BatchSpanProcessor
 from pythonjsonlogger import jsonlogger
 
 from ai_infra.settings import Settings
+from ai_orchestrator.async_logging import (
+    DroppingQueueHandler,
+    JsonLogFormatter,
+    LogSampler,
+)
+from ai_orchestrator.histogram import LATENCY_BUCKETS_S
 
+TOKENS_PER_S_BUCKETS = (1, 5, 10, 20, 30, 50, 75, 100, 150, 200, 300, 500, 1000)
 
-def configure_logging(settings: Settings) -> None:
+
+def configure_logging(settings: Settings) -> QueueListener | None:
     """
     Configure JSON-formatted logging.
 
     Sets up logging with JSON formatter, configures log level from settings,
     and instruments logging with OpenTelemetry to inject trace/span IDs.
+
+    With ``log_async`` enabled, records are only queued on the calling
+    thread; a listener thread formats and writes them. The queue is bounded
+    and drops records rather than block the event loop when output falls
+    behind. ``log_sample_rates`` keeps a fraction of high-volume loggers'
+    info and debug records in either mode.
+
+    Returns:
+        The started listener in async mode, to be stopped at shutdown.
     """
     level = settings.log_level.upper()
 
     root = logging.getLogger()
     root.setLevel(level)
 
-    handler = logging.StreamHandler()
+    handler: logging.Handler = logging.StreamHandler()
+    listener: QueueListener | None = None
 
-    formatter = jsonlogger.JsonFormatter(
-        "%(asctime)s %(levelname)s %(name)s %(message)s %(request_id)s"
-    )
-    handler.setFormatter(formatter)
+    if settings.log_async:
+        handler.setFormatter(JsonLogFormatter())
+        log_queue: queue.Queue[logging.LogRecord] = queue.Queue(
+            maxsize=settings.log_queue_size
+        )
+        listener = QueueListener(log_queue, handler)
+        handler = DroppingQueueHandler(log_queue)
+    else:
+        formatter = jsonlogger.JsonFormatter(
+            "%(asctime)s %(levelname)s %(name)s %(message)s %(request_id)s"
+        )
+        handler.setFormatter(formatter)
+
+    if settings.log_sample_rates:
+        handler.addFilter(LogSampler(settings.log_sample_rates))
     root.handlers = [handler]
 
     # Inject trace/span ids into logs (works nicely with OTel)
     LoggingInstrumentor().instrument(set_logging_format=False)
 
+    if listener is not None:
+        listener.start()
+    return listener
+
 
 def configure_tracing(settings: Settings) -> None:
     """
@@ -63,3 +105,39 @@ def configure_tracing(settings: Settings) -> None:
         endpoint=str(settings.otel_exporter_otlp_endpoint), insecure=True
     )
     provider.add_span_processor(BatchSpanProcessor(exporter))
+
+
+def configure_metrics(settings: Settings) -> InMemoryMetricReader | None:
+    """
+    Configure OpenTelemetry metrics for the Prometheus /metrics endpoint.
+
+    Metrics are aggregated in process and only collected when scraped, so
+    recording a value is a lock and a bucket increment. Exemplars are turned
+    off to keep it that way.
+
+    Returns:
+        The reader that /metrics collects from, or None if metrics are disabled.
+    """
+    if not settings.enable_metrics:
+        return None
+
+    # Despite its name, this is a plain pull reader: it collects on demand
+    reader = InMemoryMetricReader()
+    provider = MeterProvider(
+        metric_readers=[reader],
+        resource=Resource.create({"service.name": settings.service_name}),
+        exemplar_filter=AlwaysOffExemplarFilter(),
+        views=[
+            View(
+                instrument_type=Histogram,
+                instrument_unit="s",
+                aggregation=ExplicitBucketHistogramAggregation(LATENCY_BUCKETS_S),
+            ),
+            View(
+                instrument_name="chat_turn.tokens_per_second",
+                aggregation=ExplicitBucketHistogramAggregation(TOKENS_PER_S_BUCKETS),
+            ),
+        ],
+    )
+    metrics.set_meter_provider(provider)
+    return reader
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from uuid import uuid4
+
+from ai_core.orchestration.graphs import get_graph, graph_registry
+from ai_core.orchestration.orchestrator import ChatOrchestrator
+from ai_core.orchestration.services import Services
+from ai_orchestrator.context import AppContext
+
+log = logging.getLogger("warmup")
+
+
+async def warm_up(app_context: AppContext) -> None:
+    """
+    Warm up the application and then mark it ready.
+
+    Loads all profiles (priming the profile cache and the database pool),
+    compiles every registered graph, loads the configured tokenizers, opens
+    upstream LLM connections and optionally runs a synthetic dummy_v1 turn.
+    Profile loading is retried until it succeeds, since serving traffic
+    without the database is pointless; an unreachable upstream or a failing
+    synthetic turn only logs a warning.
+
+    Args:
+        app_context: Application context with Settings, repositories, and LLMClient.
+    """
+    settings = app_context.get_settings()
+    if not settings.warmup_enabled:
+        app_context.mark_ready()
+        return
+
+    start = time.perf_counter()
+
+    while True:
+        try:
+            graph_profiles, model_profiles = await asyncio.gather(
+                app_context.get_graph_profile_repository().get_all(),
+                app_context.get_model_profile_repository().get_all(),
+            )
+            break
+        except Exception as e:
+            log.warning("warmup.load_profiles_failed", extra={"error": str(e)})
+            await asyncio.sleep(settings.warmup_retry_delay_s)
+
+    for graph_name in graph_registry:
+        get_graph(graph_name)
+
+    # Loading tokenizer.json files takes hundreds of milliseconds each
+    await app_context.get_token_counter().preload()
+
+    # The remaining steps only save first-request latency; failing them must
+    # not keep the app from becoming ready
+    try:
+        await app_context.get_llm_client().warm_up()
+    except Exception as e:
+        log.warning("warmup.llm_connections_failed", extra={"error": str(e)})
+
+    if settings.warmup_synthetic_turn:
+        try:
+            await run_synthetic_turn()
+        except Exception as e:
+            log.warning("warmup.synthetic_turn_failed", extra={"error": str(e)})
+
+    app_context.mark_ready()
+    log.info(
+        "warmup.finish",
+        extra={
+            "graph_profiles": len(graph_profiles),
+            "model_profiles": len(model_profiles),
+            "graphs": len(graph_registry),
+            "latency_ms": int((time.perf_counter() - start) * 1000),
+        },
+    )
+
+
+async def run_synthetic_turn() -> None:
+    """Run one turn through the dummy_v1 graph to exercise the orchestration path."""
+    # dummy_v1 makes no LLM calls, so it needs no LLM service
+    services = Services(llm_main=None)  # type: ignore[arg-type]
+    orchestrator = ChatOrchestrator(get_graph("dummy_v1"), services)
+    initial_state = {
+        "request_id": uuid4(),
+        "session_id": uuid4(),
+        "user_id": uuid4(),
+        "model_bindings": {},
+        "messages": ["warm-up"],
+    }
+    async for _ in orchestrator.execute(initial_state):
+        pass
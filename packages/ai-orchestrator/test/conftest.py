@@ -1,7 +1,9 @@
-from unittest.mock import Mock, patch
+from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
+import pytest_asyncio
 from ai_orchestrator.http.server import app as fastapi_app
+from ai_orchestrator.loop_monitor import EventLoopLagMonitor
 from fastapi.testclient import TestClient
 
 
@@ -16,8 +18,8 @@ def mock_app_context():
         mock_context = Mock()
 
         # Setup repositories
-        mock_graph_repo = Mock()
-        mock_model_repo = Mock()
+        mock_graph_repo = AsyncMock()
+        mock_model_repo = AsyncMock()
 
         mock_context.get_graph_profile_repository.return_value = mock_graph_repo
         mock_context.get_model_profile_repository.return_value = mock_model_repo
@@ -26,3 +28,12 @@ def mock_app_context():
         fastapi_app.state.context = mock_context
 
         yield mock_context
+
+
+@pytest_asyncio.fixture
+async def strict_event_loop():
+    """Fail the test if anything blocks the event loop for more than 50 ms."""
+    async with EventLoopLagMonitor(
+        interval_s=0.01, slow_callback_s=0.05, strict=True
+    ) as monitor:
+        yield monitor
@@ -0,0 +1,83 @@
+import io
+import json
+import logging
+import queue
+from logging.handlers import QueueListener
+from uuid import UUID
+
+from ai_orchestrator import async_logging
+from ai_orchestrator.async_logging import (
+    DroppingQueueHandler,
+    JsonLogFormatter,
+    LogSampler,
+)
+
+
+def make_record(
+    name: str = "grpc", level: int = logging.INFO, msg: str = "request.start", **extra
+) -> logging.LogRecord:
+    record = logging.LogRecord(name, level, __file__, 1, msg, None, None)
+    record.__dict__.update(extra)
+    return record
+
+
+def test_formatter_writes_extras_as_json():
+    request_id = UUID(int=1)
+    record = make_record(request_id="r-1", graph_profile_id=request_id, chunks=3)
+
+    payload = json.loads(JsonLogFormatter().format(record))
+
+    assert payload["levelname"] == "INFO"
+    assert payload["name"] == "grpc"
+    assert payload["message"] == "request.start"
+    assert payload["request_id"] == "r-1"
+    assert payload["graph_profile_id"] == str(request_id)
+    assert payload["chunks"] == 3
+    assert "pathname" not in payload
+
+
+def test_sampler_applies_rates_per_logger_and_keeps_warnings():
+    sampler = LogSampler({"sql_alchemy": 0.0, "sql_alchemy.notifications": 1.0})
+
+    assert not sampler.filter(make_record("sql_alchemy.repositories"))
+    assert sampler.filter(make_record("sql_alchemy.notifications"))
+    assert sampler.filter(make_record("sql_alchemy.repositories", logging.WARNING))
+    assert sampler.filter(make_record("grpc"))
+
+
+def test_sampler_keeps_or_drops_a_request_together():
+    sampler = LogSampler({"grpc": 0.5})
+
+    for i in range(20):
+        start = sampler.filter(make_record(request_id=f"r-{i}"))
+        finish = sampler.filter(make_record(msg="request.finish", request_id=f"r-{i}"))
+        assert start == finish
+
+
+def test_full_queue_drops_and_counts_instead_of_blocking():
+    log_queue: queue.Queue[logging.LogRecord] = queue.Queue(maxsize=2)
+    handler = DroppingQueueHandler(log_queue)
+    dropped = async_logging._dropped["queue_full"]
+
+    for i in range(5):
+        handler.handle(make_record(msg="tick %d", request_id=str(i)))
+
+    assert log_queue.qsize() == 2
+    assert async_logging._dropped["queue_full"] == dropped + 3
+
+
+def test_listener_formats_and_writes_queued_records():
+    stream = io.StringIO()
+    output = logging.StreamHandler(stream)
+    output.setFormatter(JsonLogFormatter())
+    log_queue: queue.Queue[logging.LogRecord] = queue.Queue(maxsize=10)
+    listener = QueueListener(log_queue, output)
+    handler = DroppingQueueHandler(log_queue)
+
+    listener.start()
+    record = make_record(msg="chunks %d")
+    record.args = (7,)
+    handler.handle(record)
+    listener.stop()
+
+    assert json.loads(stream.getvalue())["message"] == "chunks 7"
@@ -0,0 +1,183 @@
+from collections.abc import AsyncIterator
+from datetime import datetime, timezone
+from unittest.mock import Mock
+from uuid import uuid4
+
+import pytest
+
+from ai_core.models import GenerationParams, GraphProfile, ModelProfile
+from ai_core.orchestration.services.llm_service import ChatRequest, ChatResponse
+from ai_core.orchestration.services.token_counter import TokenCounter
+from ai_core.orchestration.streaming import (
+    ChatStreamEvent,
+    StreamDone,
+    StreamUsage,
+    TokenDelta,
+    Usage,
+)
+from ai_infra.llms.client import build_payload
+from ai_orchestrator.exceptions import ChatTurnPlanError
+from ai_orchestrator.grpc.generated.aisp.v1 import chat_orchestrator_pb2
+from ai_orchestrator.grpc.params import requested_generation_params
+from ai_orchestrator.grpc.servicers.chat_orchestrator import ChatOrchestratorService
+
+
+class RecordingLLMClient:
+    """LLM client that records requests and streams a one-token answer."""
+
+    def __init__(self) -> None:
+        self.requests: list[ChatRequest] = []
+
+    async def chat(self, request: ChatRequest) -> ChatResponse:
+        raise NotImplementedError
+
+    async def stream_chat(self, request: ChatRequest) -> AsyncIterator[ChatStreamEvent]:
+        self.requests.append(request)
+        yield TokenDelta(text="Hi")
+        yield StreamUsage(
+            usage=Usage(prompt_tokens=3, completion_tokens=1, total_tokens=4)
+        )
+        yield StreamDone(finish_reason="stop")
+
+
+def make_profiles() -> tuple[GraphProfile, ModelProfile]:
+    now = datetime.now(timezone.utc)
+    graph_profile = GraphProfile(
+        id=uuid4(),
+        name="Default",
+        version_major=1,
+        version_minor=0,
+        graph_name="default_v1",
+        created_at=now,
+        updated_at=now,
+        is_active=True,
+    )
+    model_profile = ModelProfile(
+        id=uuid4(),
+        name="Test Model",
+        description="",
+        model="test-model",
+        created_at=now,
+        updated_at=now,
+        is_active=True,
+        temperature=0.7,
+        max_tokens=512,
+    )
+    return graph_profile, model_profile
+
+
+async def run_turn(
+    app_context: Mock, metadata: list[tuple[str, str]]
+) -> tuple[RecordingLLMClient, list[chat_orchestrator_pb2.ChatEvent]]:
+    graph_profile, model_profile = make_profiles()
+    app_context.get_graph_profile_repository().get_by_id.return_value = graph_profile
+    app_context.get_model_profile_repository().get_by_ids.return_value = {
+        model_profile.id: model_profile
+    }
+    client = RecordingLLMClient()
+    app_context.get_llm_client.return_value = client
+    app_context.get_token_counter.return_value = TokenCounter()
+
+    request = chat_orchestrator_pb2.ChatTurnRequest(
+        request_id=str(uuid4()),
+        session_id=str(uuid4()),
+        user_id=str(uuid4()),
+        assistant=chat_orchestrator_pb2.AssistantConfig(
+            assistant_id=str(uuid4()),
+            graph_profile_id=str(graph_profile.id),
+            model_bindings=[
+                chat_orchestrator_pb2.ModelBinding(
+                    slot_name="main", model_profile_id=str(model_profile.id)
+                )
+            ],
+        ),
+        input=chat_orchestrator_pb2.UserInput(message="Hello"),
+    )
+    context = Mock()
+    context.time_remaining.return_value = None
+    context.invocation_metadata.return_value = metadata
+
+    service = ChatOrchestratorService(app_context)
+    events = [event async for event in service.ChatTurn(request, context)]
+    return client, events
+
+
+@pytest.fixture
+def chat_app_context(mock_app_context):
+    mock_app_context.get_settings.return_value = Mock(
+        grpc_coalesce_tokens=False, history_max_tokens=None, turn_token_budget=None
+    )
+    return mock_app_context
+
+
+def test_generation_params_are_read_from_metadata():
+    params = requested_generation_params(
+        [
+            ("x-aisp-temperature", "0.2"),
+            ("x-aisp-max-tokens", b"64"),
+            ("x-aisp-stop", "END"),
+            ("x-aisp-stop", "\n\n"),
+            ("x-aisp-coalesce", "off"),
+        ]
+    )
+
+    assert params == GenerationParams(
+        temperature=0.2, max_tokens=64, stop=("END", "\n\n")
+    )
+    assert requested_generation_params([("x-aisp-coalesce", "off")]) is None
+    assert requested_generation_params(None) is None
+
+
+@pytest.mark.parametrize(
+    "key, value",
+    [
+        ("x-aisp-temperature", "hot"),
+        ("x-aisp-temperature", "nan"),
+        ("x-aisp-top-p", "1.5"),
+        ("x-aisp-max-tokens", "0"),
+        ("x-aisp-max-tokens", "12.5"),
+    ],
+)
+def test_invalid_generation_params_are_rejected(key, value):
+    with pytest.raises(ChatTurnPlanError) as excinfo:
+        requested_generation_params([(key, value)])
+
+    assert excinfo.value.code == "INVALID_GENERATION_PARAMS"
+
+
+@pytest.mark.asyncio
+async def test_metadata_params_override_the_profile_in_the_upstream_payload(
+    chat_app_context,
+):
+    client, events = await run_turn(
+        chat_app_context,
+        [("x-aisp-temperature", "0.1"), ("x-aisp-max-tokens", "32")],
+    )
+
+    assert events[-1].HasField("done")
+    payload = build_payload(client.requests[0])
+    assert payload["temperature"] == 0.1
+    assert payload["max_tokens"] == 32
+
+
+@pytest.mark.asyncio
+async def test_invalid_metadata_params_end_the_turn_with_an_error(chat_app_context):
+    client, events = await run_turn(chat_app_context, [("x-aisp-top-p", "-1")])
+
+    assert [event.error.code for event in events] == ["INVALID_GENERATION_PARAMS"]
+    assert client.requests == []
+
+
+@pytest.mark.asyncio
+async def test_turn_token_budget_caps_max_tokens_in_the_upstream_payload(
+    chat_app_context,
+):
+    chat_app_context.get_settings.return_value.turn_token_budget = 100
+
+    client, events = await run_turn(chat_app_context, [])
+    assert events[-1].HasField("done")
+    # The profile allows 512 tokens, but the turn only has 100 to spend
+    assert build_payload(client.requests[0])["max_tokens"] == 100
+
+    client, _ = await run_turn(chat_app_context, [("x-aisp-max-tokens", "32")])
+    assert build_payload(client.requests[0])["max_tokens"] == 32
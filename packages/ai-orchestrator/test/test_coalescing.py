@@ -0,0 +1,138 @@
+import asyncio
+from collections.abc import AsyncIterator
+
+import pytest
+
+from ai_core.orchestration.streaming import (
+    ChatStreamEvent,
+    StreamDone,
+    StreamUsage,
+    TokenDelta,
+    Usage,
+)
+from ai_orchestrator.grpc.coalescing import coalesce_tokens, coalescing_requested
+
+
+async def stream(
+    *events: ChatStreamEvent, delay_s: float = 0.0
+) -> AsyncIterator[ChatStreamEvent]:
+    for event in events:
+        if delay_s:
+            await asyncio.sleep(delay_s)
+        yield event
+
+
+def tokens(*texts: str) -> list[TokenDelta]:
+    return [TokenDelta(text=text) for text in texts]
+
+
+@pytest.mark.asyncio
+async def test_first_token_passes_through_and_burst_is_merged():
+    usage = StreamUsage(usage=Usage(prompt_tokens=1, completion_tokens=4))
+    source = stream(*tokens("a", "b", "c", "d"), usage, StreamDone())
+
+    events = [event async for event in coalesce_tokens(source, flush_interval_s=1)]
+
+    assert events == [TokenDelta(text="a"), TokenDelta(text="bcd"), usage, StreamDone()]
+
+
+@pytest.mark.asyncio
+async def test_flushes_at_byte_limit():
+    source = stream(*tokens("a", "bb", "cc", "dd", "e"), StreamDone())
+
+    events = [
+        event
+        async for event in coalesce_tokens(source, max_bytes=4, flush_interval_s=1)
+    ]
+
+    assert events == [*tokens("a", "bbcc", "dde"), StreamDone()]
+
+
+@pytest.mark.asyncio
+async def test_flushes_after_interval_while_upstream_is_quiet(strict_event_loop):
+    async def slow() -> AsyncIterator[ChatStreamEvent]:
+        yield TokenDelta(text="a")
+        yield TokenDelta(text="b")
+        await asyncio.sleep(0.2)
+        yield TokenDelta(text="c")
+        yield StreamDone()
+
+    received: list[tuple[float, ChatStreamEvent]] = []
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    async for event in coalesce_tokens(slow(), flush_interval_s=0.01):
+        received.append((loop.time() - start, event))
+
+    assert [event for _, event in received] == [*tokens("a", "b", "c"), StreamDone()]
+    # "b" was not held until "c" arrived
+    assert received[1][0] < 0.1
+
+
+@pytest.mark.asyncio
+async def test_error_is_raised_after_buffered_tokens():
+    async def failing() -> AsyncIterator[ChatStreamEvent]:
+        yield TokenDelta(text="a")
+        yield TokenDelta(text="b")
+        raise RuntimeError("upstream failed")
+
+    events = []
+    with pytest.raises(RuntimeError, match="upstream failed"):
+        async for event in coalesce_tokens(failing(), flush_interval_s=1):
+            events.append(event)
+
+    assert events == tokens("a", "b")
+
+
+@pytest.mark.asyncio
+async def test_slow_consumer_stops_the_source_being_read():
+    produced = 0
+
+    async def source() -> AsyncIterator[ChatStreamEvent]:
+        nonlocal produced
+        for i in range(1000):
+            produced += 1
+            yield TokenDelta(text=str(i))
+
+    events = coalesce_tokens(source(), flush_interval_s=1, max_pending=8)
+    await anext(events)
+    # The consumer stalls; the pump may only fill the queue and hold one more
+    await asyncio.sleep(0.01)
+    assert produced <= 1 + 8 + 1
+
+    rest = [event async for event in events]
+    assert "".join(event.text for event in rest) == "".join(
+        str(i) for i in range(1, 1000)
+    )
+
+
+@pytest.mark.asyncio
+async def test_closing_early_cancels_the_source():
+    cancelled = asyncio.Event()
+
+    async def endless() -> AsyncIterator[ChatStreamEvent]:
+        try:
+            while True:
+                yield TokenDelta(text="x")
+                await asyncio.sleep(0.001)
+        finally:
+            cancelled.set()
+
+    coalesced = coalesce_tokens(endless())
+    assert await anext(coalesced) == TokenDelta(text="x")
+    await coalesced.aclose()
+
+    assert cancelled.is_set()
+
+
+@pytest.mark.parametrize(
+    ("metadata", "default", "expected"),
+    [
+        (None, True, True),
+        ((("x-aisp-coalesce", "off"),), True, False),
+        ((("x-aisp-coalesce", b"false"),), True, False),
+        ((("x-aisp-coalesce", "on"),), False, True),
+        ((("other", "off"),), False, False),
+    ],
+)
+def test_coalescing_requested(metadata, default, expected):
+    assert coalescing_requested(metadata, default) is expected
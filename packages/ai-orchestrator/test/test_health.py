@@ -1,3 +1,15 @@
 def test_healthz(client):
     response = client.get("/api/v1/healthz")
     assert response.status_code == 200
+
+
+def test_readyz_not_ready(client, mock_app_context):
+    mock_app_context.is_ready.return_value = False
+    response = client.get("/api/v1/readyz")
+    assert response.status_code == 503
+
+
+def test_readyz_ready(client, mock_app_context):
+    mock_app_context.is_ready.return_value = True
+    response = client.get("/api/v1/readyz")
+    assert response.status_code == 200
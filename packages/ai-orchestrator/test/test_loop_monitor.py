@@ -0,0 +1,54 @@
+import asyncio
+import time
+
+import pytest
+
+from ai_orchestrator.exceptions import BlockedEventLoopError
+from ai_orchestrator.loop_monitor import EventLoopLagMonitor
+
+
+def block_loop(seconds: float) -> None:
+    time.sleep(seconds)
+
+
+@pytest.mark.asyncio
+async def test_blocking_call_shows_up_as_lag():
+    monitor = EventLoopLagMonitor(interval_s=0.01)
+    task = asyncio.create_task(monitor.run())
+    await asyncio.sleep(0)
+
+    time.sleep(0.05)
+    await asyncio.sleep(0.001)
+    task.cancel()
+
+    assert monitor.last_lag_s >= 0.03
+
+
+@pytest.mark.asyncio
+async def test_slow_callback_is_recorded_with_its_stack():
+    async with EventLoopLagMonitor(interval_s=0.01, slow_callback_s=0.02) as monitor:
+        block_loop(0.1)
+        await asyncio.sleep(0.02)
+
+    assert len(monitor.slow_callbacks) == 1
+    slow = monitor.slow_callbacks[0]
+    assert slow.duration_s >= 0.05
+    assert slow.stack is not None
+    assert "block_loop" in slow.stack
+
+
+@pytest.mark.asyncio
+async def test_strict_mode_fails_when_the_loop_blocks():
+    with pytest.raises(BlockedEventLoopError) as excinfo:
+        async with EventLoopLagMonitor(
+            interval_s=0.01, slow_callback_s=0.02, strict=True
+        ):
+            block_loop(0.05)
+
+    assert len(excinfo.value.slow_callbacks) == 1
+
+
+@pytest.mark.asyncio
+async def test_strict_mode_passes_when_nothing_blocks():
+    async with EventLoopLagMonitor(interval_s=0.01, slow_callback_s=0.05, strict=True):
+        await asyncio.sleep(0.05)
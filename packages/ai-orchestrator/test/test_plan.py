@@ -0,0 +1,141 @@
+from datetime import datetime, timezone
+from uuid import uuid4
+
+import pytest
+
+from ai_core.models import GraphProfile, ModelProfile
+from ai_orchestrator.exceptions import ChatTurnPlanError
+from ai_orchestrator.grpc.generated.aisp.v1 import chat_orchestrator_pb2
+from ai_orchestrator.grpc.plan import ChatTurnPlan
+
+
+def make_graph_profile() -> GraphProfile:
+    now = datetime.now(timezone.utc)
+    return GraphProfile(
+        id=uuid4(),
+        name="Dummy",
+        version_major=1,
+        version_minor=0,
+        graph_name="dummy_v1",
+        created_at=now,
+        updated_at=now,
+        is_active=True,
+    )
+
+
+def make_model_profile() -> ModelProfile:
+    now = datetime.now(timezone.utc)
+    return ModelProfile(
+        id=uuid4(),
+        name="Test Model",
+        description="",
+        model="test-model",
+        created_at=now,
+        updated_at=now,
+        is_active=True,
+    )
+
+
+def make_request(
+    graph_profile: GraphProfile, bindings: dict[str, str]
+) -> chat_orchestrator_pb2.ChatTurnRequest:
+    return chat_orchestrator_pb2.ChatTurnRequest(
+        request_id=str(uuid4()),
+        session_id=str(uuid4()),
+        user_id=str(uuid4()),
+        assistant=chat_orchestrator_pb2.AssistantConfig(
+            assistant_id=str(uuid4()),
+            graph_profile_id=str(graph_profile.id),
+            model_bindings=[
+                chat_orchestrator_pb2.ModelBinding(
+                    slot_name=slot_name, model_profile_id=model_profile_id
+                )
+                for slot_name, model_profile_id in bindings.items()
+            ],
+        ),
+        input=chat_orchestrator_pb2.UserInput(message="Hello"),
+    )
+
+
+@pytest.mark.asyncio
+async def test_build_resolves_model_bindings_in_one_batch(mock_app_context):
+    graph_profile = make_graph_profile()
+    main = make_model_profile()
+    summarizer = make_model_profile()
+    mock_app_context.get_graph_profile_repository().get_by_id.return_value = (
+        graph_profile
+    )
+    mock_app_context.get_model_profile_repository().get_by_ids.return_value = {
+        main.id: main,
+        summarizer.id: summarizer,
+    }
+
+    request = make_request(
+        graph_profile, {"main": str(main.id), "summarizer": str(summarizer.id)}
+    )
+    plan = await ChatTurnPlan.build(request, mock_app_context)
+
+    assert plan.main_model_profile == main
+    assert plan.model_bindings == {"main": main, "summarizer": summarizer}
+    mock_app_context.get_model_profile_repository().get_by_ids.assert_awaited_once_with(
+        [main.id, summarizer.id]
+    )
+
+
+@pytest.mark.asyncio
+async def test_build_reports_missing_model_profile(mock_app_context):
+    graph_profile = make_graph_profile()
+    mock_app_context.get_graph_profile_repository().get_by_id.return_value = (
+        graph_profile
+    )
+    mock_app_context.get_model_profile_repository().get_by_ids.return_value = {}
+
+    request = make_request(graph_profile, {"main": str(uuid4())})
+    with pytest.raises(ChatTurnPlanError) as exc_info:
+        await ChatTurnPlan.build(request, mock_app_context)
+
+    assert exc_info.value.code == "MODEL_PROFILE_NOT_FOUND"
+
+
+@pytest.mark.asyncio
+async def test_build_converts_history_and_system_prompt(mock_app_context):
+    graph_profile = make_graph_profile()
+    main = make_model_profile()
+    mock_app_context.get_graph_profile_repository().get_by_id.return_value = (
+        graph_profile
+    )
+    mock_app_context.get_model_profile_repository().get_by_ids.return_value = {
+        main.id: main
+    }
+
+    request = make_request(graph_profile, {"main": str(main.id)})
+    request.assistant.system_prompt = "Be brief."
+    request.history.tail.extend(
+        [
+            chat_orchestrator_pb2.MessageEntry(
+                role=chat_orchestrator_pb2.ROLE_USER, content="Hi"
+            ),
+            chat_orchestrator_pb2.MessageEntry(
+                role=chat_orchestrator_pb2.ROLE_ASSISTANT, content="Hello!"
+            ),
+        ]
+    )
+    plan = await ChatTurnPlan.build(request, mock_app_context)
+
+    assert plan.system_prompt == "Be brief."
+    assert [(m.role, m.content) for m in plan.history] == [
+        ("user", "Hi"),
+        ("assistant", "Hello!"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_build_rejects_history_without_role(mock_app_context):
+    graph_profile = make_graph_profile()
+    request = make_request(graph_profile, {"main": str(uuid4())})
+    request.history.tail.add(id="m1", content="Hi")
+
+    with pytest.raises(ChatTurnPlanError) as exc_info:
+        await ChatTurnPlan.build(request, mock_app_context)
+
+    assert exc_info.value.code == "INVALID_HISTORY_ROLE"
@@ -0,0 +1,112 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from ai_orchestrator import profiling
+from ai_orchestrator.profiling import LOOP_FRAME, ThreadStackSampler
+
+
+def spin(stop: threading.Event) -> None:
+    while not stop.is_set():
+        sum(range(1000))
+
+
+def test_sampler_collects_collapsed_and_speedscope_stacks():
+    stop = threading.Event()
+    worker = threading.Thread(target=spin, args=(stop,), name="spinner")
+    worker.start()
+    assert worker.ident is not None
+    sampler = ThreadStackSampler(0.002, thread_ids={worker.ident})
+    sampler.start()
+    time.sleep(0.1)
+    profile = sampler.stop()
+    stop.set()
+    worker.join()
+
+    assert sum(profile.stacks.values()) > 5
+    assert all(stack[0] == "thread:spinner" for stack in profile.stacks)
+    assert "spin (" in profile.collapsed()
+
+    document = profile.speedscope("test")
+    frames = document["shared"]["frames"]
+    (sampled,) = document["profiles"]
+    assert sampled["type"] == "sampled"
+    assert len(sampled["samples"]) == len(sampled["weights"])
+    assert all(0 <= index < len(frames) for s in sampled["samples"] for index in s)
+
+
+async def busy_request() -> None:
+    deadline = time.perf_counter() + 0.1
+    while time.perf_counter() < deadline:
+        sum(range(1000))
+        await asyncio.sleep(0)
+
+
+@pytest.mark.asyncio
+async def test_loop_samples_are_rooted_at_the_running_task():
+    task = asyncio.create_task(busy_request())
+    profile = await profiling.profile_cpu(0.1, interval_s=0.002)
+    await task
+
+    busy = sum(
+        count
+        for stack, count in profile.stacks.items()
+        if stack[1] == "task:busy_request"
+    )
+    assert busy >= sum(profile.stacks.values()) // 2
+    assert all(
+        stack[1].startswith("task:") or stack[1] == LOOP_FRAME
+        for stack in profile.stacks
+    )
+
+
+@pytest.mark.asyncio
+async def test_memory_profile_reports_allocations_made_during_the_trace():
+    kept: list[bytes] = []
+
+    async def allocate() -> None:
+        await asyncio.sleep(0.01)
+        kept.extend(bytes(1024) for _ in range(1000))
+
+    task = asyncio.create_task(allocate())
+    allocations = await profiling.profile_memory(0.05, limit=5)
+    await task
+
+    assert allocations[0].size_bytes >= 1000 * 1024
+    assert any(__file__ in frame for frame in allocations[0].traceback)
+
+
+def test_admin_endpoints_need_a_configured_token(client, mock_app_context):
+    mock_app_context.get_settings.return_value.admin_token = None
+
+    response = client.get("/admin/profile/cpu", params={"duration_s": 0.01})
+
+    assert response.status_code == 404
+
+
+def test_admin_endpoints_reject_wrong_token(client, mock_app_context):
+    mock_app_context.get_settings.return_value.admin_token = "secret"
+
+    response = client.get(
+        "/admin/profile/cpu",
+        params={"duration_s": 0.01},
+        headers={"Authorization": "Bearer wrong"},
+    )
+
+    assert response.status_code == 401
+
+
+def test_cpu_profile_endpoint_returns_collapsed_stacks(client, mock_app_context):
+    mock_app_context.get_settings.return_value.admin_token = "secret"
+
+    response = client.get(
+        "/admin/profile/cpu",
+        params={"duration_s": 0.05, "interval_ms": 1, "format": "collapsed"},
+        headers={"Authorization": "Bearer secret"},
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert response.text.startswith("thread:")
@@ -0,0 +1,86 @@
+from opentelemetry.sdk.metrics import MeterProvider
+from opentelemetry.sdk.metrics.export import InMemoryMetricReader
+from opentelemetry.sdk.metrics.view import ExplicitBucketHistogramAggregation, View
+
+from ai_orchestrator.histogram import BucketHistogram
+from ai_orchestrator.http import prometheus
+from ai_orchestrator.http.server import app as fastapi_app
+
+
+def test_render_uses_prometheus_names_and_cumulative_buckets():
+    reader = InMemoryMetricReader()
+    provider = MeterProvider(
+        metric_readers=[reader],
+        views=[
+            View(
+                instrument_unit="s",
+                aggregation=ExplicitBucketHistogramAggregation((0.1, 1.0)),
+            )
+        ],
+    )
+    meter = provider.get_meter("test")
+    meter.create_counter("llm_client.responses", unit="{response}").add(
+        2, {"http.response.status_code": 200}
+    )
+    meter.create_up_down_counter("chat_turn.active", unit="{call}").add(3)
+    latency = meter.create_histogram(
+        "chat_turn.time_to_first_token", unit="s", description="TTFT"
+    )
+    for value in (0.05, 0.5, 5.0):
+        latency.record(value, {"graph": 'say "hi"'})
+    meter.create_histogram("chat_turn.tokens_per_second", unit="{token}/s")
+
+    text = prometheus.render(reader.get_metrics_data())
+    provider.shutdown()
+
+    assert "# TYPE llm_client_responses_total counter" in text
+    assert 'llm_client_responses_total{http_response_status_code="200"} 2' in text
+    assert "# TYPE chat_turn_active gauge" in text
+    assert "chat_turn_active 3" in text
+    assert "# HELP chat_turn_time_to_first_token_seconds TTFT" in text
+    name = "chat_turn_time_to_first_token_seconds"
+    labels = 'graph="say \\"hi\\""'
+    assert f'{name}_bucket{{{labels},le="0.1"}} 1' in text
+    assert f'{name}_bucket{{{labels},le="1.0"}} 2' in text
+    assert f'{name}_bucket{{{labels},le="+Inf"}} 3' in text
+    assert f"{name}_sum{{{labels}}} 5.55" in text
+    assert f"{name}_count{{{labels}}} 3" in text
+
+
+def test_metrics_endpoint(client):
+    reader = InMemoryMetricReader()
+    provider = MeterProvider(metric_readers=[reader])
+    provider.get_meter("test").create_counter("scrapes").add(1)
+    fastapi_app.state.metrics_reader = reader
+    try:
+        response = client.get("/metrics")
+    finally:
+        del fastapi_app.state.metrics_reader
+        provider.shutdown()
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert "scrapes_total 1" in response.text
+
+
+def test_metrics_endpoint_disabled(client):
+    assert client.get("/metrics").status_code == 404
+
+
+def test_render_bucket_histograms():
+    histogram = BucketHistogram(
+        "test.gaps",
+        description="Gaps",
+        unit="s",
+        label_names=("graph",),
+        boundaries=(0.01, 0.1),
+    )
+    histogram.record_many([0.005, 0.01, 0.05, 0.5], ("g",))
+
+    text = prometheus.render(None, [histogram])
+
+    assert "# TYPE test_gaps_seconds histogram" in text
+    assert 'test_gaps_seconds_bucket{graph="g",le="0.01"} 2' in text
+    assert 'test_gaps_seconds_bucket{graph="g",le="0.1"} 3' in text
+    assert 'test_gaps_seconds_bucket{graph="g",le="+Inf"} 4' in text
+    assert 'test_gaps_seconds_count{graph="g"} 4' in text
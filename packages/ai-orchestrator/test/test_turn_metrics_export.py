@@ -0,0 +1,34 @@
+from ai_core.orchestration.streaming import Usage
+from ai_core.orchestration.turn_metrics import TurnMetrics
+from ai_orchestrator.grpc.turn_metrics import (
+    metrics_event,
+    trailing_metadata,
+    turn_timings,
+)
+
+
+def test_timings_skip_unmeasured_values():
+    turn = TurnMetrics(started_at=0.0, plan_s=0.002)
+    turn.begin(0.003)
+    turn.finish(0.01)
+
+    timings = turn_timings(turn)
+
+    assert timings == {"queue_ms": 1.0, "plan_ms": 2.0, "duration_ms": 10.0}
+    assert trailing_metadata(timings) == (
+        ("x-aisp-queue-ms", "1.0"),
+        ("x-aisp-plan-ms", "2.0"),
+        ("x-aisp-duration-ms", "10.0"),
+    )
+
+
+def test_metrics_event_carries_usage():
+    turn = TurnMetrics(usage=Usage(prompt_tokens=12, completion_tokens=3))
+
+    event = metrics_event(turn)
+
+    assert event.WhichOneof("payload") == "metrics"
+    assert event.metrics.prompt_tokens == 12
+    assert event.metrics.completion_tokens == 3
+    assert event.metrics.total_tokens == 0
+    assert metrics_event(TurnMetrics()).metrics.total_tokens == 0
@@ -0,0 +1,27 @@
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from ai_orchestrator import warmup
+
+
+@pytest.mark.asyncio
+async def test_failing_upstream_and_synthetic_turn_still_mark_ready(
+    mock_app_context, monkeypatch
+):
+    mock_app_context.get_settings.return_value = Mock(
+        warmup_enabled=True, warmup_synthetic_turn=True
+    )
+    mock_app_context.get_graph_profile_repository().get_all.return_value = []
+    mock_app_context.get_model_profile_repository().get_all.return_value = []
+    mock_app_context.get_token_counter.return_value.preload = AsyncMock()
+    mock_app_context.get_llm_client.return_value.warm_up = AsyncMock(
+        side_effect=RuntimeError("upstream misconfigured")
+    )
+    synthetic_turn = AsyncMock(side_effect=RuntimeError("graph failed"))
+    monkeypatch.setattr(warmup, "run_synthetic_turn", synthetic_turn)
+
+    await warmup.warm_up(mock_app_context)
+
+    synthetic_turn.assert_awaited_once()
+    mock_app_context.mark_ready.assert_called_once()